@@ -53,6 +53,46 @@ export interface FilterStep {
   condition: Expression;
 }
 
+/**
+ * Defines a step that keeps the rows of a table whose value is (or, with `negate`,
+ * is not) contained in a set of values stored in a file, and outputs the result
+ * to a new table in the tablespace.
+ *
+ * Use it instead of a filter on an `in_set` expression for large sets: the file
+ * is scanned lazily and semi-joined with the table, so the set does not have to
+ * be embedded in the workflow. Set values are cast to the type of `value`.
+ * Null values never match and are excluded in both modes.
+ */
+export interface FilterInSetFileStep {
+  /** The type identifier for this step. Must be 'filter_in_set_file'. */
+  type: "filter_in_set_file";
+
+  /** The name of the input table in the tablespace from which rows will be filtered. */
+  inputTable: string;
+
+  /** The name for the resulting filtered table that will be added to the tablespace. */
+  outputTable: string;
+
+  /** The expression whose value is checked for membership in the set. */
+  value: Expression;
+
+  /** Path of the set file, relative to the root folder. */
+  file: string;
+
+  /**
+   * Format of the set file: 'text' has one value per line and no header;
+   * 'csv', 'tsv' and 'parquet' files hold the set in `column`.
+   * Defaults to 'text'.
+   */
+  format?: "text" | "csv" | "tsv" | "parquet";
+
+  /** Column holding the set values. Required unless the format is 'text'. */
+  column?: string;
+
+  /** If true, keep the rows whose value is not in the set. Defaults to false. */
+  negate?: boolean;
+}
+
 /**
  * Defines a step that selects a specific set of columns from an input table,
  * potentially applying transformations or creating new columns, and outputs
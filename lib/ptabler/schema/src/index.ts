@@ -5,11 +5,16 @@ import type {
   WriteNdjsonStep,
   BaseFileReadStep,
   BaseFileWriteStep,
+  BaseTextFileWriteStep,
+  ParquetCompression,
+  SortingColumn,
+  TextCompression,
   WriteParquetStep,
   ReadParquetStep,
 } from "./io";
 import type {
   AddColumnsStep,
+  FilterInSetFileStep,
   FilterStep,
   LimitStep,
   SelectStep,
@@ -25,6 +30,7 @@ import type { ConcatenateStep } from "./concatenate";
 import type { SortStep } from "./sort";
 import type { WriteFrameStep } from "./write_frame";
 import type { ReadFrameStep } from "./read_frame";
+import type { MaterializeStep } from "./materialize";
 
 export type PTablerStep =
   | ReadCsvStep
@@ -35,6 +41,7 @@ export type PTablerStep =
   | WriteParquetStep
   | AddColumnsStep
   | FilterStep
+  | FilterInSetFileStep
   | LimitStep
   | SliceStep
   | AggregateStep
@@ -46,7 +53,8 @@ export type PTablerStep =
   | WithColumnsStep
   | WithoutColumnsStep
   | WriteFrameStep
-  | ReadFrameStep;
+  | ReadFrameStep
+  | MaterializeStep;
 
 export type PTablerWorkflow = {
   workflow: PTablerStep[];
@@ -59,14 +67,20 @@ export type {
   AnyJoinStep,
   BaseFileReadStep,
   BaseFileWriteStep,
+  BaseTextFileWriteStep,
   ConcatenateStep,
+  FilterInSetFileStep,
   FilterStep,
   LimitStep,
+  MaterializeStep,
+  ParquetCompression,
   ReadCsvStep,
   ReadNdjsonStep,
   SelectStep,
   SliceStep,
+  SortingColumn,
   SortStep,
+  TextCompression,
   UniqueKeepStrategy,
   UniqueStep,
   WithColumnsStep,
@@ -17,8 +17,14 @@ export interface ColumnSchema {
  * shared across different file format readers.
  */
 export interface BaseFileReadStep {
-  /** Path to the file to be read. */
-  file: string;
+  /**
+   * Path to the file to be read, relative to the root directory. May also be
+   * a glob pattern (e.g. `shards/*.tsv`; `**` matches nested directories)
+   * or a list of paths; all matching files are read by a single scan and
+   * must share their columns. CSV and NDJSON files compressed with gzip
+   * (`.gz`) or zstd (`.zst`) are decompressed as a stream while read.
+   */
+  file: string | string[];
   /** The name assigned to the loaded DataFrame in the tablespace. */
   name: string;
   /**
@@ -48,6 +54,19 @@ export interface BaseFileReadStep {
    * If not specified, all rows will be read.
    */
   nRows?: number;
+  /**
+   * Optional: Turn `key=value` directories in the file paths into columns,
+   * as in hive-partitioned datasets. Types given in `schema` apply to these
+   * columns; without them, partition columns of Parquet inputs are inferred
+   * and those of CSV and NDJSON inputs are strings. Filters on partition
+   * columns skip the excluded files of Parquet inputs. Defaults to `false`.
+   */
+  hivePartitioning?: boolean;
+  /**
+   * Optional: Names of the columns to read, including partition columns.
+   * Only these columns are parsed. If omitted, all columns are read.
+   */
+  columns?: string[];
 }
 
 /** Represents the configuration for a step that reads data from a CSV file into the tablespace. */
@@ -83,12 +102,62 @@ export interface BaseFileWriteStep {
   file: string;
   /** Optional: A list of column names to write to the file. If omitted, all columns are written. */
   columns?: string[];
+  /**
+   * Optional: Write a hive-partitioned dataset in one pass. `file` is then a
+   * directory; the rows of every combination of values of these columns go
+   * to `key1=value1/key2=value2/0.<ext>` (null values become
+   * `__HIVE_DEFAULT_PARTITION__`), and the columns themselves are only stored
+   * in the directory names. A dataset written earlier to `file` is replaced.
+   */
+  partitionBy?: string[];
+}
+
+/** Compression codec of Parquet column chunks. */
+export type ParquetCompression = "uncompressed" | "snappy" | "gzip" | "lz4" | "zstd" | "brotli";
+
+/** A column the rows of a written file are sorted by. */
+export interface SortingColumn {
+  column: string;
+  /** Optional: Whether the column is sorted in descending order. Defaults to `false`. */
+  descending?: boolean;
+  /** Optional: Whether nulls come last. Defaults to `false`. */
+  nullsLast?: boolean;
+}
+
+/** Compression codec of CSV and NDJSON outputs. */
+export type TextCompression = "gzip" | "zstd";
+
+/**
+ * Base interface for the CSV and NDJSON writers, which can compress their
+ * output and split it into several files.
+ */
+export interface BaseTextFileWriteStep extends BaseFileWriteStep {
+  /**
+   * Optional: Compress the output, using multiple threads. Inferred from a
+   * `.gz` or `.zst` extension of `file` if omitted.
+   */
+  compression?: TextCompression;
+  /** Optional: Compression level (gzip: 1-9, default 6; zstd: 1-22, default 3). */
+  compressionLevel?: number;
+  /**
+   * Optional: Split the output into files of at most this many rows. `file`
+   * is then a directory receiving the files `part-00000.csv`,
+   * `part-00001.csv`, ... (with `.tsv` for tab-delimited CSV, `.ndjson` for
+   * NDJSON and a `.gz` or `.zst` extension if compressed); CSV files repeat
+   * the header.
+   */
+  maxRowsPerFile?: number;
+  /**
+   * Optional: Split the output into files of at most this many bytes before
+   * compression, as for `maxRowsPerFile`. Files are cut at row boundaries.
+   */
+  maxBytesPerFile?: number;
 }
 
 /**
  * Represents the configuration for a step that writes a table from the tablespace to a CSV file.
  */
-export interface WriteCsvStep extends BaseFileWriteStep {
+export interface WriteCsvStep extends BaseTextFileWriteStep {
   /** The type of the step, which is always 'write_csv' for this operation. */
   type: "write_csv";
   /** Optional: The delimiter character to use in the output CSV file. */
@@ -108,7 +177,7 @@ export interface WriteCsvStep extends BaseFileWriteStep {
 /**
  * Represents the configuration for a step that writes a table from the tablespace to an NDJSON file.
  */
-export interface WriteNdjsonStep extends BaseFileWriteStep {
+export interface WriteNdjsonStep extends BaseTextFileWriteStep {
   /** The type of the step, which is always 'write_ndjson' for this operation. */
   type: "write_ndjson";
 }
@@ -119,4 +188,26 @@ export interface WriteNdjsonStep extends BaseFileWriteStep {
 export interface WriteParquetStep extends BaseFileWriteStep {
   /** The type of the step, which is always 'write_parquet' for this operation. */
   type: "write_parquet";
+  /** Optional: Compression codec of the column chunks. Defaults to `zstd`. */
+  compression?: ParquetCompression;
+  /** Optional: Compression level of `gzip` (0-9), `brotli` (0-11) or `zstd` (1-22). */
+  compressionLevel?: number;
+  /**
+   * Optional: Maximum number of rows per row group. Smaller row groups let
+   * scans filtering on sorted or clustered columns skip more of the file.
+   */
+  rowGroupSize?: number;
+  /** Optional: Target size of data pages in bytes. */
+  dataPageSize?: number;
+  /**
+   * Optional: Column statistics to write: `false` for none, `true` (default)
+   * for min, max and null count, `"full"` to also count distinct values.
+   */
+  statistics?: boolean | "full";
+  /**
+   * Optional: Order the table is already sorted in (e.g. by a `sort` step;
+   * not checked), stored as JSON under the `sorting_columns` key of the file
+   * metadata.
+   */
+  sortedBy?: SortingColumn[];
 }
@@ -0,0 +1,15 @@
+/**
+ * Defines a step that computes a table once and replaces it in the tablespace
+ * with a scan of the stored result.
+ *
+ * The table is collected immediately into an Arrow IPC file in the spill folder,
+ * and every following step or sink reads that file instead of recomputing the
+ * upstream plan. Use it when one expensive join or aggregation feeds several sinks.
+ */
+export interface MaterializeStep {
+  /** The type identifier for this step. Must be 'materialize'. */
+  type: "materialize";
+
+  /** The name of the table in the tablespace to materialize in place. */
+  table: string;
+}
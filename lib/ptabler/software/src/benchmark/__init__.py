@@ -0,0 +1,25 @@
+"""
+Performance benchmarks of PTabler steps and expressions.
+
+Run from the `src` directory:
+
+    python -m benchmark run --rows 100000 1000000 --output results.json
+    python -m benchmark compare baseline.json results.json
+
+Inputs (TSV, NDJSON, Parquet and a PFrame) are generated deterministically
+for every row count and kept in `--work-dir`, so later runs skip generation.
+"""
+from .cases import CASES, BenchmarkCase
+from .data import synthetic_table, write_inputs
+from .runner import BenchmarkReport, CaseResult, compare_reports, run_case
+
+__all__ = [
+    "CASES",
+    "BenchmarkCase",
+    "BenchmarkReport",
+    "CaseResult",
+    "compare_reports",
+    "run_case",
+    "synthetic_table",
+    "write_inputs",
+]
@@ -0,0 +1,84 @@
+import argparse
+import pathlib
+import sys
+import tempfile
+
+from .cases import CASES
+from .data import write_inputs
+from .runner import compare_reports, new_report, read_report, run_case, write_report
+
+DEFAULT_ROWS = [100_000, 1_000_000, 10_000_000]
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="Benchmark PTabler steps and expressions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Time the benchmark cases and write the results as JSON.")
+    run.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=DEFAULT_ROWS,
+        help=f"Input sizes in rows. Defaults to {' '.join(str(rows) for rows in DEFAULT_ROWS)}.",
+    )
+    run.add_argument(
+        "--cases",
+        nargs="+",
+        default=None,
+        help=f"Names or families of the cases to run. Defaults to all of: {', '.join(case.name for case in CASES)}.",
+    )
+    run.add_argument("--repeat", type=int, default=3, help="Runs per case and input size. Defaults to 3.")
+    run.add_argument(
+        "--work-dir",
+        type=pathlib.Path,
+        default=None,
+        help="Directory keeping the generated inputs between invocations. Defaults to a new temporary directory.",
+    )
+    run.add_argument("--output", type=pathlib.Path, required=True, help="JSON file to write the results to.")
+
+    compare = commands.add_parser("compare", help="Compare two result files.")
+    compare.add_argument("baseline", type=pathlib.Path)
+    compare.add_argument("current", type=pathlib.Path)
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Fail if a case got slower by more than this factor. Defaults to 1.2.",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        lines, regressions = compare_reports(read_report(args.baseline), read_report(args.current), args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if args.repeat < 1:
+        parser.error(f"--repeat must be at least 1, got {args.repeat}")
+    cases = [
+        case for case in CASES
+        if args.cases is None or case.name in args.cases or case.family in args.cases
+    ]
+    if not cases:
+        parser.error(f"no case matches {', '.join(args.cases)}")
+
+    work_dir = args.work_dir.resolve() if args.work_dir is not None else pathlib.Path(tempfile.mkdtemp(prefix="ptabler-benchmark-"))
+    results = []
+    for rows in args.rows:
+        input_dir = work_dir / f"rows_{rows}"
+        print(f"Generating {rows} rows in {input_dir}...", file=sys.stderr)
+        write_inputs(input_dir, rows)
+        for case in cases:
+            result = run_case(case, input_dir, rows, args.repeat)
+            print(f"{case.name:<16} {rows:>10} {result.min_seconds:>10.3f}s", file=sys.stderr)
+            results.append(result)
+
+    write_report(new_report(results), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Benchmark cases: one small workflow per step and expression family."""
+import dataclasses
+from typing import Callable, List
+
+from polars_pf.json.query_spec import SpecQueryColumn, SpecQueryFullJoin, SpecQueryJoinEntry
+
+from ptabler.expression import (
+    AliasExpression,
+    ColumnReferenceExpression,
+    ConstantValueExpression,
+    CumsumExpression,
+    FuzzyStringFilterExpression,
+    HashExpression,
+    RankExpression,
+    StrLenExpression,
+    StringContainsExpression,
+    StringDistanceExpression,
+    StringReplaceExpression,
+    StructFieldExpression,
+    ToUpperExpression,
+    WindowExpression,
+)
+from ptabler.steps import (
+    Aggregate,
+    Join,
+    PStep,
+    ReadCsv,
+    ReadFrame,
+    ReadNdjson,
+    ReadParquet,
+    Sort,
+    Unique,
+    WithColumns,
+    WriteCsv,
+    WriteFrame,
+    WriteParquet,
+)
+from ptabler.steps.aggregate import Mean, NUnique, Sum
+from ptabler.steps.read_frame import PTableDefV2
+from ptabler.steps.sort import SortDirective
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping
+from ptabler.workflow import PWorkflow
+
+from .data import FRAME_COLUMNS, INPUT_NDJSON, INPUT_PARQUET, INPUT_TSV, LOOKUP_PARQUET
+
+# Directory under the input directory that cases write their files to; frames
+# can only be written directly into the input directory
+OUTPUT_DIR = "outputs"
+
+
+@dataclasses.dataclass
+class BenchmarkCase:
+    """
+    A workflow timed by the benchmark. It reads the inputs written by
+    `data.write_inputs`; its outputs (see `PStep.output_paths`) are removed
+    after every run.
+    """
+    name: str
+    family: str
+    """
+    One of "io", "step", "expression" and "startup"; cases are selected on
+    the command line by name or family.
+    """
+    steps: Callable[[], List[PStep]]
+    fresh_interpreter: bool = False
+    """
+    Run the workflow with `main.py` in a new Python interpreter, so the time
+    includes interpreter startup and imports, as paid by every ptabler run.
+    """
+
+    def workflow(self) -> PWorkflow:
+        return PWorkflow(workflow=self.steps())
+
+
+def _col(name: str) -> ColumnReferenceExpression:
+    return ColumnReferenceExpression(name=name)
+
+
+def _output(table: str, name: str) -> WriteParquet:
+    return WriteParquet(table=table, file=f"{OUTPUT_DIR}/{name}.parquet")
+
+
+def _read_input() -> ReadParquet:
+    return ReadParquet(file=INPUT_PARQUET, name="input")
+
+
+def _with_columns(name: str, *columns) -> List[PStep]:
+    return [
+        _read_input(),
+        WithColumns(input_table="input", output_table="result", columns=list(columns)),
+        _output("result", name),
+    ]
+
+
+CASES: List[BenchmarkCase] = [
+    BenchmarkCase("cold_start_csv", "startup", lambda: [
+        ReadCsv(file=INPUT_TSV, name="input", delimiter="\t"),
+        WriteCsv(table="input", file=f"{OUTPUT_DIR}/cold_start_csv.csv"),
+    ], fresh_interpreter=True),
+    BenchmarkCase("read_tsv", "io", lambda: [
+        ReadCsv(file=INPUT_TSV, name="input", delimiter="\t"),
+        _output("input", "read_tsv"),
+    ]),
+    BenchmarkCase("read_ndjson", "io", lambda: [
+        ReadNdjson(file=INPUT_NDJSON, name="input"),
+        _output("input", "read_ndjson"),
+    ]),
+    BenchmarkCase("read_parquet", "io", lambda: [
+        _read_input(),
+        _output("input", "read_parquet"),
+    ]),
+    BenchmarkCase("join", "step", lambda: [
+        _read_input(),
+        ReadParquet(file=LOOKUP_PARQUET, name="lookup"),
+        Join(
+            left_table="input",
+            right_table="lookup",
+            output_table="result",
+            how="inner",
+            left_on=["key"],
+            right_on=["key"],
+        ),
+        _output("result", "join"),
+    ]),
+    BenchmarkCase("aggregate", "step", lambda: [
+        _read_input(),
+        Aggregate(
+            input_table="input",
+            output_table="result",
+            group_by=["key"],
+            aggregations=[
+                Sum(name="value_sum", expression=_col("value")),
+                Mean(name="value_mean", expression=_col("value")),
+                NUnique(name="groups", expression=_col("group")),
+            ],
+        ),
+        _output("result", "aggregate"),
+    ]),
+    BenchmarkCase("sort", "step", lambda: [
+        _read_input(),
+        Sort(
+            input_table="input",
+            output_table="result",
+            by=[SortDirective(value=_col("value"), descending=True), SortDirective(value=_col("id"))],
+        ),
+        _output("result", "sort"),
+    ]),
+    BenchmarkCase("unique", "step", lambda: [
+        _read_input(),
+        Unique(input_table="input", output_table="result", subset=["key"], keep="first", maintain_order=True),
+        _output("result", "unique"),
+    ]),
+    BenchmarkCase("write_frame", "step", lambda: [
+        _read_input(),
+        WriteFrame(
+            input_table="input",
+            frame_name="write_frame_output",
+            axes=[AxisMapping(column="key", type="Long"), AxisMapping(column="id", type="Long")],
+            columns=[
+                ColumnMapping(column="value", type="Double"),
+                ColumnMapping(column="name", type="String"),
+            ],
+            partition_key_length=1,
+        ),
+    ]),
+    BenchmarkCase("read_frame", "step", lambda: [
+        ReadFrame(
+            name="input",
+            request=PTableDefV2(query=SpecQueryFullJoin(entries=[
+                SpecQueryJoinEntry(entry=SpecQueryColumn(column=column.name))
+                for column in FRAME_COLUMNS
+            ])),
+            translation={column.name: column.name for column in FRAME_COLUMNS},
+        ),
+        _output("input", "read_frame"),
+    ]),
+    BenchmarkCase("string", "expression", lambda: _with_columns(
+        "string",
+        AliasExpression(name="upper", value=ToUpperExpression(value=_col("name"))),
+        AliasExpression(name="length", value=StrLenExpression(value=_col("sequence"))),
+        AliasExpression(
+            name="has_motif",
+            value=StringContainsExpression(value=_col("sequence"), pattern="GT[AC]G"),
+        ),
+        AliasExpression(
+            name="renamed",
+            value=StringReplaceExpression(
+                value=_col("name"), pattern=r"item (\d+)", replacement="$1", replace_all=True,
+            ),
+        ),
+    )),
+    BenchmarkCase("fuzzy", "expression", lambda: _with_columns(
+        "fuzzy",
+        AliasExpression(
+            name="distance",
+            value=StringDistanceExpression(
+                metric="levenshtein", string1=_col("sequence"), string2=ConstantValueExpression(value="ACGTACGTAC"),
+            ),
+        ),
+        AliasExpression(
+            name="similar",
+            value=FuzzyStringFilterExpression(
+                metric="hamming", value=_col("sequence"), pattern=ConstantValueExpression(value="ACGTACGTAC"), bound=5,
+            ),
+        ),
+    )),
+    BenchmarkCase("hash", "expression", lambda: _with_columns(
+        "hash",
+        AliasExpression(name="sha256", value=HashExpression(hash_type="sha256", encoding="hex", value=_col("name"))),
+        AliasExpression(
+            name="xxh3",
+            value=HashExpression(hash_type="xxh3", encoding="base64_alphanumeric", value=_col("sequence"), bits=64),
+        ),
+    )),
+    BenchmarkCase("window", "expression", lambda: _with_columns(
+        "window",
+        AliasExpression(
+            name="rank",
+            value=RankExpression(order_by=[_col("value")], partition_by=[_col("group")]),
+        ),
+        AliasExpression(
+            name="running_total",
+            value=CumsumExpression(value=_col("value"), additional_order_by=[_col("id")], partition_by=[_col("group")]),
+        ),
+        AliasExpression(
+            name="group_mean",
+            value=WindowExpression(aggregation="mean", value=_col("value"), partition_by=[_col("group")]),
+        ),
+    )),
+    BenchmarkCase("struct", "expression", lambda: _with_columns(
+        "struct",
+        AliasExpression(name="score", value=StructFieldExpression(struct=_col("meta"), fields="score")),
+        AliasExpression(name="label", value=StructFieldExpression(struct=_col("meta"), fields=["label"])),
+    )),
+]
@@ -0,0 +1,114 @@
+"""Deterministic synthetic inputs for the benchmark cases."""
+from pathlib import Path
+
+import msgspec
+import polars as pl
+from polars_pf import AxisSpec, PColumnSpec
+from polars_pf.json.spec import AxisType, ColumnType
+
+from ptabler.steps import GlobalSettings, ReadParquet
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping, WriteFrame
+from ptabler.workflow import PWorkflow
+
+# Input files, relative to the input directory of one row count
+INPUT_TSV = "input.tsv"
+INPUT_NDJSON = "input.ndjson"
+INPUT_PARQUET = "input.parquet"
+# Join partner of the input, keyed by `key`, with one row per distinct key
+LOOKUP_PARQUET = "lookup.parquet"
+# PFrame with the `id` axis and the `value` and `group` columns of the input
+INPUT_FRAME = "frame"
+FRAME_AXES = [AxisSpec(name="id", type=AxisType.Long)]
+FRAME_COLUMNS = [
+    PColumnSpec(name="value", value_type=ColumnType.Double, axes_spec=FRAME_AXES),
+    PColumnSpec(name="group", value_type=ColumnType.String, axes_spec=FRAME_AXES),
+]
+
+# Written once all inputs of a row count are complete
+_DONE = ".done"
+
+# Multiplier and modulus of the Lehmer generator deriving the column values
+# from the row id; plain integer arithmetic keeps the data identical across
+# Polars versions, unlike Expr.hash
+_LEHMER_MULTIPLIER = 48271
+_LEHMER_MODULUS = 2_147_483_647
+
+
+def key_count(rows: int) -> int:
+    """Number of distinct join and grouping keys in an input of `rows` rows."""
+    return max(1, rows // 10)
+
+
+def synthetic_table(rows: int) -> pl.LazyFrame:
+    """
+    Returns `rows` rows of synthetic data, computed lazily so that inputs
+    larger than memory can be streamed to disk:
+
+    - `id`: unique row number
+    - `key`: join key with `key_count(rows)` distinct values
+    - `group`: one of 100 low-cardinality labels
+    - `value`: float in [0, 1000)
+    - `name`: short text
+    - `sequence`: 10-character nucleotide string
+    - `meta`: struct of `score` and `label` (not in the TSV input)
+    """
+    pseudo_random = (pl.col("id") * _LEHMER_MULTIPLIER + 1) % _LEHMER_MODULUS
+    digits = pseudo_random.cast(pl.String).str.zfill(10).str.reverse()
+    return (
+        pl.LazyFrame()
+        .select(pl.int_range(0, rows, dtype=pl.Int64).alias("id"))
+        .with_columns(
+            (pseudo_random % key_count(rows)).alias("key"),
+            pl.format("g{}", pl.col("id") % 100).alias("group"),
+            ((pseudo_random % 1_000_000) / 1000.0).alias("value"),
+            pl.format("item {} of {}", pl.col("id") % 1000, pseudo_random % 97).alias("name"),
+            digits.str.replace_many(
+                [str(digit) for digit in range(10)],
+                ["A", "C", "G", "T", "A", "C", "G", "T", "N", "A"],
+            ).alias("sequence"),
+        )
+        .with_columns(
+            pl.struct(
+                (pl.col("value") * 2).alias("score"),
+                pl.col("group").alias("label"),
+            ).alias("meta"),
+        )
+    )
+
+
+def write_inputs(directory: Path, rows: int) -> None:
+    """
+    Writes the TSV, NDJSON, Parquet and PFrame inputs of `rows` rows into
+    `directory`, unless a previous call already completed them.
+    """
+    if (directory / _DONE).exists():
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+
+    table = synthetic_table(rows)
+    pl.collect_all([
+        table.drop("meta").sink_csv(directory / INPUT_TSV, separator="\t", lazy=True),
+        table.sink_ndjson(directory / INPUT_NDJSON, lazy=True),
+        table.sink_parquet(directory / INPUT_PARQUET, lazy=True),
+        pl.LazyFrame()
+        .select(pl.int_range(0, key_count(rows), dtype=pl.Int64).alias("key"))
+        .with_columns(pl.format("label {}", pl.col("key") % 1000).alias("label"))
+        .sink_parquet(directory / LOOKUP_PARQUET, lazy=True),
+    ], engine="streaming")
+
+    PWorkflow(workflow=[
+        ReadParquet(file=INPUT_PARQUET, name="input"),
+        WriteFrame(
+            input_table="input",
+            frame_name=INPUT_FRAME,
+            axes=[AxisMapping(column=axis.name, type=axis.type.value) for axis in FRAME_AXES],
+            columns=[
+                ColumnMapping(column=column.name, type=column.value_type.value)
+                for column in FRAME_COLUMNS
+            ],
+        ),
+    ]).execute(global_settings=GlobalSettings(root_folder=directory))
+    for column in FRAME_COLUMNS:
+        (directory / INPUT_FRAME / f"{column.name}.spec").write_bytes(msgspec.json.encode(column))
+
+    (directory / _DONE).touch()
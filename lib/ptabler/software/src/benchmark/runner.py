@@ -0,0 +1,176 @@
+"""Times benchmark cases and compares result files."""
+import datetime
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import msgspec
+import polars as pl
+
+from ptabler.steps import GlobalSettings
+from ptabler.workflow import ExecutionProfile, ProfileReport, ProfileSpan, PWorkflow
+
+from .cases import OUTPUT_DIR, BenchmarkCase
+from .data import INPUT_FRAME
+
+# Command line entry point run by cases with `fresh_interpreter`
+MAIN_SCRIPT = Path(__file__).resolve().parent.parent / "main.py"
+
+
+class CaseResult(msgspec.Struct, rename="camel"):
+    """Timings of one case at one input size."""
+    name: str
+    family: str
+    rows: int
+    seconds: List[float]
+    """Wall-clock time of every run."""
+    min_seconds: float
+    median_seconds: float
+    phase_seconds: Dict[str, float]
+    """
+    Time spent in every kind of execution phase ("step", "collect", "task",
+    "duckdb_sort", ...; see `Tracer.span`) during the fastest run.
+    """
+
+
+class BenchmarkReport(msgspec.Struct, rename="camel"):
+    """JSON document written by `python -m benchmark`."""
+    created_at: str
+    python_version: str
+    polars_version: str
+    platform: str
+    cpu_count: int
+    results: List[CaseResult]
+
+
+def new_report(results: List[CaseResult]) -> BenchmarkReport:
+    return BenchmarkReport(
+        created_at=datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        python_version=platform.python_version(),
+        polars_version=pl.__version__,
+        platform=platform.platform(),
+        cpu_count=os.cpu_count() or 1,
+        results=results,
+    )
+
+
+def run_case(case: BenchmarkCase, input_dir: Path, rows: int, repeat: int = 1) -> CaseResult:
+    """
+    Executes the workflow of `case` `repeat` times on the inputs in
+    `input_dir`, removing its outputs after every run.
+    """
+    settings = GlobalSettings(root_folder=input_dir, frame_folder=input_dir / INPUT_FRAME)
+    workflow = case.workflow()
+    output_paths = [path for step in workflow.workflow for path in step.output_paths(settings)]
+    seconds: List[float] = []
+    best_phases: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory(prefix="ptabler-benchmark-") as tmp:
+        for _ in range(repeat):
+            _remove_outputs(output_paths)
+            (input_dir / OUTPUT_DIR).mkdir(exist_ok=True)
+            try:
+                if case.fresh_interpreter:
+                    elapsed, spans = _run_in_fresh_interpreter(workflow, settings, Path(tmp))
+                else:
+                    elapsed, spans = _run_in_process(workflow, settings)
+            finally:
+                _remove_outputs(output_paths)
+
+            if not seconds or elapsed < min(seconds):
+                best_phases = {}
+                for span in spans:
+                    best_phases[span.kind] = best_phases.get(span.kind, 0.0) + span.elapsed_seconds
+            seconds.append(elapsed)
+
+    return CaseResult(
+        name=case.name,
+        family=case.family,
+        rows=rows,
+        seconds=seconds,
+        min_seconds=min(seconds),
+        median_seconds=statistics.median(seconds),
+        phase_seconds=best_phases,
+    )
+
+
+def _run_in_process(workflow: PWorkflow, settings: GlobalSettings) -> Tuple[float, List[ProfileSpan]]:
+    """Executes `workflow` once; returns the elapsed seconds and the execution phases."""
+    profile = ExecutionProfile()
+    started = time.perf_counter()
+    workflow.execute(global_settings=settings, tracer=profile)
+    return time.perf_counter() - started, profile.report().spans
+
+
+def _run_in_fresh_interpreter(
+    workflow: PWorkflow,
+    settings: GlobalSettings,
+    work_dir: Path,
+) -> Tuple[float, List[ProfileSpan]]:
+    """
+    Executes `workflow` once with `main.py` in a new interpreter; the time
+    spans from starting the process until it exits, and the phases come
+    from its `--profile` report.
+    """
+    workflow_path = work_dir / "workflow.json"
+    workflow_path.write_bytes(msgspec.json.encode(workflow))
+    profile_path = work_dir / "profile.json"
+    command = [
+        sys.executable, str(MAIN_SCRIPT), str(workflow_path),
+        "--root-dir", str(settings.root_folder),
+        "--frame-dir", str(settings.frame_folder),
+        "--profile", str(profile_path),
+    ]
+    started = time.perf_counter()
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - started
+    return elapsed, msgspec.json.decode(profile_path.read_bytes(), type=ProfileReport).spans
+
+
+def _remove_outputs(paths: List[str]) -> None:
+    for path in paths:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+
+def read_report(path: Path) -> BenchmarkReport:
+    return msgspec.json.decode(Path(path).read_bytes(), type=BenchmarkReport)
+
+
+def write_report(report: BenchmarkReport, path: Path) -> None:
+    Path(path).write_bytes(msgspec.json.format(msgspec.json.encode(report)))
+
+
+def compare_reports(
+    baseline: BenchmarkReport,
+    current: BenchmarkReport,
+    threshold: float,
+) -> tuple[List[str], List[str]]:
+    """
+    Compares the fastest runs of the cases present in both reports.
+
+    Returns the lines of a comparison table and the names of the cases
+    whose time grew by more than `threshold` (e.g. 1.2 for 20%).
+    """
+    baseline_seconds = {(r.name, r.rows): r.min_seconds for r in baseline.results}
+    lines = [f"{'case':<16} {'rows':>10} {'baseline':>10} {'current':>10} {'ratio':>7}"]
+    regressions: List[str] = []
+    for result in current.results:
+        before: Optional[float] = baseline_seconds.get((result.name, result.rows))
+        if before is None:
+            continue
+        ratio = result.min_seconds / before if before > 0 else float("inf")
+        lines.append(
+            f"{result.name:<16} {result.rows:>10} {before:>10.3f} {result.min_seconds:>10.3f} {ratio:>7.2f}"
+        )
+        if ratio > threshold:
+            regressions.append(f"{result.name}@{result.rows}")
+    return lines, regressions
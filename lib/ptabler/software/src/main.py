@@ -1,5 +1,6 @@
 from pathlib import Path
 import argparse
+import os
 import pathlib
 import sys
 import traceback
@@ -7,17 +8,23 @@ import msgspec.msgpack
 import msgspec.json
 import msgspec.yaml
 
-from ptabler.workflow import PWorkflow
-from ptabler.steps import GlobalSettings
+# Thread pools sized from the environment when Polars and polars_pf (which
+# bundles its own Polars, Rayon and Tokio runtimes) are first imported
+THREAD_POOL_VARIABLES = ["POLARS_MAX_THREADS", "RAYON_NUM_THREADS", "TOKIO_WORKER_THREADS"]
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Process a PTabler workflow file.")
+        description="Process PTabler workflow files.",
+        fromfile_prefix_chars="@",
+    )
     parser.add_argument(
-        "workflow_file",
+        "workflow_files",
         type=pathlib.Path,
-        help="Path to the PTabler workflow file (JSON or YAML).",
+        nargs="*",
+        metavar="workflow_file",
+        help="Paths to PTabler workflow files (JSON or YAML). Several workflows are executed together, sharing one collect_all so common scans run once. "
+             "'@FILE' reads further arguments, e.g. a list of workflow files, one per line, from FILE. Not used with --serve.",
     )
     parser.add_argument(
         "--root-dir",
@@ -37,70 +44,279 @@ def main():
         default=None,
         help="Directory where PFrames can create temporary files. Defaults to None (resolves to OS default /tmp).",
     )
+    parser.add_argument(
+        "--memory-limit",
+        type=str,
+        default=None,
+        help="Memory budget shared by Polars, DuckDB and PFrame readers, e.g. 4GB or 512MiB. Engines spill to --spill-dir instead of exceeding it. Defaults to each engine's own limits.",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="Maximum number of threads used by Polars, DuckDB and PFrame readers each. Defaults to the number of cores.",
+    )
+    parser.add_argument(
+        "--max-parallel-tasks",
+        type=int,
+        default=1,
+        help="Maximum number of post-sink tasks (e.g. PFrame sort and conversion of write_frame steps) to run concurrently. Defaults to 1.",
+    )
+    parser.add_argument(
+        "--pipeline-sinks",
+        action="store_true",
+        help="Start the post-sink task of each write_frame step as soon as its own sink is written instead of waiting for all sinks. Sinks feeding different tasks are collected concurrently, up to --max-parallel-tasks at a time, and no longer share common subplans.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=pathlib.Path,
+        default=None,
+        help="Directory of a persistent result cache. Sinks whose steps and inputs match a previous run are restored from it instead of being recomputed. Disabled by default.",
+    )
+    parser.add_argument(
+        "--cache-fingerprint",
+        choices=["stat", "digest"],
+        default="stat",
+        help="How input files are fingerprinted for the result cache: by path, size and modification time (stat, default) or by content hash (digest).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run: keep complete write_frame outputs and continue partial ones from their last completed stage (written, sorted) instead of failing on the existing frame directory. Work files of a failed write_frame are only kept for a later resume when the failed run also used --resume.",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Do not execute the workflow; print the optimized streaming plan of every sink and flag nodes that fall back to in-memory execution.",
+    )
+    parser.add_argument(
+        "--profile",
+        type=pathlib.Path,
+        default=None,
+        help="Write a JSON report with the time spent in every step, the sink collection and every chained task to this file.",
+    )
+    parser.add_argument(
+        "--memory-profile",
+        type=pathlib.Path,
+        default=None,
+        help="Write a JSON report with the peak resident memory, spill folder size and write_frame intermediate file size of every execution phase to this file.",
+    )
+    parser.add_argument(
+        "--summary",
+        type=pathlib.Path,
+        default=None,
+        help="After a successful run, write a JSON summary with the bytes and rows written and the elapsed time of every sink, and the partitions of every written PFrame, to this file.",
+    )
+    parser.add_argument(
+        "--progress",
+        type=str,
+        default=None,
+        help="Write NDJSON progress events (phase start/end, bytes and rows written per sink) to this file while the workflow runs; '-' writes them to stderr.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a long-lived worker: read newline-delimited JSON requests (workflow and directories) from stdin and write one JSON reply per request to stdout. The other options act as defaults for every request; --explain, --profile, --memory-profile, --summary and --progress are not supported.",
+    )
+    parser.add_argument(
+        "--socket",
+        type=pathlib.Path,
+        default=None,
+        help="With --serve, listen for requests on this Unix domain socket instead of stdin.",
+    )
 
     args = parser.parse_args()
 
-    workflow_file_path: Path = args.workflow_file.resolve()
+    if args.serve:
+        # Per-run outputs and modes that a worker serving many requests does not support
+        serve_conflicts = [
+            option for option, value in (
+                ("--explain", args.explain),
+                ("--profile", args.profile),
+                ("--memory-profile", args.memory_profile),
+                ("--summary", args.summary),
+                ("--progress", args.progress),
+            ) if value
+        ]
+        if serve_conflicts:
+            parser.error(f"{', '.join(serve_conflicts)} cannot be used with --serve")
+
+    if args.max_parallel_tasks < 1:
+        print(
+            f"Error: --max-parallel-tasks must be at least 1, got {args.max_parallel_tasks}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.threads is not None:
+        if args.threads < 1:
+            print(
+                f"Error: --threads must be at least 1, got {args.threads}", file=sys.stderr)
+            sys.exit(1)
+        for variable in THREAD_POOL_VARIABLES:
+            os.environ[variable] = str(args.threads)
+
+    # Imported only after the thread pool variables are set
+    from ptabler.steps import GlobalSettings, MultiTracer, Tracer
+    from ptabler.workflow import PWorkflow, ExecutionProfile, ExecutionSummary, MemoryProfile, ProgressReporter, execute_workflows
+    from ptabler.workflow.resources import configure_streaming_engine, parse_byte_size
+    from ptabler.workflow.serve import serve_stdio, serve_unix_socket
+
+    memory_limit: int | None = None
+    if args.memory_limit is not None:
+        try:
+            memory_limit = parse_byte_size(args.memory_limit)
+        except ValueError as e:
+            print(f"Error: --memory-limit: {e}", file=sys.stderr)
+            sys.exit(1)
+
     root_directory: Path = args.root_dir.resolve()
     frame_directory: Path | None = args.frame_dir.resolve() if args.frame_dir is not None else None
     spill_directory: Path | None = args.spill_dir.resolve() if args.spill_dir is not None else None
+    cache_directory: Path | None = args.cache_dir.resolve() if args.cache_dir is not None else None
+    profile_path: Path | None = args.profile.resolve() if args.profile is not None else None
+    memory_profile_path: Path | None = args.memory_profile.resolve() if args.memory_profile is not None else None
+    summary_path: Path | None = args.summary.resolve() if args.summary is not None else None
 
-    if not workflow_file_path.is_file():
-        print(
-            f"Error: Workflow file not found at {workflow_file_path}", file=sys.stderr)
-        sys.exit(1)
+    global_settings = GlobalSettings(
+        root_folder=root_directory,
+        frame_folder=frame_directory,
+        spill_folder=spill_directory,
+        max_parallel_tasks=args.max_parallel_tasks,
+        pipeline_sinks=args.pipeline_sinks,
+        cache_folder=cache_directory,
+        cache_fingerprint=args.cache_fingerprint,
+        memory_limit=memory_limit,
+        threads=args.threads,
+        resume=args.resume,
+    )
+    configure_streaming_engine(global_settings)
+
+    if args.serve:
+        if args.socket is not None:
+            serve_unix_socket(args.socket.resolve(), global_settings)
+        else:
+            serve_stdio(global_settings)
+        return
+
+    if not args.workflow_files:
+        parser.error("at least one workflow_file is required unless --serve is given")
 
     if not root_directory.is_dir():
         print(
             f"Error: Root directory not found at {root_directory}", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Workflow file: {workflow_file_path}")
     print(f"Root directory: {root_directory}")
 
-    try:
-        workflow_content = workflow_file_path.read_text()
-    except Exception as e:
-        print(
-            f"Error reading workflow file {workflow_file_path}: {e}", file=sys.stderr)
-        sys.exit(1)
+    workflows: list[PWorkflow] = []
+    workflow_contents: list[str] = []
+    for workflow_file in args.workflow_files:
+        workflow_file_path: Path = workflow_file.resolve()
 
-    # 2. Deserialize the workflow structure using msgspec
-    ptw: PWorkflow
-    try:
-        file_extension = workflow_file_path.suffix.lower()
-        if file_extension == ".json":
-            ptw = msgspec.json.decode(workflow_content, type=PWorkflow)
-        elif file_extension in [".yaml", ".yml"]:
-            ptw = msgspec.yaml.decode(workflow_content, type=PWorkflow)
-        else:
+        if not workflow_file_path.is_file():
             print(
-                f"Error: Unsupported file extension '{file_extension}'. Please use .json or .yaml/.yml.", file=sys.stderr)
+                f"Error: Workflow file not found at {workflow_file_path}", file=sys.stderr)
             sys.exit(1)
 
-    except (msgspec.DecodeError, msgspec.ValidationError) as e:
-        print(
-            f"Error parsing workflow file {workflow_file_path}: {e}, content: {workflow_content}", file=sys.stderr)
-        sys.exit(1)
-    except Exception as e:  # Catch other potential errors during conversion/parsing
-        print(
-            f"An unexpected error occurred during workflow parsing: {e}, content: {workflow_content}", file=sys.stderr)
-        sys.exit(1)
+        print(f"Workflow file: {workflow_file_path}")
+
+        try:
+            workflow_content = workflow_file_path.read_text()
+        except Exception as e:
+            print(
+                f"Error reading workflow file {workflow_file_path}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        # 2. Deserialize the workflow structure using msgspec
+        ptw: PWorkflow
+        try:
+            file_extension = workflow_file_path.suffix.lower()
+            if file_extension == ".json":
+                ptw = msgspec.json.decode(workflow_content, type=PWorkflow)
+            elif file_extension in [".yaml", ".yml"]:
+                ptw = msgspec.yaml.decode(workflow_content, type=PWorkflow)
+            else:
+                print(
+                    f"Error: Unsupported file extension '{file_extension}'. Please use .json or .yaml/.yml.", file=sys.stderr)
+                sys.exit(1)
+
+        except (msgspec.DecodeError, msgspec.ValidationError) as e:
+            print(
+                f"Error parsing workflow file {workflow_file_path}: {e}, content: {workflow_content}", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:  # Catch other potential errors during conversion/parsing
+            print(
+                f"An unexpected error occurred during workflow parsing: {e}, content: {workflow_content}", file=sys.stderr)
+            sys.exit(1)
+
+        workflows.append(ptw)
+        workflow_contents.append(workflow_content)
+
+    workflow_content = "\n".join(workflow_contents)
+
+    if args.explain:
+        try:
+            for ptw in workflows:
+                for explanation in ptw.explain(global_settings=global_settings):
+                    print(explanation.format())
+        except Exception as e:
+            print(f"Error during workflow planning: {e}, content: {workflow_content}", file=sys.stderr)
+            traceback.print_exc()
+            sys.exit(1)
+        return
 
     # 3. Process the steps in the workflow
+    tracers: list[Tracer] = []
+    profile = ExecutionProfile() if profile_path is not None else None
+    if profile is not None:
+        tracers.append(profile)
+    memory_profile = MemoryProfile(spill_directory) if memory_profile_path is not None else None
+    if memory_profile is not None:
+        tracers.append(memory_profile)
+    summary = ExecutionSummary() if summary_path is not None else None
+    if summary is not None:
+        tracers.append(summary)
+
+    progress_stream = None
+    progress = None
+    if args.progress is not None:
+        try:
+            progress_stream = sys.stderr if args.progress == "-" else open(args.progress, "w")
+        except OSError as e:
+            print(f"Error opening progress file {args.progress}: {e}", file=sys.stderr)
+            sys.exit(1)
+        progress = ProgressReporter(progress_stream)
+        tracers.append(progress)
+
     try:
         print("Executing workflow...")
-        global_settings = GlobalSettings(
-            root_folder=root_directory,
-            frame_folder=frame_directory,
-            spill_folder=spill_directory,
-        )
-        ptw.execute(global_settings=global_settings)
+        tracer = MultiTracer(*tracers) if tracers else None
+        if len(workflows) == 1:
+            workflows[0].execute(global_settings=global_settings, tracer=tracer)
+        else:
+            execute_workflows(workflows, global_settings=global_settings, tracer=tracer)
         print("Workflow execution finished.")
+        if summary is not None:
+            summary.write(summary_path)
     except Exception as e:
         print(f"Error during workflow execution: {e}, content: {workflow_content}", file=sys.stderr)
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if progress is not None:
+            progress.close()
+            if progress_stream is not sys.stderr:
+                progress_stream.close()
+        if profile is not None:
+            try:
+                profile.write(profile_path)
+            except Exception as e:
+                print(f"Error writing profile report {profile_path}: {e}", file=sys.stderr)
+        if memory_profile is not None:
+            memory_profile.close()
+            try:
+                memory_profile.write(memory_profile_path)
+            except Exception as e:
+                print(f"Error writing memory profile report {memory_profile_path}: {e}", file=sys.stderr)
 
 
 if __name__ == "__main__":
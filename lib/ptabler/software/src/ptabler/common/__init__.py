@@ -1,7 +1,5 @@
 import polars as pl
-import polars_hash  # noqa: F401 - import for side effects
 import polars_pf  # noqa: F401 - import for side effects
-import polars_ds  # noqa: F401 - import for side effects
 from polars_pf import canonicalize, AxisId, AxisSpec
 from typing import Literal, Mapping
 
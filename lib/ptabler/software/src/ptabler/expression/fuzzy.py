@@ -1,6 +1,5 @@
 import typing
 import polars as pl
-import polars_ds as pds
 
 from .base import Expression
 
@@ -33,6 +32,8 @@ class StringDistanceExpression(Expression, tag='string_distance'):
 
     def to_polars(self) -> pl.Expr:
         """Converts the expression to a Polars expression using polars-ds."""
+        import polars_ds as pds  # imported on first use, it slows down startup
+
         s1_polars = self.string1.to_polars()
         s2_polars = self.string2.to_polars()
 
@@ -76,6 +77,8 @@ class FuzzyStringFilterExpression(Expression, tag='fuzzy_string_filter'):
 
     def to_polars(self) -> pl.Expr:
         """Converts the expression to a Polars boolean expression using polars-ds."""
+        import polars_ds as pds  # imported on first use, it slows down startup
+
         if self.bound < 0:
             raise ValueError(
                 f"FuzzyStringFilterExpression 'bound' ({self.bound}) cannot be negative.")
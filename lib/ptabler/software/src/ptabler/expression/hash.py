@@ -82,13 +82,14 @@ class HashExpression(Expression, tag='hash'):
                             polars-hash library accessor.
             ValueError: If an unknown hash_type or encoding is encountered.
         """
+        import polars_hash  # noqa: F401 - registers the .chash/.nchash namespaces on first use
 
         if self.hash_type == 'sha256':
             polars_hash_function_name = 'sha2_256'
         elif self.hash_type == 'sha512':
             polars_hash_function_name = 'sha2_512'
         elif self.hash_type == 'xxh3':  # Current API 'xxh3' implies 64-bit
-            polars_hash_function_name = 'xxh3_64bit'
+            polars_hash_function_name = 'xxh3_64'
         else:
             # For 'md5', 'blake3', 'wyhash', the API name matches the polars-hash name
             polars_hash_function_name = self.hash_type
@@ -1,15 +1,17 @@
-from .base import PStep, GlobalSettings, TableSpace, StepContext
+from .base import PStep, GlobalSettings, TableSpace, StepContext, ChainedTask
+from .tracing import MultiTracer, Tracer
 from .io import (
     ColumnSchema,
     ReadCsv,
     ReadNdjson,
     ReadParquet,
+    SortingColumn,
     WriteCsv,
     WriteNdjson,
     WriteParquet,
 )
 from .basics import AddColumns, Select, Unique, WithColumns, WithoutColumns
-from .filter import Filter
+from .filter import Filter, FilterInSetFile
 from .limit import Limit
 from .slice import Slice
 from .join import Join
@@ -18,6 +20,7 @@ from .concatenate import Concatenate
 from .sort import Sort
 from .write_frame import WriteFrame
 from .read_frame import ReadFrame
+from .materialize import Materialize
 
 from typing import Union
 
@@ -34,6 +37,7 @@ type AnyPStep = Union[
     WithColumns,
     WithoutColumns,
     Filter,
+    FilterInSetFile,
     Limit,
     Slice,
     Join,
@@ -42,6 +46,7 @@ type AnyPStep = Union[
     Sort,
     WriteFrame,
     ReadFrame,
+    Materialize,
 ]
 
 __all__ = [
@@ -49,6 +54,7 @@ __all__ = [
     "ReadCsv",
     "ReadNdjson",
     "ReadParquet",
+    "SortingColumn",
     "WriteCsv",
     "WriteNdjson",
     "WriteParquet",
@@ -58,6 +64,7 @@ __all__ = [
     "WithColumns",
     "WithoutColumns",
     "Filter",
+    "FilterInSetFile",
     "Limit",
     "Slice",
     "Join",
@@ -66,9 +73,13 @@ __all__ = [
     "Sort",
     "WriteFrame",
     "ReadFrame",
+    "Materialize",
     "PStep",
     "GlobalSettings",
     "TableSpace",
     "StepContext",
+    "ChainedTask",
+    "Tracer",
+    "MultiTracer",
     "AnyPStep",
 ]
@@ -1,9 +1,11 @@
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Literal, Optional
 import msgspec
 import polars as pl
 import dataclasses
 
+from .tracing import Tracer
+
 type TableSpace = dict[str, pl.LazyFrame]
 
 @dataclasses.dataclass
@@ -11,6 +13,42 @@ class GlobalSettings:
     root_folder: Path
     frame_folder: Optional[Path] = None
     spill_folder: Optional[Path] = None
+    # Maximum number of chained tasks (e.g. WriteFrame sort + convert) running at
+    # once, and of sink groups collected at once with `pipeline_sinks`
+    max_parallel_tasks: int = 1
+    # Collect sinks with dependent chained tasks separately and start each task
+    # as soon as its own sink completes, instead of after all sinks
+    pipeline_sinks: bool = False
+    # Persistent cache of sink outputs shared between runs; disabled if None
+    cache_folder: Optional[Path] = None
+    # How inputs are fingerprinted for the cache: by path, size and mtime ("stat")
+    # or by content ("digest")
+    cache_fingerprint: Literal["stat", "digest"] = "stat"
+    # Memory budget in bytes shared by Polars, DuckDB and PFrame readers; engines
+    # spill to spill_folder instead of growing past it. Engine defaults if None
+    memory_limit: Optional[int] = None
+    # Maximum number of threads for DuckDB and PFrame readers; the Polars thread
+    # pool is sized on import, from POLARS_MAX_THREADS. All cores if None
+    threads: Optional[int] = None
+    # Reuse the outputs of an interrupted run: complete WriteFrame directories are
+    # kept and partial ones restart from their last completed stage. Work files of
+    # failed WriteFrame steps are only kept in this mode
+    resume: bool = False
+
+@dataclasses.dataclass
+class ChainedTask:
+    """
+    A task scheduled to run after sink operations are completed.
+    The label identifies the task in execution profiles and logs.
+    If `sink` is set, the task only depends on the sink with that index
+    (as returned by `StepContext.add_sink`), otherwise it depends on all sinks.
+    """
+    label: str
+    run: Callable[[], None]
+    sink: Optional[int] = None
+
+    def __call__(self) -> None:
+        self.run()
 
 class StepContext:
     """
@@ -21,16 +59,39 @@ class StepContext:
         self,
         settings: GlobalSettings,
         initial_table_space: TableSpace | None = None,
+        tracer: Tracer | None = None,
+        dry_run: bool = False,
     ):
         self._settings = settings
         self._table_space = initial_table_space if initial_table_space is not None else {}
         self._lazy_frames: list[pl.LazyFrame] = []
-        self._chained_tasks: list[callable] = []
+        self._sink_labels: list[str] = []
+        self._sink_row_counts: dict[int, pl.LazyFrame] = {}
+        self._chained_tasks: list[ChainedTask] = []
+        self._setup_tasks: list[ChainedTask] = []
+        self._cleanup_tasks: list[ChainedTask] = []
+        self._tracer = tracer if tracer is not None else Tracer()
+        self._dry_run = dry_run
     
     @property
     def settings(self) -> GlobalSettings:
         """Returns the global settings (read-only)."""
         return self._settings
+
+    @property
+    def tracer(self) -> Tracer:
+        """Returns the tracer receiving execution phase notifications."""
+        return self._tracer
+
+    @property
+    def dry_run(self) -> bool:
+        """
+        True if the workflow is only planned (e.g. to explain its sinks) and
+        will never be executed. Steps must then not produce side effects
+        such as creating directories or computing data eagerly. Chained
+        tasks never run in a dry run; cleanup tasks still do.
+        """
+        return self._dry_run
     
     def get_table(self, table_name: str) -> pl.LazyFrame:
         """
@@ -62,26 +123,101 @@ class StepContext:
         """
         self._table_space[table_name] = lazy_frame
     
-    def add_sink(self, lazy_frame: pl.LazyFrame):
+    def add_sink(
+        self,
+        lazy_frame: pl.LazyFrame,
+        label: str = "sink",
+        rows: Optional[pl.LazyFrame] = None,
+    ) -> int:
         """
         Adds a lazy frame to the collection of sink operations.
         
         Args:
             lazy_frame: The lazy frame to add
+            label: Identifies the sink in execution profiles
+            rows: The table the sink writes. If the tracer wants row counts
+                  (see `Tracer.wants_sink_rows`), its height is computed in
+                  the same collection as the sink and reported to the tracer.
+            
+        Returns:
+            The index of the sink, to be passed to `chain_task(after_sink=...)`
         """
         self._lazy_frames.append(lazy_frame)
+        self._sink_labels.append(label)
+        index = len(self._lazy_frames) - 1
+        if rows is not None and not self._dry_run and self._tracer.wants_sink_rows():
+            self._sink_row_counts[index] = rows.select(pl.len())
+        return index
+
+    def sink_labels(self) -> list[str]:
+        """Returns the labels of the sinks, in the order they were added."""
+        return self._sink_labels
+
+    def sink_row_counts(self) -> dict[int, pl.LazyFrame]:
+        """Returns the frames counting the rows of sinks (see `add_sink`), by sink index."""
+        return self._sink_row_counts
+
+    def sink_frames(self) -> list[pl.LazyFrame]:
+        """Returns the sink lazy frames, in the order they were added."""
+        return self._lazy_frames
+
+    def add_setup_task(self, task: Callable[[], None], label: str = "setup"):
+        """
+        Adds a task preparing the sinks (e.g. creating an output directory).
+
+        Setup tasks run after all steps are planned and their schemas are
+        validated, right before the sinks are executed, so an invalid
+        workflow leaves no partial outputs behind. They never run in a dry run.
+
+        Args:
+            task: A callable (lambda or function) to be executed later
+            label: Identifies the task in execution profiles
+        """
+        self._setup_tasks.append(ChainedTask(label=label, run=task))
+
+    def setup_tasks(self) -> list[ChainedTask]:
+        """Returns the setup tasks, in the order they were added."""
+        return self._setup_tasks
+
+    def add_cleanup_task(self, task: Callable[[], None], label: str = "cleanup"):
+        """
+        Adds a task releasing a resource the sinks rely on (e.g. removing a
+        temporary file).
+
+        Cleanup tasks run once the sinks and chained tasks are done, and also
+        when planning or execution fails. With `lazy=True` execution the
+        caller runs them (see `cleanup_tasks`).
+
+        Args:
+            task: A callable (lambda or function) to be executed later
+            label: Identifies the task in execution profiles
+        """
+        self._cleanup_tasks.append(ChainedTask(label=label, run=task))
+
+    def cleanup_tasks(self) -> list[ChainedTask]:
+        """Returns the cleanup tasks, in the order they were added."""
+        return self._cleanup_tasks
     
-    def chain_task(self, task: callable):
+    def chain_task(
+        self,
+        task: Callable[[], None],
+        label: str = "task",
+        after_sink: Optional[int] = None,
+    ):
         """
-        Adds a task to be executed after all sink operations are completed.
+        Adds a task to be executed after sink operations are completed.
         
         Args:
             task: A callable (lambda or function) to be executed later
+            label: Identifies the task in execution profiles
+            after_sink: Index of the only sink the task depends on. When set,
+                        the task may start as soon as that sink completes.
+                        When None, the task waits for all sinks.
         """
-        self._chained_tasks.append(task)
+        self._chained_tasks.append(ChainedTask(label=label, run=task, sink=after_sink))
     
     
-    def into_parts(self) -> tuple[dict[str, pl.LazyFrame], list[pl.LazyFrame], list[callable]]:
+    def into_parts(self) -> tuple[dict[str, pl.LazyFrame], list[pl.LazyFrame], list[ChainedTask]]:
         """
         Destructs the StepContext and returns its internal state.
         
@@ -95,10 +231,80 @@ class StepContext:
         return self._table_space, self._lazy_frames, self._chained_tasks
 
 
+# Step fields holding the name of a table the step reads from the table space
+_INPUT_TABLE_FIELDS = ("input_table", "left_table", "right_table", "table")
+# Step fields holding a list of names of tables the step reads
+_INPUT_TABLE_LIST_FIELDS = ("input_tables",)
+# Step fields holding the name of a table the step puts into the table space
+_OUTPUT_TABLE_FIELDS = ("output_table", "name")
+
+
 class PStep(msgspec.Struct, tag_field="type", rename="camel"):
     """
     Base class for all steps in the pipeline.
     """
+    def table_inputs(self) -> list[str]:
+        """
+        Returns the names of the tables this step reads from the table space.
+
+        The default implementation collects the values of the conventional
+        input fields (`input_table`, `left_table`, `right_table`, `table`,
+        `input_tables`). Steps that use these names differently override it.
+        """
+        inputs = [
+            getattr(self, f) for f in _INPUT_TABLE_FIELDS
+            if isinstance(getattr(self, f, None), str)
+        ]
+        for field in _INPUT_TABLE_LIST_FIELDS:
+            inputs.extend(getattr(self, field, None) or [])
+        return inputs
+
+    def table_outputs(self) -> list[str]:
+        """
+        Returns the names of the tables this step puts into the table space.
+
+        The default implementation collects the values of the conventional
+        output fields (`output_table`, `name`).
+        """
+        return [
+            getattr(self, f) for f in _OUTPUT_TABLE_FIELDS
+            if isinstance(getattr(self, f, None), str)
+        ]
+
+    def is_sink(self) -> bool:
+        """
+        Returns True if the step produces output outside the table space
+        (files, frames). Sinks are the roots of dead-step elimination.
+        """
+        return False
+
+    def sink_label(self) -> str:
+        """Returns the label of the sink added by a sink step (see `StepContext.add_sink`)."""
+        return type(self).__struct_config__.tag
+
+    def needs_table_inputs(self, settings: GlobalSettings) -> bool:
+        """
+        Returns False if the step can run without reading its input tables,
+        e.g. a sink resuming from the files of an interrupted run (see
+        `GlobalSettings.resume`). The steps producing those tables are then
+        skipped unless something else needs them.
+        """
+        return True
+
+    def input_paths(self, settings: GlobalSettings) -> list[str]:
+        """
+        Returns the files and directories outside the table space that the
+        step reads. Used to fingerprint inputs for the result cache.
+        """
+        return []
+
+    def output_paths(self, settings: GlobalSettings) -> list[str]:
+        """
+        Returns the files and directories the step writes once the workflow
+        has completed. Used to store and restore results of the result cache.
+        """
+        return []
+
     def execute(self, ctx: StepContext):
         """
         Executes the current step within the PTabler workflow.
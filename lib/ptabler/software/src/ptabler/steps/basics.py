@@ -22,6 +22,9 @@ class AddColumns(PStep, tag="add_columns"):
     table: str
     columns: List[AnyExpression]
 
+    def table_outputs(self) -> list[str]:
+        return [self.table]
+
     def execute(self, ctx: StepContext):
         lf = ctx.get_table(self.table)
 
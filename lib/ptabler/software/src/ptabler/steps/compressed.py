@@ -0,0 +1,421 @@
+import collections
+import concurrent.futures
+import io
+import os
+import threading
+import zlib
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+import polars as pl
+import pyarrow as pa
+from polars.io.plugins import register_io_source
+
+# Compression codecs by file extension; Polars would decompress these files whole in memory
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+# Decompressed bytes parsed at a time, bounding the memory held per scanned file
+BLOCK_SIZE = 16 * 1024 * 1024
+
+# Uncompressed bytes compressed at a time by one thread when writing
+COMPRESSION_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Leading bytes of gzip members and zstd frames
+_MAGIC = (b"\x1f\x8b", b"\x28\xb5\x2f\xfd")
+
+# File extensions of written compression codecs
+EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def compression_of(path: str) -> Optional[str]:
+    """Returns the compression codec of `path` from its extension, or None for uncompressed files."""
+    return COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def is_compressed(path: str) -> Optional[bool]:
+    """
+    Tells from its content whether `path` is gzip or zstd compressed.
+    Returns None while the file is too short to tell.
+    """
+    with open(path, "rb") as f:
+        head = f.read(4)
+    if len(head) < 4:
+        return None if not head or any(magic.startswith(head) for magic in _MAGIC) else False
+    return head.startswith(_MAGIC)
+
+
+def _count_records(data: bytes, quote: Optional[bytes]) -> int:
+    """Counts the newlines outside quoted fields of `data`, which starts at a record boundary."""
+    return count_record_ends(data, quote)[0]
+
+
+def count_record_ends(data: bytes, quote: Optional[bytes], quoted: bool = False) -> Tuple[int, bool]:
+    """
+    Counts the newlines outside quoted fields of `data`, one of the chunks
+    of a file read in order. `quoted` tells whether the chunk starts inside
+    a quoted field; returns the count and whether the next chunk does.
+    """
+    if quote is None or quote not in data:
+        return data.count(b"\n"), quoted
+    parts = data.split(quote)
+    return sum(part.count(b"\n") for part in parts[int(quoted)::2]), quoted != (len(parts) % 2 == 0)
+
+
+def _nth_record_end(data: bytes, n: int, quote: Optional[bytes]) -> int:
+    """Returns the position after the `n`-th record of `data`, or len(data) if it has fewer."""
+    position = 0
+    parts = data.split(quote) if quote is not None else [data]
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            end = -1
+            while n and (end := part.find(b"\n", end + 1)) != -1:
+                n -= 1
+            if n == 0:
+                return position + end + 1
+        position += len(part) + (len(quote) if quote is not None else 0)
+    return len(data)
+
+
+def _record_end(block: bytes, quote: Optional[bytes]) -> int:
+    """
+    Returns the position after the last complete record of `block`, which
+    starts at a record boundary, or 0 if it holds no complete record. With
+    `quote`, newlines inside quoted fields do not end a record.
+    """
+    end = block.rfind(b"\n")
+    if quote is not None:
+        quotes = block.count(quote)
+        while end != -1 and (quotes - block.count(quote, end)) % 2:
+            end = block.rfind(b"\n", 0, end)
+    return end + 1
+
+
+def _blocks(path: str, block_size: int, quote: Optional[bytes]) -> Iterator[bytes]:
+    """Yields the decompressed content of `path` in blocks of whole records."""
+    with pa.input_stream(path, compression=compression_of(path)) as stream:
+        rest = b""
+        while chunk := stream.read(block_size):
+            block = rest + chunk
+            end = _record_end(block, quote)
+            rest = block[end:]
+            if end:
+                yield block[:end]
+        if rest:
+            yield rest
+
+
+def count_records(path: str, quote: Optional[bytes] = None) -> int:
+    """Counts the lines of a text file, compressed or not, as a stream; with `quote`, CSV records."""
+    records = 0
+    last = b""
+    for block in _blocks(path, BLOCK_SIZE, quote):
+        records += _count_records(block, quote)
+        last = block
+    return records + (1 if last and not last.endswith(b"\n") else 0)
+
+
+def scan_blocks(
+    paths: List[str],
+    parse: Callable[[bytes, bool, Optional[Dict[str, pl.DataType]], Optional[List[str]]], pl.DataFrame],
+    n_rows: Optional[int] = None,
+    include_file_paths: Optional[str] = None,
+    quote: Optional[bytes] = None,
+    block_size: int = BLOCK_SIZE,
+) -> pl.LazyFrame:
+    """
+    Lazily scans text files, compressed or not, decompressing and parsing
+    them one block of records at a time so memory stays bounded by the
+    block size rather than the file size.
+
+    `parse(block, first, schema, columns)` parses one block; `first` is
+    True for the first block of a file (which holds the header, if any).
+    The schema is inferred by parsing the first block of the first file
+    with `schema` None; later blocks are parsed with it, and only the
+    `columns` the query uses (in schema order, None for all) need to be
+    parsed.
+    """
+    inferred: Dict[str, Any] = {}
+
+    def schema() -> Dict[str, pl.DataType]:
+        if "schema" not in inferred:
+            first_block = next(_blocks(paths[0], block_size, quote), b"")
+            inferred["schema"] = dict(parse(first_block, True, None, None).schema)
+        return inferred["schema"]
+
+    def full_schema() -> pl.Schema:
+        if include_file_paths is None:
+            return pl.Schema(schema())
+        return pl.Schema({**schema(), include_file_paths: pl.String})
+
+    def source(
+        with_columns: Optional[List[str]],
+        predicate: Optional[pl.Expr],
+        limit: Optional[int],
+        batch_size: Optional[int],
+    ) -> Iterator[pl.DataFrame]:
+        columns = None
+        if with_columns is not None:
+            used = set(with_columns)
+            if predicate is not None:
+                used.update(predicate.meta.root_names())
+            columns = [column for column in schema() if column in used] or None
+        to_read = n_rows
+        remaining = limit
+        for path in paths:
+            for i, block in enumerate(_blocks(path, block_size, quote)):
+                df = parse(block, i == 0, schema(), columns)
+                if to_read is not None:
+                    df = df.head(to_read)
+                    to_read -= df.height
+                if include_file_paths is not None:
+                    df = df.with_columns(pl.lit(path, pl.String).alias(include_file_paths))
+                if predicate is not None:
+                    df = df.filter(predicate)
+                if with_columns is not None:
+                    df = df.select(with_columns)
+                if remaining is not None:
+                    df = df.head(remaining)
+                    remaining -= df.height
+                yield from (df.iter_slices(batch_size) if batch_size else [df])
+                if to_read == 0 or remaining == 0:
+                    return
+
+    return register_io_source(source, schema=full_schema)
+
+
+def _compressor(compression: Optional[str], level: Optional[int]) -> Optional[Callable[[bytes], bytes]]:
+    """Returns a function compressing one block into a self-contained gzip member or zstd frame."""
+    if compression is None:
+        return None
+    if compression == "gzip":
+        gzip_level = 6 if level is None else level
+
+        def gzip_member(data: bytes) -> bytes:
+            compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            return compressor.compress(data) + compressor.flush()
+        return gzip_member
+    if compression == "zstd":
+        codec = pa.Codec("zstd", compression_level=3 if level is None else level)
+        return lambda data: codec.compress(data, asbytes=True)
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class CompressionPool:
+    """
+    Threads compressing the blocks of `ShardedWriter`s, started on the
+    first submitted block. One pool can be shared by all writers of a sink
+    (e.g. the files of every partition), bounding its threads to `threads`.
+    """
+
+    def __init__(self, threads: Optional[int] = None):
+        self.threads = threads or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def submit(self, fn: Callable[[bytes], bytes], block: bytes) -> concurrent.futures.Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    self.threads, thread_name_prefix="ptabler-compress"
+                )
+            return self._executor.submit(fn, block)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+class ShardedWriter(io.RawIOBase):
+    """
+    Binary file object for Polars CSV and NDJSON sinks that compresses the
+    output and splits it into several files.
+
+    Output is cut into blocks that are compressed on `threads` threads as
+    independent gzip members or zstd frames; concatenated, they form a
+    valid compressed file, so blocks are written in order as they finish.
+    With `pool`, blocks are compressed on that shared pool instead, which
+    its owner shuts down.
+
+    With `max_rows` or `max_bytes` (counted before compression), `path` is a
+    directory of shards named `part-00000<suffix>`, ...; a new shard is
+    started at the record boundary where the current one would exceed
+    either limit. With `header`, the first record written is the header
+    and is repeated at the start of every shard. `quote` is the quote
+    character of CSV output, whose quoted fields may contain newlines.
+
+    Files are opened on the first write; `flush`, called by Polars once the
+    sink is done, writes the remaining blocks and closes them. Shards left
+    in the directory by an earlier run are removed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        suffix: str = "",
+        header: bool = False,
+        quote: Optional[bytes] = None,
+        threads: Optional[int] = None,
+        pool: Optional[CompressionPool] = None,
+    ):
+        super().__init__()
+        self._path = path
+        self._compress = _compressor(compression, compression_level)
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        self._sharded = max_rows is not None or max_bytes is not None
+        self._suffix = suffix
+        self._quote = quote
+        self._header: Optional[bytes] = None
+        self._header_pending = header and self._sharded
+        self._owns_pool = pool is None
+        self._pool = CompressionPool(threads) if pool is None else pool
+        self._carry = b""
+        self._shard: Optional[int] = None
+        self._shard_rows = 0
+        self._shard_bytes = 0
+        self._shard_submitted = False
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._queue: Deque[Tuple[int, concurrent.futures.Future]] = collections.deque()
+        self._file: Optional[io.BufferedWriter] = None
+        self._file_shard: Optional[int] = None
+        self._opened: Set[int] = set()
+        self._closing = False
+
+    def shard_path(self, shard: int) -> str:
+        if not self._sharded:
+            return self._path
+        return os.path.join(self._path, f"part-{shard:05d}{self._suffix}")
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = self._carry + bytes(b)
+        end = _record_end(data, self._quote)
+        self._carry = data[end:]
+        data = data[:end]
+        if self._header_pending and data:
+            header_end = _nth_record_end(data, 1, self._quote)
+            self._header, data = data[:header_end], data[header_end:]
+            self._header_pending = False
+        if data and self._shard is None:
+            self._start_shard()
+        while data:
+            take = self._fitting(data)
+            if take == 0:
+                self._submit()
+                self._start_shard()
+                continue
+            self._append(data[:take])
+            data = data[take:]
+        return len(b)
+
+    def flush(self) -> None:
+        if self.closed or self._closing:
+            return
+        if self._carry:
+            # Last record without a trailing newline
+            self._append(self._carry)
+            self._carry = b""
+        if self._shard is None:
+            self._start_shard()
+        self._submit(force=not self._shard_submitted)
+        self._drain(everything=True)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._owns_pool:
+            self._pool.shutdown()
+
+    def close(self) -> None:
+        # Unlike `flush`, closing (e.g. on garbage collection of a sink that was
+        # never collected) must not create or finish outputs
+        self._closing = True
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._owns_pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        super().close()
+
+    def _fitting(self, data: bytes) -> int:
+        """Returns how much of `data`, which ends at a record boundary, fits into the current shard."""
+        if not self._sharded:
+            return len(data)
+        take = len(data)
+        if self._max_rows is not None:
+            room = self._max_rows - self._shard_rows
+            if room <= 0:
+                return 0
+            if _count_records(data, self._quote) > room:
+                take = _nth_record_end(data, room, self._quote)
+        if self._max_bytes is not None and self._shard_bytes + take > self._max_bytes:
+            take = _record_end(data[:max(0, self._max_bytes - self._shard_bytes)], self._quote)
+            if take == 0 and self._shard_rows == 0:
+                # A record larger than the limit gets a shard of its own
+                take = _nth_record_end(data, 1, self._quote)
+        return take
+
+    def _start_shard(self) -> None:
+        self._shard = 0 if self._shard is None else self._shard + 1
+        self._shard_rows = 0
+        self._shard_bytes = 0
+        self._shard_submitted = False
+        if self._header is not None:
+            self._buffer.append(self._header)
+            self._buffered += len(self._header)
+            self._shard_bytes += len(self._header)
+
+    def _append(self, data: bytes) -> None:
+        if self._shard is None:
+            self._start_shard()
+        self._buffer.append(data)
+        self._buffered += len(data)
+        self._shard_bytes += len(data)
+        if self._sharded:
+            self._shard_rows += _count_records(data, self._quote)
+        if self._buffered >= COMPRESSION_BLOCK_SIZE:
+            self._submit()
+
+    def _submit(self, force: bool = False) -> None:
+        if not self._buffer and not force:
+            return
+        block = b"".join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        if self._compress is None:
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            future.set_result(block)
+        else:
+            future = self._pool.submit(self._compress, block)
+        self._queue.append((self._shard, future))
+        self._shard_submitted = True
+        self._drain()
+
+    def _drain(self, everything: bool = False) -> None:
+        """Writes finished blocks in order, waiting while too many blocks are in flight."""
+        while self._queue and (everything or len(self._queue) > 2 * self._pool.threads or self._queue[0][1].done()):
+            shard, future = self._queue.popleft()
+            data = future.result()
+            if self._file_shard != shard:
+                self._open(shard)
+            self._file.write(data)
+
+    def _open(self, shard: int) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self._sharded and not self._opened:
+            os.makedirs(self._path, exist_ok=True)
+            # Shards of an earlier run would otherwise be mixed into the output
+            for name in os.listdir(self._path):
+                if name.startswith("part-"):
+                    os.remove(os.path.join(self._path, name))
+        self._file = open(self.shard_path(shard), "ab" if shard in self._opened else "wb")
+        self._file_shard = shard
+        self._opened.add(shard)
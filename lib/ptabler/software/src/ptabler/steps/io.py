@@ -1,41 +1,195 @@
 import polars as pl
+import glob
 import os
-from typing import List, Optional, Dict, Any 
+import re
+import shutil
+import urllib.parse
+from typing import IO, Callable, ClassVar, List, Literal, Optional, Dict, Any, Union
 import msgspec
 
 from ptabler.common import toPolarsType, PType
 
-from .base import PStep, StepContext
+from .base import GlobalSettings, PStep, StepContext
+from .compressed import EXTENSIONS, CompressionPool, ShardedWriter, compression_of, scan_blocks
 from .util import normalize_path
 
+Compression = Literal["gzip", "zstd"]
+ParquetCompression = Literal["uncompressed", "snappy", "gzip", "lz4", "zstd", "brotli"]
+
+# Key of the Parquet key-value metadata entry listing the declared sort order
+SORTING_COLUMNS_KEY = "sorting_columns"
+
 class ColumnSchema(msgspec.Struct, frozen=True, omit_defaults=True):
     """Defines the schema for a single column, mirroring the TS definition."""
     column: str
     type: Optional[PType] = None
     null_value: Optional[str] = None # Specific string to be interpreted as null for this column
 
+# Characters that make a path a glob pattern
+_GLOB_CHARS = re.compile(r"[*?\[]")
+# A `key=value` directory of a hive-partitioned dataset
+_HIVE_PARTITION = re.compile(r"^([^=]+)=(.*)$")
+# Column holding the source path while hive columns are derived from it
+_SOURCE_PATH_COLUMN = "__ptabler_source_path"
+# Value of a hive partition column that stands for null
+_HIVE_NULL = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _hive_base(sources: List[str]) -> str:
+    """
+    Returns the base directory of the dataset read from `sources`: the
+    common directory of their non-glob prefixes. Only directories below it
+    are partitions, so `key=value` directories above the dataset (e.g. in
+    the root folder) do not become columns.
+    """
+    directories = []
+    for source in sources:
+        glob_char = _GLOB_CHARS.search(source)
+        directories.append(os.path.dirname(source[:glob_char.start()] if glob_char else source))
+    return os.path.commonpath(directories)
+
+
+def _hive_partitions(path: str, base: str) -> Dict[str, Optional[str]]:
+    """
+    Returns the partition values of the file at `path`, from the `key=value`
+    directories between `base` and the file, in tree order. Values are
+    percent-decoded (as Polars encodes `/`, newlines etc.).
+    """
+    partitions: Dict[str, Optional[str]] = {}
+    for part in os.path.relpath(os.path.dirname(path), base).split(os.sep):
+        match = _HIVE_PARTITION.match(part)
+        if match and match.group(1) not in partitions:
+            value = match.group(2)
+            partitions[match.group(1)] = None if value == _HIVE_NULL else urllib.parse.unquote(value)
+    return partitions
+
+
+def _expand_globs(sources: List[str]) -> List[str]:
+    """Replaces glob patterns in `sources` by the matching paths, sorted; patterns matching nothing are kept."""
+    paths: List[str] = []
+    for source in sources:
+        matches = sorted(glob.glob(source, recursive=True)) if _GLOB_CHARS.search(source) else []
+        paths.extend(matches or [source])
+    return paths
+
+
+def _split_block_kwargs(scan_kwargs: Dict[str, Any]) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """Splits scan arguments into those of `scan_blocks` and those of the per-block parser."""
+    parse_kwargs = dict(scan_kwargs)
+    block_kwargs = {key: parse_kwargs.pop(key) for key in ("n_rows", "include_file_paths") if key in parse_kwargs}
+    return block_kwargs, parse_kwargs
+
+
+class _PartitionFiles:
+    """
+    `file_path` callback of a Polars partitioned sink: returns what
+    `open_file` makes of the path of every partition file.
+    """
+
+    def __init__(self, base_path: str, open_file: Callable[[str], Union[str, IO[bytes]]]):
+        self._base_path = base_path
+        self._open_file = open_file
+
+    def __call__(self, ctx: pl.KeyedPartitionContext) -> Union[str, IO[bytes]]:
+        file_path = os.path.join(self._base_path, ctx.file_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        return self._open_file(file_path)
+
+
+def _clear_dataset_dir(path: str) -> None:
+    """Replaces a dataset written by an earlier run with an empty directory."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+
+class SortingColumn(msgspec.Struct, frozen=True, omit_defaults=True, rename="camel"):
+    """A column the rows of a written file are sorted by."""
+    column: str
+    descending: Optional[bool] = None  # Defaults to False (ascending)
+    nulls_last: Optional[bool] = None  # Defaults to False (nulls first)
+
+
 class BaseReadLogic(PStep):
     """
     Abstract base class for PSteps that read files into the tablespace.
     It handles common logic like schema processing, null values, and table space updates.
     Concrete subclasses must implement the _do_scan method.
+
+    `file` is a path relative to the root folder, a glob pattern (e.g.
+    `shards/*.csv`, `data/**/*.parquet`) or a list of them; all matching
+    files are read by one scan, in parallel, and must share their columns.
+    With `hive_partitioning`, `key=value` directories in the paths become
+    columns; types from `schema` apply to them too.
+
+    With `columns`, only the listed columns (file or partition columns) are
+    kept; the projection is pushed into the scan, so other columns are
+    never parsed.
+
+    Text formats also read gzip (`.gz`) and zstd (`.zst`) compressed files,
+    decompressing them as a stream.
     """
     # These attributes are expected to be defined by subclasses that are msgspec.Structs
     # and PStep compliant.
-    file: str
+    file: Union[str, List[str]]
     name: str
     schema: Optional[List[ColumnSchema]]
     infer_schema: Optional[bool]
     ignore_errors: Optional[bool]
     n_rows: Optional[int]
+    hive_partitioning: Optional[bool]
+    columns: Optional[List[str]]
 
-    def _do_scan(self, file_path: str, scan_kwargs: Dict[str, Any]) -> pl.LazyFrame:
+    def _do_scan(self, source: Union[str, List[str]], scan_kwargs: Dict[str, Any]) -> pl.LazyFrame:
         """
         Performs the specific scan operation for the derived class.
-        This method should return a Polars LazyFrame from the file.
+        This method should return a Polars LazyFrame from the file, glob
+        pattern or list of files in `source`.
         """
         pass
 
+    def _scan_hive(
+        self,
+        source: Union[str, List[str]],
+        scan_kwargs: Dict[str, Any],
+        hive_types: Dict[str, pl.DataType],
+        settings: GlobalSettings,
+    ) -> pl.LazyFrame:
+        """
+        Scans a hive-partitioned dataset. The default implementation derives
+        the partition columns from the directories of the scanned files
+        below the dataset base (see `_hive_base`), as strings unless typed
+        in `hive_types`; formats with native hive support override it.
+        """
+        sources = self._sources(settings)
+        base = _hive_base(sources)
+        # The expanded paths are scanned, so the source path column holds them verbatim
+        paths = _expand_globs(sources)
+        partitions = {path: _hive_partitions(path, base) for path in paths}
+        keys = list(dict.fromkeys(key for values in partitions.values() for key in values))
+        scan_kwargs = {**scan_kwargs, "include_file_paths": _SOURCE_PATH_COLUMN}
+        if "schema_overrides" in scan_kwargs:
+            scan_kwargs["schema_overrides"] = {
+                column: dtype for column, dtype in scan_kwargs["schema_overrides"].items() if column not in keys
+            }
+        lf = self._do_scan(paths, scan_kwargs)
+        partition_columns = []
+        for key in keys:
+            values = {path: partition.get(key) for path, partition in partitions.items()}
+            value = pl.col(_SOURCE_PATH_COLUMN).replace_strict(values, return_dtype=pl.String)
+            if key in hive_types:
+                value = value.cast(hive_types[key])
+            partition_columns.append(value.alias(key))
+        return lf.with_columns(partition_columns).drop(_SOURCE_PATH_COLUMN)
+
+    def _sources(self, settings: GlobalSettings) -> List[str]:
+        files = [self.file] if isinstance(self.file, str) else self.file
+        return [os.path.join(settings.root_folder, normalize_path(file)) for file in files]
+
+    def input_paths(self, settings: GlobalSettings) -> list[str]:
+        # Glob patterns are expanded so the result cache fingerprints the matching files
+        return _expand_globs(self._sources(settings))
+
     def execute(self, ctx: StepContext):
         """
         Common execution logic for reading steps.
@@ -70,9 +224,16 @@ class BaseReadLogic(PStep):
         if self.ignore_errors is not None:
             scan_kwargs["ignore_errors"] = self.ignore_errors
 
-        file_path = os.path.join(ctx.settings.root_folder, normalize_path(self.file))
-        lazy_frame = self._do_scan(file_path, scan_kwargs)
-        
+        sources = self._sources(ctx.settings)
+        source = sources[0] if isinstance(self.file, str) else sources
+        if self.hive_partitioning:
+            lazy_frame = self._scan_hive(source, scan_kwargs, defined_column_types, ctx.settings)
+        else:
+            lazy_frame = self._do_scan(source, scan_kwargs)
+
+        if self.columns:
+            lazy_frame = lazy_frame.select(self.columns)
+
         ctx.put_table(self.name, lazy_frame)
 
 class ReadCsv(BaseReadLogic, tag="read_csv"):
@@ -80,7 +241,7 @@ class ReadCsv(BaseReadLogic, tag="read_csv"):
     PStep to read data from a CSV file into the tablespace.
     Corresponds to the ReadCsvStep in the TypeScript definitions.
     """
-    file: str  # Path to the CSV file
+    file: Union[str, List[str]]  # Path, glob pattern or list of paths of the CSV files
     name: str  # Name to assign to the loaded DataFrame in the tablespace
 
     delimiter: Optional[str] = None
@@ -90,8 +251,10 @@ class ReadCsv(BaseReadLogic, tag="read_csv"):
     infer_schema: Optional[bool] = None
     ignore_errors: Optional[bool] = None
     n_rows: Optional[int] = None
+    hive_partitioning: Optional[bool] = None
+    columns: Optional[List[str]] = None  # Optional: List of column names to read
 
-    def _do_scan(self, file_path: str, scan_kwargs: Dict[str, Any]) -> pl.LazyFrame:
+    def _do_scan(self, source: Union[str, List[str]], scan_kwargs: Dict[str, Any]) -> pl.LazyFrame:
         """
         Prepares a Polars scan plan to read the CSV file.
         """
@@ -99,60 +262,166 @@ class ReadCsv(BaseReadLogic, tag="read_csv"):
             scan_kwargs["separator"] = self.delimiter
         if self.comment_prefix is not None:
             scan_kwargs["comment_prefix"] = self.comment_prefix
-    
-        return pl.scan_csv(file_path, **scan_kwargs)
+
+        paths = _expand_globs([source] if isinstance(source, str) else source)
+        if not any(compression_of(path) for path in paths):
+            return pl.scan_csv(source, **scan_kwargs)
+
+        # Polars decompresses whole files in memory, so compressed files are parsed block by block
+        block_kwargs, parse_kwargs = _split_block_kwargs(scan_kwargs)
+        read_kwargs = {k: v for k, v in parse_kwargs.items() if k not in ("schema_overrides", "infer_schema")}
+
+        def parse(
+            block: bytes,
+            first: bool,
+            schema: Optional[Dict[str, pl.DataType]],
+            columns: Optional[List[str]],
+        ) -> pl.DataFrame:
+            if schema is None:
+                return pl.read_csv(block, **parse_kwargs)
+            # Columns are selected by index, as blocks after the first have no header
+            indices = None if columns is None else [i for i, column in enumerate(schema) if column in columns]
+            return pl.read_csv(block, has_header=first, schema=schema, columns=indices, **read_kwargs)
+
+        return scan_blocks(paths, parse, quote=b'"', **block_kwargs)
 
 class ReadNdjson(BaseReadLogic, tag="read_ndjson"):
     """
     PStep to read data from an NDJSON file into the tablespace.
     Corresponds to the ReadNdjsonStep in the TypeScript definitions.
     """
-    file: str  # Path to the NDJSON file
+    file: Union[str, List[str]]  # Path, glob pattern or list of paths of the NDJSON files
     name: str  # Name to assign to the loaded DataFrame in the tablespace
 
     schema: Optional[List[ColumnSchema]] = None
     infer_schema: Optional[bool] = None
     ignore_errors: Optional[bool] = None
     n_rows: Optional[int] = None
+    hive_partitioning: Optional[bool] = None
+    columns: Optional[List[str]] = None  # Optional: List of column names to read
 
-    def _do_scan(self, file_path: str, scan_kwargs: Dict[str, Any]) -> pl.LazyFrame:
+    def _do_scan(self, source: Union[str, List[str]], scan_kwargs: Dict[str, Any]) -> pl.LazyFrame:
         """
         Prepares a Polars scan plan to read the NDJSON file.
         """
-        return pl.scan_ndjson(file_path, **scan_kwargs)
+        paths = _expand_globs([source] if isinstance(source, str) else source)
+        if not any(compression_of(path) for path in paths):
+            return pl.scan_ndjson(source, **scan_kwargs)
+
+        # Polars decompresses whole files in memory, so compressed files are parsed block by block
+        block_kwargs, parse_kwargs = _split_block_kwargs(scan_kwargs)
+        read_kwargs = {k: v for k, v in parse_kwargs.items() if k != "schema_overrides"}
+
+        def parse(
+            block: bytes,
+            first: bool,
+            schema: Optional[Dict[str, pl.DataType]],
+            columns: Optional[List[str]],
+        ) -> pl.DataFrame:
+            if schema is None:
+                return pl.read_ndjson(block, **parse_kwargs)
+            if columns is not None:
+                schema = {column: schema[column] for column in columns}
+            return pl.read_ndjson(block, schema=schema, **read_kwargs)
+
+        return scan_blocks(paths, parse, **block_kwargs)
 
 class ReadParquet(BaseReadLogic, tag="read_parquet"):
     """
     PStep to read data from an Apache Parquet file into the tablespace.
     Corresponds to the ReadParquetStep in the TypeScript definitions.
     """
-    file: str  # Path to the Parquet file
+    file: Union[str, List[str]]  # Path, glob pattern or list of paths of the Parquet files
     name: str  # Name to assign to the loaded DataFrame in the tablespace
 
     schema: Optional[List[ColumnSchema]] = None
     infer_schema: Optional[bool] = None
     ignore_errors: Optional[bool] = None
     n_rows: Optional[int] = None
+    hive_partitioning: Optional[bool] = None
+    columns: Optional[List[str]] = None  # Optional: List of column names to read
 
-    def _do_scan(self, file_path: str, scan_kwargs: Dict[str, Any]) -> pl.LazyFrame:
+    def _do_scan(self, source: Union[str, List[str]], scan_kwargs: Dict[str, Any]) -> pl.LazyFrame:
         """
         Prepares a Polars scan plan to read the Apache Parquet file.
         """
-        return pl.scan_parquet(file_path, **scan_kwargs)
+        scan_kwargs = dict(scan_kwargs)
+        schema_overrides = scan_kwargs.pop("schema_overrides", None)
+        lf = pl.scan_parquet(source, **scan_kwargs)
+        if schema_overrides:
+            # Parquet files carry their own schema, declared types are applied by casting
+            lf = lf.with_columns([pl.col(column).cast(dtype) for column, dtype in schema_overrides.items()])
+        return lf
+
+    def _scan_hive(
+        self,
+        source: Union[str, List[str]],
+        scan_kwargs: Dict[str, Any],
+        hive_types: Dict[str, pl.DataType],
+        settings: GlobalSettings,
+    ) -> pl.LazyFrame:
+        """
+        Uses the native hive support of the Parquet scan, which infers the
+        types of partition columns and skips the files of partitions
+        excluded by filters on them. Types from `schema` (passed as
+        `schema_overrides`) are applied by casting, as for file columns.
+        Polars also parses `key=value` directories above the dataset base;
+        the columns it derives from them are dropped.
+        """
+        lf = self._do_scan(source, {**scan_kwargs, "hive_partitioning": True})
+        sources = self._sources(settings)
+        base = _hive_base(sources)
+        keys = {key for path in _expand_globs(sources) for key in _hive_partitions(path, base)}
+        outer_keys = {match.group(1) for match in map(_HIVE_PARTITION.match, base.split(os.sep)) if match}
+        return lf.drop(sorted(outer_keys - keys))
 
 class BaseWriteLogic(PStep):
     """
     Abstract base class for PSteps that write tables to files.
     It handles common logic like table retrieval from tablespace and column selection.
     Concrete subclasses must implement the _do_sink method.
+
+    With `partition_by`, `file` is the directory of a hive-partitioned
+    dataset, written in one streaming pass: the rows of every combination
+    of key values go to `key1=value1/key2=value2/0.<ext>` (null values
+    become `__HIVE_DEFAULT_PARTITION__`). The key columns are only stored
+    in the directory names. A file is kept open per partition, so keys
+    should have a moderate number of distinct values. A dataset written
+    by an earlier run is replaced.
     """
     # These attributes are expected to be defined by subclasses that are msgspec.Structs
     # and PStep compliant.
     table: str
     file: str
     columns: Optional[List[str]]
+    partition_by: Optional[List[str]]
+
+    def is_sink(self) -> bool:
+        return True
+
+    def output_paths(self, settings: GlobalSettings) -> list[str]:
+        return [os.path.join(settings.root_folder, normalize_path(self.file))]
+
+    def sink_label(self) -> str:
+        return f"{type(self).__struct_config__.tag}:{self.file}"
 
-    def _do_sink(self, selected_lf: pl.LazyFrame, output_path: str) -> pl.LazyFrame:
+    def _sink_target(self, output_path: str, settings: GlobalSettings) -> Union[str, IO[bytes]]:
+        """Returns the path or file object the sink writes to."""
+        return output_path
+
+    def _partition_target(self, file_path: str, settings: GlobalSettings) -> Union[str, IO[bytes]]:
+        """Returns the path or file object the sink writes one partition file to."""
+        return self._sink_target(file_path, settings)
+
+    def _partition_files(self, file_path: str, ctx: StepContext) -> _PartitionFiles:
+        """Returns the `file_path` callback of the partitioned sink into the dataset at `file_path`."""
+        return _PartitionFiles(file_path, lambda path: self._partition_target(path, ctx.settings))
+
+    def _do_sink(
+        self,
+        selected_lf: pl.LazyFrame,
+        output_path: Union[str, IO[bytes], pl.PartitionByKey],
+    ) -> pl.LazyFrame:
         """
         Performs the specific sink operation for the derived class.
         This method should prepare and return a Polars LazyFrame representing the sink plan.
@@ -172,13 +441,101 @@ class BaseWriteLogic(PStep):
         if self.columns:
             selected_lf = lf_to_write.select(self.columns)
         
-        file_path = os.path.join(ctx.settings.root_folder, normalize_path(self.file))
-        sink_plan = self._do_sink(selected_lf, file_path)
+        [file_path] = self.output_paths(ctx.settings)
+        if self.partition_by:
+            # Partitions of an earlier run would otherwise be mixed into the dataset
+            ctx.add_setup_task(
+                lambda: _clear_dataset_dir(file_path),
+                label=f"{self.sink_label()}:clear",
+            )
+            target = pl.PartitionByKey(
+                file_path,
+                by=self.partition_by,
+                include_key=False,
+                file_path=self._partition_files(file_path, ctx),
+            )
+        else:
+            target = self._sink_target(file_path, ctx.settings)
+        sink_plan = self._do_sink(selected_lf, target)
 
         # Add the sink plan to the context for later execution
-        ctx.add_sink(sink_plan)
+        ctx.add_sink(sink_plan, label=self.sink_label(), rows=selected_lf)
+
+class BaseTextWriteLogic(BaseWriteLogic):
+    """
+    Abstract base class for the CSV and NDJSON writers, which can compress
+    and shard their output.
+
+    `compression` (inferred from a `.gz` or `.zst` extension of `file` if
+    omitted) compresses the output on multiple threads. With
+    `max_rows_per_file` or `max_bytes_per_file` (uncompressed size), `file`
+    is a directory that receives the output as shards `part-00000.csv`,
+    `part-00001.csv`, ..., each of them starting a new file once the
+    previous one would exceed a limit; CSV shards repeat the header. Each
+    partition of a partitioned output is compressed, or sharded into its
+    directory, the same way.
+    """
+    compression: Optional[Compression]
+    compression_level: Optional[int]
+    max_rows_per_file: Optional[int]
+    max_bytes_per_file: Optional[int]
+
+    # Whether the first record is a header repeated in every shard
+    _header: ClassVar[bool] = False
+    # Quote character of fields that may contain newlines
+    _quote: ClassVar[Optional[bytes]] = None
+
+    def _shard_extension(self) -> str:
+        """Returns the file extension of shards, without the compression extension."""
+        pass
+
+    def _sink_target(
+        self,
+        output_path: str,
+        settings: GlobalSettings,
+        pool: Optional[CompressionPool] = None,
+    ) -> Union[str, IO[bytes]]:
+        sharded = self.max_rows_per_file is not None or self.max_bytes_per_file is not None
+        compression = self.compression
+        if compression is None and not sharded:
+            compression = compression_of(output_path)
+        if compression is None and not sharded:
+            return output_path
+        return ShardedWriter(
+            output_path,
+            compression=compression,
+            compression_level=self.compression_level,
+            max_rows=self.max_rows_per_file,
+            max_bytes=self.max_bytes_per_file,
+            suffix=self._shard_extension() + EXTENSIONS.get(compression, ""),
+            header=self._header,
+            quote=self._quote,
+            threads=settings.threads,
+            pool=pool,
+        )
+
+    def _partition_target(
+        self,
+        file_path: str,
+        settings: GlobalSettings,
+        pool: Optional[CompressionPool] = None,
+    ) -> Union[str, IO[bytes]]:
+        if self.max_rows_per_file is not None or self.max_bytes_per_file is not None:
+            return self._sink_target(os.path.dirname(file_path), settings, pool)
+        if self.compression is not None:
+            file_path += EXTENSIONS[self.compression]
+        return self._sink_target(file_path, settings, pool)
+
+    def _partition_files(self, file_path: str, ctx: StepContext) -> _PartitionFiles:
+        # The writers of all partitions compress on one pool, shut down after the run
+        pool = CompressionPool(ctx.settings.threads)
+        ctx.add_cleanup_task(
+            lambda: pool.shutdown(wait=False, cancel_futures=True),
+            label=f"{self.sink_label()}:compression",
+        )
+        return _PartitionFiles(file_path, lambda path: self._partition_target(path, ctx.settings, pool))
 
-class WriteCsv(BaseWriteLogic, tag="write_csv"):
+class WriteCsv(BaseTextWriteLogic, tag="write_csv"):
     """
     PStep to write a table from the tablespace to a CSV file.
     Corresponds to the WriteCsvStep in the TypeScript definitions.
@@ -188,8 +545,23 @@ class WriteCsv(BaseWriteLogic, tag="write_csv"):
 
     columns: Optional[List[str]] = None  # Optional: List of column names to write
     delimiter: Optional[str] = None      # Optional: The delimiter character for the output CSV
-
-    def _do_sink(self, selected_lf: pl.LazyFrame, output_path: str) -> pl.LazyFrame:
+    compression: Optional[Compression] = None  # Optional: Compress the output with gzip or zstd
+    compression_level: Optional[int] = None    # Optional: Compression level (gzip: 1-9, zstd: 1-22)
+    max_rows_per_file: Optional[int] = None    # Optional: Write shards of at most this many rows
+    max_bytes_per_file: Optional[int] = None   # Optional: Write shards of at most this many bytes
+    partition_by: Optional[List[str]] = None   # Optional: Write a hive-partitioned dataset by these columns
+
+    _header = True
+    _quote = b'"'
+
+    def _shard_extension(self) -> str:
+        return ".tsv" if self.delimiter == "\t" else ".csv"
+
+    def _do_sink(
+        self,
+        selected_lf: pl.LazyFrame,
+        output_path: Union[str, IO[bytes], pl.PartitionByKey],
+    ) -> pl.LazyFrame:
         """
         Prepares a Polars plan to write the selected LazyFrame to a CSV file.
         """
@@ -224,7 +596,7 @@ class WriteCsv(BaseWriteLogic, tag="write_csv"):
 #         """
 #         return selected_lf.sink_ndjson(path=output_path, lazy=True)
 
-class WriteNdjson(BaseWriteLogic, tag="write_ndjson"):
+class WriteNdjson(BaseTextWriteLogic, tag="write_ndjson"):
     """
     PStep to write a table from the tablespace to an NDJSON file.
     Uses Polars' sink_ndjson for lazy writing.
@@ -233,8 +605,20 @@ class WriteNdjson(BaseWriteLogic, tag="write_ndjson"):
     table: str  # Name of the table in the tablespace to write
     file: str   # Path to the output NDJSON file
     columns: Optional[List[str]] = None  # Optional: List of column names to write
-
-    def _do_sink(self, selected_lf: pl.LazyFrame, output_path: str) -> pl.LazyFrame:
+    compression: Optional[Compression] = None  # Optional: Compress the output with gzip or zstd
+    compression_level: Optional[int] = None    # Optional: Compression level (gzip: 1-9, zstd: 1-22)
+    max_rows_per_file: Optional[int] = None    # Optional: Write shards of at most this many rows
+    max_bytes_per_file: Optional[int] = None   # Optional: Write shards of at most this many bytes
+    partition_by: Optional[List[str]] = None   # Optional: Write a hive-partitioned dataset by these columns
+
+    def _shard_extension(self) -> str:
+        return ".ndjson"
+
+    def _do_sink(
+        self,
+        selected_lf: pl.LazyFrame,
+        output_path: Union[str, IO[bytes], pl.PartitionByKey],
+    ) -> pl.LazyFrame:
         """
         Prepares a Polars plan to write the selected LazyFrame to an NDJSON file.
         """
@@ -245,13 +629,46 @@ class WriteParquet(BaseWriteLogic, tag="write_parquet"):
     PStep to write a table from the tablespace to an Apache Parquet file.
     Uses Polars' sink_parquet for lazy writing.
     Corresponds to the WriteParquetStep in TypeScript definitions.
+
+    Options left unset keep the Polars defaults (zstd compression, Polars'
+    row group and data page sizes, min/max/null-count statistics).
+    Smaller row groups let scans filtering on sorted or clustered columns
+    skip more of the file. `sorted_by` declares the order the table is
+    already sorted in (e.g. by a `sort` step; it is not checked); Polars
+    cannot write the Parquet sorting columns of row groups, so the order is
+    stored as JSON under the `sorting_columns` key of the file metadata.
     """
     table: str  # Name of the table in the tablespace to write
     file: str   # Path to the output Parquet file
     columns: Optional[List[str]] = None  # Optional: List of column names to write
-
-    def _do_sink(self, selected_lf: pl.LazyFrame, output_path: str) -> pl.LazyFrame:
+    compression: Optional[ParquetCompression] = None  # Optional: Compression codec of the column chunks
+    compression_level: Optional[int] = None  # Optional: Level of gzip (0-9), brotli (0-11) or zstd (1-22)
+    row_group_size: Optional[int] = None  # Optional: Maximum number of rows per row group
+    data_page_size: Optional[int] = None  # Optional: Target size of data pages in bytes
+    statistics: Optional[Union[bool, Literal["full"]]] = None  # Optional: False, True (min/max/null count) or "full"
+    sorted_by: Optional[List[SortingColumn]] = None  # Optional: Sort order of the table, written as metadata
+    partition_by: Optional[List[str]] = None  # Optional: Write a hive-partitioned dataset by these columns
+
+    def _do_sink(
+        self,
+        selected_lf: pl.LazyFrame,
+        output_path: Union[str, IO[bytes], pl.PartitionByKey],
+    ) -> pl.LazyFrame:
         """
         Prepares a Polars plan to write the selected LazyFrame to an Apache Parquet file.
         """
-        return selected_lf.sink_parquet(path=output_path, lazy=True)
+        sink_kwargs: Dict[str, Any] = {}
+        if self.compression is not None:
+            sink_kwargs["compression"] = self.compression
+        if self.compression_level is not None:
+            sink_kwargs["compression_level"] = self.compression_level
+        if self.row_group_size is not None:
+            sink_kwargs["row_group_size"] = self.row_group_size
+        if self.data_page_size is not None:
+            sink_kwargs["data_page_size"] = self.data_page_size
+        if self.statistics is not None:
+            sink_kwargs["statistics"] = self.statistics
+        if self.sorted_by:
+            sink_kwargs["metadata"] = {SORTING_COLUMNS_KEY: msgspec.json.encode(self.sorted_by).decode()}
+
+        return selected_lf.sink_parquet(path=output_path, lazy=True, **sink_kwargs)
@@ -0,0 +1,58 @@
+import os
+import re
+import tempfile
+
+import polars as pl
+
+from .base import PStep, StepContext
+
+
+class Materialize(PStep, tag="materialize"):
+    """
+    PStep to compute a table once and replace it in the tablespace with a
+    scan of the stored result.
+
+    The table is collected immediately, with the streaming engine, into an
+    uncompressed Arrow IPC file in the spill folder (the OS temporary
+    directory if no spill folder is set). The tablespace entry is replaced
+    by a memory-mapped `pl.scan_ipc` of that file, so every sink and step
+    reading the table afterwards reuses the stored result instead of
+    recomputing the upstream plan. This is useful when one expensive join
+    or aggregation feeds several sinks and `collect_all` fails to
+    deduplicate it. The file is removed by a cleanup task once the sinks and
+    chained tasks relying on it are done, or the workflow failed. In a dry
+    run the table is left unchanged.
+
+    Corresponds to the MaterializeStep defined in the TypeScript type definitions.
+    """
+    table: str
+
+    def table_outputs(self) -> list[str]:
+        return [self.table]
+
+    def execute(self, ctx: StepContext):
+        lf = ctx.get_table(self.table)
+        if ctx.dry_run:
+            return
+
+        spill_dir = ctx.settings.spill_folder or tempfile.gettempdir()
+        # Table names may contain path separators and other characters not valid in file names
+        prefix = f"materialize-{re.sub(r'[^\w.-]', '_', self.table)}-"
+        fd, ipc_path = tempfile.mkstemp(prefix=prefix, suffix=".arrow", dir=spill_dir)
+        os.close(fd)
+
+        try:
+            with ctx.tracer.span("materialize", self.table):
+                # Memory mapping requires an uncompressed file
+                lf.sink_ipc(ipc_path, compression="uncompressed", engine="streaming")
+        except BaseException:
+            os.remove(ipc_path)
+            raise
+
+        ctx.put_table(self.table, pl.scan_ipc(ipc_path, memory_map=True))
+        ctx.add_cleanup_task(lambda: _remove_if_exists(ipc_path), label=f"materialize:{self.table}:cleanup")
+
+
+def _remove_if_exists(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
@@ -6,7 +6,7 @@ import polars_pf as ppf
 from polars._typing import ParallelStrategy
 from polars_pf import PTableColumnSpec, PTableColumnSpecAxis, SpecQuery
 
-from .base import PStep, StepContext
+from .base import GlobalSettings, PStep, StepContext
 from ptabler.common import axis_ref
 
 
@@ -40,10 +40,23 @@ class ReadFrame(PStep, tag="read_frame"):
             return self.translation[spec.id]
         return spec.id  # sliced columns do not require renaming
 
+    def input_paths(self, settings: GlobalSettings) -> list[str]:
+        return [str(settings.frame_folder)] if settings.frame_folder is not None else []
+
     def execute(self, ctx: StepContext) -> None:
         if ctx.settings.frame_folder is None:
             raise ValueError("Frame folder is not set")
 
+        parallel, low_memory = self.parallel, self.low_memory
+        if ctx.settings.memory_limit is not None:
+            # Under a memory budget decode one row group at a time instead of
+            # letting "auto" read several row groups in parallel
+            low_memory = True
+            if parallel == "auto":
+                parallel = "columns"
+        if ctx.settings.threads == 1:
+            parallel = "none"
+
         result: tuple[pl.LazyFrame, ppf.PFrameCache] = ppf.pframe_source(
             ctx.settings.frame_folder,
             self.request.query,
@@ -52,10 +65,10 @@ class ReadFrame(PStep, tag="read_frame"):
             # effectively pframe_source applies select with aliases to names returned by column_ref
             column_ref=self.column_ref,
             logger=ppf.logger,
-            parallel=self.parallel,
-            low_memory=self.low_memory,
+            parallel=parallel,
+            low_memory=low_memory,
         )
         lf, cache = result
 
         ctx.put_table(self.name, lf)
-        ctx.chain_task(lambda: cache.dispose())
+        ctx.add_cleanup_task(lambda: cache.dispose(), label=f"read_frame:{self.name}:dispose")
@@ -0,0 +1,110 @@
+import contextlib
+from typing import Iterator, List
+
+
+class Tracer:
+    """
+    Receives notifications about timed phases of workflow execution.
+
+    The workflow executor wraps step planning, sink collection and chained
+    tasks in `span`, and steps wrap the interesting parts of their chained
+    tasks (e.g. the DuckDB sort in WriteFrame). The base implementation
+    does nothing, so steps can always call it unconditionally; profilers
+    and progress reporters subclass it.
+
+    Spans may be opened concurrently from several threads.
+    """
+
+    @contextlib.contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        """
+        Marks the enclosed block as one execution phase.
+
+        Args:
+            kind: Category of the phase, e.g. "step", "collect", "task".
+            name: Human-readable identifier of the phase within its kind.
+        """
+        yield
+
+    def sink_added(self, label: str, output_paths: List[str]) -> None:
+        """
+        Called by the executor when a step adds a sink, before any sink runs.
+
+        Args:
+            label: Label of the sink, as passed to `StepContext.add_sink`.
+            output_paths: Files or directories the sink and its chained
+                          tasks write to (see `PStep.output_paths`).
+        """
+
+    def sink_completed(self, label: str) -> None:
+        """
+        Called by the executor once a sink and all chained tasks depending
+        on it (see `ChainedTask.sink`) have finished successfully, i.e. when
+        its outputs are complete.
+
+        Args:
+            label: Label of the sink, as passed to `StepContext.add_sink`.
+        """
+
+    def sink_reused(self, label: str, output_paths: List[str]) -> None:
+        """
+        Called instead of `sink_added` for a sink step that is not executed
+        because its outputs already exist: restored from the result cache, or
+        left complete by an interrupted run (see `GlobalSettings.resume`).
+
+        Args:
+            label: Label the sink would have (see `PStep.sink_label`).
+            output_paths: Files or directories holding the outputs.
+        """
+
+    def wants_sink_rows(self) -> bool:
+        """
+        Returns True if the tracer wants `sink_rows` calls. Counting rows
+        adds a `pl.len()` over every counted sink's table to the collection.
+        """
+        return False
+
+    def sink_rows(self, label: str, rows: int) -> None:
+        """
+        Called once the rows written by a sink are counted, before
+        `sink_completed`. Only sinks added with the table they write (e.g.
+        by the file write steps) are counted, and only if `wants_sink_rows`
+        returns True.
+
+        Args:
+            label: Label of the sink, as passed to `StepContext.add_sink`.
+            rows: Number of rows the sink wrote.
+        """
+
+
+class MultiTracer(Tracer):
+    """Forwards all notifications to several tracers, e.g. a profile and a progress reporter."""
+
+    def __init__(self, *tracers: Tracer):
+        self._tracers = tracers
+
+    @contextlib.contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        with contextlib.ExitStack() as stack:
+            for tracer in self._tracers:
+                stack.enter_context(tracer.span(kind, name))
+            yield
+
+    def sink_added(self, label: str, output_paths: List[str]) -> None:
+        for tracer in self._tracers:
+            tracer.sink_added(label, output_paths)
+
+    def sink_completed(self, label: str) -> None:
+        for tracer in self._tracers:
+            tracer.sink_completed(label)
+
+    def sink_reused(self, label: str, output_paths: List[str]) -> None:
+        for tracer in self._tracers:
+            tracer.sink_reused(label, output_paths)
+
+    def wants_sink_rows(self) -> bool:
+        return any(tracer.wants_sink_rows() for tracer in self._tracers)
+
+    def sink_rows(self, label: str, rows: int) -> None:
+        for tracer in self._tracers:
+            tracer.sink_rows(label, rows)
@@ -15,23 +15,28 @@ The Python side here owns:
     out-of-core by DuckDB afterwards, not by Polars (Polars' in-memory sort
     OOMs on wide million-row frames),
   * registering the sink with `StepContext` so the executor flushes it,
+    and the creation of the frame directory as a setup task, so it only
+    happens once the whole workflow is validated,
   * scheduling the DuckDB sort + `polars_pf.convert` call after the sink completes.
+  * recording each completed stage with a marker file, so an interrupted
+    run can resume from the last one (`GlobalSettings.resume`).
 
 The `DataInfo*` / `Stats` / `NumberOfBytes` Structs below are kept as public
 types so legacy ptabler consumers that import them keep working, but
 write_frame no longer builds them in Python — `polars_pf.convert` writes
 the canonical JSON envelope directly to `<column>.datainfo`.
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 import os
+import shutil
 
-import duckdb
 import polars as pl
 from msgspec import Struct
 from polars_pf import AxisMapping, ColumnMapping, ConversionParams, convert
 from polars_pf.json.spec import AxisType, ColumnType
 
-from .base import PStep, StepContext
+from .base import GlobalSettings, PStep, StepContext
+from .tracing import Tracer
 from ..common import toPolarsType
 
 __all__ = [
@@ -93,6 +98,15 @@ class DataInfo(Struct, tag="ParquetPartitioned", rename="camel"):
 # Row-group size shared by the DuckDB sort output and convert's read batch size
 ROW_GROUP_SIZE = 122_880
 
+# Work files in the frame directory, and the markers written once each of them
+# is complete; they let an interrupted run resume (see `GlobalSettings.resume`)
+UNSORTED_PARQUET = "unsorted.parquet"
+INTERMEDIATE_PARQUET = "intermediate.parquet"
+_UNSORTED_DONE = ".unsorted.parquet.done"
+_INTERMEDIATE_DONE = ".intermediate.parquet.done"
+
+type ResumeStage = Literal["written", "sorted", "converted"]
+
 
 def _escape(name: str) -> str:
     """Quote a SQL identifier, doubling any embedded double-quotes."""
@@ -111,12 +125,103 @@ class WriteFrame(PStep, tag="write_frame"):
     partition_key_length: int = 0
     strict: bool = False
 
+    def is_sink(self) -> bool:
+        return True
+
+    def output_paths(self, settings: GlobalSettings) -> list[str]:
+        return [os.path.join(settings.root_folder, self.frame_name)]
+
+    def sink_label(self) -> str:
+        return f"write_frame:{self.frame_name}"
+
+    def needs_table_inputs(self, settings: GlobalSettings) -> bool:
+        return self._resume_stage(settings) is None
+
+    def resume_stage(self, frame_dir: str) -> Optional[ResumeStage]:
+        """
+        Returns the last completed stage found in `frame_dir`:
+          * "written": the Polars sink wrote the complete unsorted parquet,
+          * "sorted": DuckDB wrote the complete sorted intermediate parquet,
+          * "converted": the frame is complete (no work files are left and
+            every column has its `.datainfo`),
+        or None if the frame has to be written from scratch.
+        """
+        def exists(name: str) -> bool:
+            return os.path.exists(os.path.join(frame_dir, name))
+
+        if exists(_INTERMEDIATE_DONE) and exists(INTERMEDIATE_PARQUET):
+            return "sorted"
+        if exists(_UNSORTED_DONE) and exists(UNSORTED_PARQUET):
+            return "written"
+        work_files = [UNSORTED_PARQUET, INTERMEDIATE_PARQUET, _UNSORTED_DONE, _INTERMEDIATE_DONE]
+        if (
+            os.path.isdir(frame_dir)
+            and not any(exists(name) for name in work_files)
+            and all(exists(f"{c.column}.datainfo") for c in self.columns)
+        ):
+            return "converted"
+        return None
+
+    def _resume_stage(self, settings: GlobalSettings) -> Optional[ResumeStage]:
+        if not settings.resume:
+            return None
+        [frame_dir] = self.output_paths(settings)
+        return self.resume_stage(frame_dir)
+
     def execute(self, ctx: StepContext) -> None:
         self._validate()
 
+        [frame_dir] = self.output_paths(ctx.settings)
+        stage = self._resume_stage(ctx.settings)
+        if stage == "converted":
+            if not ctx.dry_run:
+                ctx.tracer.sink_reused(self.sink_label(), [frame_dir])
+            return
+        if stage is None:
+            ctx.add_setup_task(
+                lambda: self._create_frame_dir(frame_dir, ctx.settings.resume),
+                label=f"{self.sink_label()}:mkdir",
+            )
+            sink = self._add_sink(ctx, frame_dir)
+        else:
+            sink = None
+        if ctx.dry_run:
+            return
+        if sink is None:
+            # Without a sink of its own the frame is complete once the task finishes
+            ctx.tracer.sink_added(self.sink_label(), [frame_dir])
+
+        spill_dir = str(ctx.settings.spill_folder or frame_dir)
+        # Up to max_parallel_tasks sorts may run at once, each gets its share
+        sort_memory_limit = (
+            ctx.settings.memory_limit // ctx.settings.max_parallel_tasks
+            if ctx.settings.memory_limit is not None
+            else None
+        )
+        sort_threads = (
+            max(1, ctx.settings.threads // ctx.settings.max_parallel_tasks)
+            if ctx.settings.threads is not None
+            else None
+        )
+        tracer = ctx.tracer
+
+        def sort_and_convert() -> None:
+            self._sort_and_convert(
+                frame_dir,
+                spill_dir,
+                tracer,
+                memory_limit=sort_memory_limit,
+                threads=sort_threads,
+                skip_sort=stage == "sorted",
+                keep_work_files=ctx.settings.resume,
+            )
+            if sink is None:
+                tracer.sink_completed(self.sink_label())
+
+        ctx.chain_task(sort_and_convert, label=self.sink_label(), after_sink=sink)
+
+    def _add_sink(self, ctx: StepContext, frame_dir: str) -> int:
         lf = ctx.get_table(self.input_table)
-        frame_dir = os.path.join(ctx.settings.root_folder, self.frame_name)
-        os.makedirs(frame_dir)
 
         cast_exprs = [
             pl.col(a.column).cast(toPolarsType(a.type)) for a in self.axes
@@ -130,17 +235,16 @@ class WriteFrame(PStep, tag="write_frame"):
                 pl.all_horizontal([pl.col(a.column).is_not_null() for a in self.axes])
             )
 
-        unsorted_parquet = os.path.join(frame_dir, "unsorted.parquet")
+        unsorted_parquet = os.path.join(frame_dir, UNSORTED_PARQUET)
         lf = lf.sink_parquet(path=unsorted_parquet, lazy=True)
-        ctx.add_sink(lf)
-        
-        intermediate_parquet = os.path.join(frame_dir, "intermediate.parquet")
-        spill_dir = str(ctx.settings.spill_folder or frame_dir)
-        ctx.chain_task(
-            lambda: self._sort_and_convert(
-                unsorted_parquet, intermediate_parquet, frame_dir, spill_dir
-            )
-        )
+        return ctx.add_sink(lf, label=self.sink_label())
+
+    @staticmethod
+    def _create_frame_dir(frame_dir: str, resume: bool) -> None:
+        if resume and os.path.isdir(frame_dir):
+            # Nothing reusable was found in it (see `resume_stage`)
+            shutil.rmtree(frame_dir)
+        os.makedirs(frame_dir)
 
     def _validate(self) -> None:
         if not self.frame_name or not self.frame_name.strip():
@@ -169,35 +273,80 @@ class WriteFrame(PStep, tag="write_frame"):
             )
 
     def _sort_and_convert(
+        self,
+        frame_dir: str,
+        spill_dir: str,
+        tracer: Tracer | None = None,
+        memory_limit: Optional[int] = None,
+        threads: Optional[int] = None,
+        skip_sort: bool = False,
+        keep_work_files: bool = False,
+    ) -> None:
+        """
+        Sorts the unsorted parquet written by the sink and converts the result
+        into the PFrame. Each completed stage is recorded by a marker file and
+        its input is only removed afterwards, so after a failure a resumed run
+        restarts from the last completed stage. With `skip_sort` the sorted
+        intermediate parquet of a previous run is converted. Unless
+        `keep_work_files` is set (in resume mode), the work files are removed
+        after a failure as well.
+        """
+        unsorted_parquet = os.path.join(frame_dir, UNSORTED_PARQUET)
+        intermediate_parquet = os.path.join(frame_dir, INTERMEDIATE_PARQUET)
+        tracer = tracer or Tracer()
+
+        try:
+            if not skip_sort:
+                _touch(os.path.join(frame_dir, _UNSORTED_DONE))
+                self._sort(unsorted_parquet, intermediate_parquet, spill_dir, tracer, memory_limit, threads)
+                _touch(os.path.join(frame_dir, _INTERMEDIATE_DONE))
+                _remove_if_exists(unsorted_parquet)
+                _remove_if_exists(os.path.join(frame_dir, _UNSORTED_DONE))
+
+            with tracer.span("convert", self.frame_name):
+                self._convert(intermediate_parquet, frame_dir)
+            _remove_if_exists(intermediate_parquet)
+            _remove_if_exists(os.path.join(frame_dir, _INTERMEDIATE_DONE))
+        finally:
+            if not keep_work_files:
+                for name in (UNSORTED_PARQUET, INTERMEDIATE_PARQUET, _UNSORTED_DONE, _INTERMEDIATE_DONE):
+                    _remove_if_exists(os.path.join(frame_dir, name))
+
+    def _sort(
         self,
         unsorted_parquet: str,
         intermediate_parquet: str,
-        frame_dir: str,
         spill_dir: str,
+        tracer: Tracer,
+        memory_limit: Optional[int],
+        threads: Optional[int],
     ) -> None:
+        import duckdb  # imported on first use, it slows down startup
+
         order_by = ", ".join(f"{_escape(a.column)} ASC NULLS FIRST" for a in self.axes)
         conn = duckdb.connect(database=":memory:")
         try:
             conn.execute("SET temp_directory TO ?;", [spill_dir])
-            conn.execute(
-                f"""
-                COPY (SELECT * FROM read_parquet(?) ORDER BY {order_by})
-                TO '{intermediate_parquet}'
-                (
-                    PRESERVE_ORDER TRUE,
-                    FORMAT PARQUET,
-                    ROW_GROUP_SIZE {ROW_GROUP_SIZE},
-                    COMPRESSION 'UNCOMPRESSED'
+            if memory_limit is not None:
+                conn.execute("SET memory_limit TO ?;", [f"{memory_limit}B"])
+            if threads is not None:
+                conn.execute(f"SET threads TO {int(threads)};")
+            with tracer.span("duckdb_sort", self.frame_name):
+                conn.execute(
+                    f"""
+                    COPY (SELECT * FROM read_parquet(?) ORDER BY {order_by})
+                    TO '{intermediate_parquet}'
+                    (
+                        PRESERVE_ORDER TRUE,
+                        FORMAT PARQUET,
+                        ROW_GROUP_SIZE {ROW_GROUP_SIZE},
+                        COMPRESSION 'UNCOMPRESSED'
+                    )
+                    """,
+                    [unsorted_parquet],
                 )
-                """,
-                [unsorted_parquet],
-            )
         finally:
             conn.close()
-            if os.path.exists(unsorted_parquet):
-                os.remove(unsorted_parquet)
-
-        self._convert(intermediate_parquet, frame_dir)
 
     def _convert(self, intermediate_parquet: str, frame_dir: str) -> None:
         params = ConversionParams(
@@ -214,8 +363,14 @@ class WriteFrame(PStep, tag="write_frame"):
             column_index_truncate_length=None,
             digest_prefix="v02-",
         )
-        try:
-            convert(intermediate_parquet, params)
-        finally:
-            if os.path.exists(intermediate_parquet):
-                os.remove(intermediate_parquet)
+        convert(intermediate_parquet, params)
+
+
+def _touch(path: str) -> None:
+    with open(path, "w"):
+        pass
+
+
+def _remove_if_exists(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
@@ -1,3 +1,25 @@
-from .workflow import PWorkflow
+from .workflow import PWorkflow, execute_workflows
+from .profile import ExecutionProfile, ProfileReport, ProfileSpan
+from .memory import MemoryPhase, MemoryProfile, MemoryReport
+from .explain import SinkExplanation
+from .progress import ProgressEvent, ProgressReporter
+from .summary import ExecutionSummary, FrameSummary, PartitionSummary, SinkSummary, SummaryReport
 
-__all__ = ["PWorkflow"]
+__all__ = [
+    "PWorkflow",
+    "ExecutionProfile",
+    "ExecutionSummary",
+    "FrameSummary",
+    "MemoryPhase",
+    "MemoryProfile",
+    "MemoryReport",
+    "PartitionSummary",
+    "ProfileReport",
+    "ProfileSpan",
+    "ProgressEvent",
+    "ProgressReporter",
+    "SinkExplanation",
+    "SinkSummary",
+    "SummaryReport",
+    "execute_workflows",
+]
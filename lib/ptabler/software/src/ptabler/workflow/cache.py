@@ -0,0 +1,191 @@
+"""Persistent, content-addressed cache of workflow sink outputs.
+
+Every sink step (write steps, `WriteFrame`) gets a key: a SHA-256 over the
+canonical msgspec JSON encoding of the sink and all steps it depends on,
+fingerprints of every file and directory those steps read, and the versions
+of the libraries producing the output. When the cache holds an entry for
+the key, the outputs are restored from it (hardlinked where possible) and
+the sink is not executed; otherwise the outputs are copied into the cache
+after a successful run.
+
+Layout of the cache directory:
+
+    <cache_dir>/<key>/<n>    n-th output path of the sink (file or directory)
+
+Entries are written to a temporary directory and renamed into place, so
+concurrent ptabler processes sharing a cache never see partial entries.
+Cached files are made read-only: restored outputs may be hardlinks to them,
+and a later in-place overwrite of such an output must fail instead of
+silently corrupting the cache. Outputs of sinks that are executed are
+therefore removed first (see `remove_outputs`), which only unlinks them.
+"""
+import hashlib
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, List, Literal, Optional, Sequence
+
+import msgspec
+import polars as pl
+
+from ptabler.steps import GlobalSettings, PStep
+
+from .graph import required_steps
+
+# Bump when the meaning of cached outputs changes without a change in the
+# step encoding (e.g. different writer defaults).
+CACHE_FORMAT_VERSION = 1
+
+type FingerprintMode = Literal["stat", "digest"]
+
+
+class ResultCache:
+    """
+    Stores and restores sink outputs under keys derived from the steps
+    producing them and from their inputs.
+
+    Input fingerprints are memoized per instance, so an instance must not
+    outlive the inputs it has seen unchanged: use one per workflow run.
+
+    Args:
+        cache_dir: Directory holding cache entries; created if missing.
+        fingerprint: How input files are fingerprinted:
+                     - "stat": absolute path, size and modification time.
+                       Cheap, but only hits for the same input files.
+                     - "digest": SHA-256 of the content. Reads every input
+                       once, but hits for identical inputs at any location.
+    """
+
+    def __init__(self, cache_dir: Path, fingerprint: FingerprintMode = "stat"):
+        self._cache_dir = Path(cache_dir)
+        self._fingerprint = fingerprint
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        # Fingerprints of input paths by resolved path, shared by the keys of all sinks
+        self._fingerprints: Dict[Path, bytes] = {}
+
+    def key(self, steps: Sequence[PStep], sink_index: int, settings: GlobalSettings) -> Optional[str]:
+        """
+        Computes the cache key of the sink at `sink_index`.
+        Returns None if the sink is not cacheable: an input can not be
+        fingerprinted (e.g. it does not exist), or the sink depends on a table
+        not produced by the workflow itself (passed in the initial table space).
+        """
+        dependencies = [steps[index] for index in required_steps(steps, [sink_index])]
+        produced: set[str] = set()
+        for step in dependencies:
+            if any(name not in produced for name in step.table_inputs()):
+                return None
+            produced.update(step.table_outputs())
+
+        import polars_pf
+
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT_VERSION}:{pl.__version__}:{polars_pf.__version__}".encode())
+        digest.update(msgspec.json.encode(dependencies, order="deterministic"))
+        try:
+            for step in dependencies:
+                for path in step.input_paths(settings):
+                    digest.update(self._path_fingerprint(Path(path)))
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def restore(self, key: str, output_paths: List[str]) -> bool:
+        """
+        Restores the outputs of the entry `key` to `output_paths`.
+        Returns False if there is no complete entry for the key.
+        """
+        entry = self._cache_dir / key
+        sources = [entry / str(n) for n in range(len(output_paths))]
+        if not all(source.exists() for source in sources):
+            return False
+
+        remove_outputs(output_paths)
+        for source, target in zip(sources, output_paths):
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            if source.is_dir():
+                shutil.copytree(source, target, copy_function=_link_or_copy)
+            else:
+                _link_or_copy(str(source), target)
+        return True
+
+    def store(self, key: str, output_paths: List[str]) -> None:
+        """Stores the outputs of a sink under `key`, unless the entry already exists."""
+        entry = self._cache_dir / key
+        if entry.exists():
+            return
+
+        staging = self._cache_dir / f".tmp-{uuid.uuid4().hex}"
+        try:
+            staging.mkdir()
+            for n, source in enumerate(output_paths):
+                target = staging / str(n)
+                if os.path.isdir(source):
+                    shutil.copytree(source, target, copy_function=_copy_read_only)
+                else:
+                    _copy_read_only(source, str(target))
+            try:
+                staging.rename(entry)
+            except OSError:
+                # Another process stored the same entry first
+                pass
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _path_fingerprint(self, path: Path) -> bytes:
+        resolved = path.resolve()
+        fingerprint = self._fingerprints.get(resolved)
+        if fingerprint is None:
+            digest = hashlib.sha256()
+            self._update_with_path(digest, path)
+            fingerprint = self._fingerprints[resolved] = digest.digest()
+        return fingerprint
+
+    def _update_with_path(self, digest, path: Path) -> None:
+        if path.is_dir():
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    file_path = Path(root) / name
+                    digest.update(file_path.relative_to(path).as_posix().encode())
+                    self._update_with_file(digest, file_path)
+        else:
+            self._update_with_file(digest, path)
+
+    def _update_with_file(self, digest, path: Path) -> None:
+        if self._fingerprint == "digest":
+            with open(path, "rb") as f:
+                digest.update(hashlib.file_digest(f, "sha256").digest())
+        else:
+            stat = path.stat()
+            digest.update(f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+
+def remove_outputs(output_paths: Sequence[str]) -> None:
+    """
+    Removes existing files and directories at `output_paths`. Outputs
+    restored from the cache may be hardlinks to read-only cache files, so
+    they must be unlinked before a sink writes to the same paths.
+    """
+    for path in output_paths:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        elif os.path.lexists(path):
+            os.remove(path)
+
+
+def _copy_read_only(source: str, target: str) -> str:
+    shutil.copy2(source, target)
+    os.chmod(target, 0o444)
+    return target
+
+
+def _link_or_copy(source: str, target: str) -> str:
+    """Hardlinks `source` to `target`, copying if linking is not possible (e.g. across devices)."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+    return target
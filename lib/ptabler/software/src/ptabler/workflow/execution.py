@@ -0,0 +1,203 @@
+import threading
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Dict, Iterable, List, Optional
+
+import polars as pl
+
+from ptabler.steps import ChainedTask, GlobalSettings, Tracer
+
+
+def run_sinks_and_tasks(
+    sink_frames: List[pl.LazyFrame],
+    sink_labels: List[str],
+    chained_tasks: List[ChainedTask],
+    settings: GlobalSettings,
+    tracer: Tracer,
+    row_counts: Optional[Dict[int, pl.LazyFrame]] = None,
+) -> None:
+    """
+    Executes the sink operations collected by the steps and then the chained tasks.
+
+    By default all sinks are executed by a single `pl.collect_all()` call,
+    which lets Polars share common subplans between them, and chained tasks
+    start after it returns. With `settings.pipeline_sinks` the sinks that
+    have dependent tasks are collected separately (see `_run_pipelined`).
+
+    `row_counts` holds frames counting the rows of sinks, by sink index (see
+    `StepContext.sink_row_counts`). They are collected together with their
+    sinks, sharing the subplans, and reported by `Tracer.sink_rows`.
+    """
+    row_counts = row_counts or {}
+    completion = _SinkCompletion(sink_labels, chained_tasks, tracer)
+    if settings.pipeline_sinks:
+        _run_pipelined(
+            sink_frames, sink_labels, chained_tasks, settings.max_parallel_tasks, tracer, completion, row_counts
+        )
+        return
+
+    if sink_frames:
+        # Execute all collected sink operations (e.g., write_csv).
+        # The results of these operations (if any, usually None for writes)
+        # are ignored here. The primary purpose is to trigger the computation
+        # and I/O.
+        # `comm_subplan_elim=True` (default) is generally good for performance.
+        with tracer.span("collect", f"{len(sink_frames)} sinks"):
+            _collect(range(len(sink_frames)), sink_frames, sink_labels, row_counts, tracer)
+        completion.sinks_written(range(len(sink_frames)))
+
+    _run_chained_tasks(chained_tasks, settings.max_parallel_tasks, tracer, completion)
+
+
+class _SinkCompletion:
+    """Reports `Tracer.sink_completed` once a sink and its dependent tasks are done."""
+
+    def __init__(self, sink_labels: List[str], tasks: List[ChainedTask], tracer: Tracer):
+        self._sink_labels = sink_labels
+        self._tracer = tracer
+        self._lock = threading.Lock()
+        self._pending: Dict[int, int] = {}
+        for task in tasks:
+            if task.sink is not None:
+                self._pending[task.sink] = self._pending.get(task.sink, 0) + 1
+
+    def sinks_written(self, indices: Iterable[int]) -> None:
+        for index in indices:
+            if index not in self._pending:
+                self._tracer.sink_completed(self._sink_labels[index])
+
+    def task_finished(self, task: ChainedTask) -> None:
+        if task.sink is None:
+            return
+        with self._lock:
+            self._pending[task.sink] -= 1
+            completed = self._pending[task.sink] == 0
+        if completed:
+            self._tracer.sink_completed(self._sink_labels[task.sink])
+
+
+def _collect(
+    indices: Iterable[int],
+    sink_frames: List[pl.LazyFrame],
+    sink_labels: List[str],
+    row_counts: Dict[int, pl.LazyFrame],
+    tracer: Tracer,
+) -> None:
+    """Collects the sinks at `indices` with their row counts in one `pl.collect_all()` call."""
+    indices = list(indices)
+    counted = [index for index in indices if index in row_counts]
+    results = pl.collect_all(
+        [sink_frames[index] for index in indices] + [row_counts[index] for index in counted],
+        engine="streaming",
+    )
+    for index, counts in zip(counted, results[len(indices):]):
+        tracer.sink_rows(sink_labels[index], counts.item())
+
+
+def _run_task(task: ChainedTask, tracer: Tracer, completion: Optional[_SinkCompletion] = None) -> None:
+    with tracer.span("task", task.label):
+        task()
+    if completion is not None:
+        completion.task_finished(task)
+
+
+def _run_chained_tasks(
+    tasks: List[ChainedTask],
+    max_parallel: int,
+    tracer: Tracer,
+    completion: Optional[_SinkCompletion] = None,
+) -> None:
+    """
+    Runs chained tasks after all sinks have completed.
+
+    With `max_parallel` <= 1 the tasks run one after another in the order they
+    were added. Otherwise they run on a bounded thread pool; chained tasks
+    are independent of each other (each WriteFrame owns its frame directory)
+    and spend their time in native code (DuckDB, polars_pf) that releases
+    the GIL. On the first failure tasks that have not started yet are
+    cancelled, running ones are awaited and the error is re-raised.
+    """
+    if max_parallel <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            _run_task(task, tracer, completion)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(tasks))) as executor:
+        futures = [executor.submit(_run_task, task, tracer, completion) for task in tasks]
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in futures:
+            if future in done and future.exception() is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise future.exception()
+
+
+def _run_pipelined(
+    sink_frames: List[pl.LazyFrame],
+    sink_labels: List[str],
+    tasks: List[ChainedTask],
+    max_parallel: int,
+    tracer: Tracer,
+    completion: _SinkCompletion,
+    row_counts: Dict[int, pl.LazyFrame],
+) -> None:
+    """
+    Executes sinks in groups and starts each chained task as soon as the
+    sink it depends on is written.
+
+    Every sink with dependent tasks (e.g. the `unsorted.parquet` of a
+    WriteFrame) forms its own group; all other sinks are collected together
+    in one more group so they still share common subplans. Groups are
+    collected concurrently, at most `max_parallel` at a time as every
+    collect runs on all Polars threads and holds its own buffers, and the
+    dependent tasks of a finished group are submitted to a task pool bounded
+    by `max_parallel` too, overlapping e.g. the DuckDB sort with the
+    remaining Polars I/O. Tasks without a sink
+    dependency (such as PFrame cache disposal) run after all sinks finish.
+
+    Sinks in different groups no longer share subplans, so upstream work
+    feeding several groups is computed once per group.
+
+    If a sink fails, its tasks and the tasks without sink dependency are
+    not started; the first error is raised after everything running has
+    finished.
+    """
+    dependent_tasks: Dict[int, List[ChainedTask]] = {}
+    independent_tasks: List[ChainedTask] = []
+    for task in tasks:
+        if task.sink is None:
+            independent_tasks.append(task)
+        else:
+            dependent_tasks.setdefault(task.sink, []).append(task)
+
+    groups: List[List[int]] = [[index] for index in sorted(dependent_tasks)]
+    shared_group = [index for index in range(len(sink_frames)) if index not in dependent_tasks]
+    if shared_group:
+        groups.append(shared_group)
+
+    def collect(group: List[int]) -> None:
+        with tracer.span("collect", ", ".join(sink_labels[index] for index in group)):
+            _collect(group, sink_frames, sink_labels, row_counts, tracer)
+
+    errors: List[BaseException] = []
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as task_pool:
+        task_futures: List[Future] = []
+        if groups:
+            with ThreadPoolExecutor(max_workers=min(len(groups), max(1, max_parallel))) as sink_pool:
+                group_futures = {sink_pool.submit(collect, group): group for group in groups}
+                for future in as_completed(group_futures):
+                    if future.exception() is not None:
+                        errors.append(future.exception())
+                        continue
+                    completion.sinks_written(group_futures[future])
+                    for index in group_futures[future]:
+                        for task in dependent_tasks.get(index, []):
+                            task_futures.append(task_pool.submit(_run_task, task, tracer, completion))
+
+        if not errors:
+            for task in independent_tasks:
+                task_futures.append(task_pool.submit(_run_task, task, tracer, completion))
+
+        wait(task_futures)
+        errors.extend(f.exception() for f in task_futures if f.exception() is not None)
+
+    if errors:
+        raise errors[0]
@@ -0,0 +1,77 @@
+import re
+from typing import List
+
+import msgspec
+import polars as pl
+
+# Fill colors used by Polars' physical plan graph (see the legend of
+# `LazyFrame.show_graph(engine="streaming", plan_stage="physical")`).
+_FALLBACK_COLOR = "0.0 0.3 1.0"
+_MEMORY_INTENSIVE_COLOR = "0.16 0.3 1.0"
+
+_GRAPH_NODE = re.compile(
+    r'^\d+ \[label="((?:[^"\\]|\\.)*)"(?:,style=filled,fillcolor="([^"]+)")?\];$',
+    re.MULTILINE | re.DOTALL,
+)
+
+
+class SinkExplanation(msgspec.Struct, rename="camel"):
+    """Optimized plan of one sink and the nodes that hurt streaming execution."""
+    sink: str
+    """Label of the sink (e.g. "write_csv:out.csv")."""
+    plan: str
+    """Optimized logical plan, as printed by `LazyFrame.explain(engine="streaming")`."""
+    fallbacks: List[str]
+    """Physical plan nodes executed by the in-memory engine instead of streaming."""
+    memory_intensive: List[str]
+    """Streaming nodes that may need to hold large parts of their input in memory."""
+    python_udfs: List[str]
+    """Nodes calling Python functions (`map_elements`), which run row by row under the GIL."""
+
+    def format(self) -> str:
+        lines = [f"=== {self.sink} ===", self.plan.rstrip()]
+        for title, nodes in (
+            ("In-memory engine fallbacks", self.fallbacks),
+            ("Potentially memory-intensive nodes", self.memory_intensive),
+            ("Python UDF nodes", self.python_udfs),
+        ):
+            if nodes:
+                lines.append(f"{title}:")
+                lines.extend(f"  - {_one_line(node)}" for node in nodes)
+        return "\n".join(lines)
+
+
+def explain_sink(sink: str, lf: pl.LazyFrame) -> SinkExplanation:
+    """Explains how the streaming engine would execute the sink plan `lf`, without running it."""
+    plan = lf.explain(engine="streaming")
+    graph = lf.show_graph(
+        engine="streaming",
+        plan_stage="physical",
+        raw_output=True,
+        show=False,
+    )
+
+    fallbacks: List[str] = []
+    memory_intensive: List[str] = []
+    python_udfs: List[str] = []
+    for match in _GRAPH_NODE.finditer(graph or ""):
+        label = match.group(1).replace("\\n", "\n").replace('\\"', '"').strip()
+        color = match.group(2)
+        if color == _FALLBACK_COLOR:
+            fallbacks.append(label)
+        elif color == _MEMORY_INTENSIVE_COLOR:
+            memory_intensive.append(label)
+        if "python_udf" in label:
+            python_udfs.append(label)
+
+    return SinkExplanation(
+        sink=sink,
+        plan=plan,
+        fallbacks=fallbacks,
+        memory_intensive=memory_intensive,
+        python_udfs=python_udfs,
+    )
+
+
+def _one_line(label: str) -> str:
+    return " ".join(part.strip() for part in label.splitlines() if part.strip())
@@ -0,0 +1,47 @@
+from typing import Iterable, List, Sequence
+
+from ptabler.steps import PStep
+
+
+def required_steps(steps: Sequence[PStep], targets: Iterable[int]) -> List[int]:
+    """
+    Computes the steps needed to execute the target steps.
+
+    Walks the workflow backwards, tracking which table names are still
+    needed ("live"). A step is required if it is a target or if it produces
+    a live table; its inputs then become live. Because tables can be
+    redefined under the same name, only the last definition preceding a
+    use is kept alive.
+
+    Args:
+        steps: The workflow steps, in execution order.
+        targets: Indices of the steps that must be executed.
+
+    Returns:
+        Indices of the required steps, in execution order.
+    """
+    target_set = set(targets)
+    live: set[str] = set()
+    required: List[int] = []
+
+    for index in reversed(range(len(steps))):
+        step = steps[index]
+        outputs = step.table_outputs()
+        if index in target_set or any(name in live for name in outputs):
+            required.append(index)
+            live.difference_update(outputs)
+            live.update(step.table_inputs())
+
+    required.reverse()
+    return required
+
+
+def live_steps(steps: Sequence[PStep]) -> List[int]:
+    """
+    Returns the indices of the steps whose results reach a sink
+    (see `PStep.is_sink`), in execution order. All other steps are dead
+    and can be skipped without changing the workflow outputs.
+    """
+    return required_steps(
+        steps, (index for index, step in enumerate(steps) if step.is_sink())
+    )
@@ -0,0 +1,225 @@
+import contextlib
+import os
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import msgspec
+
+from ptabler.steps import Tracer
+from ptabler.steps.write_frame import INTERMEDIATE_PARQUET, UNSORTED_PARQUET
+
+
+def current_rss() -> Optional[int]:
+    """
+    Returns the resident set size of this process in bytes, including the
+    native allocations of Polars, DuckDB and polars_pf, or None where it
+    cannot be read (outside Linux).
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def max_rss() -> int:
+    """Returns the highest resident set size of this process so far, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kibibytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _tree_size(path: Path) -> int:
+    if not path.is_dir():
+        with contextlib.suppress(OSError):
+            return path.stat().st_size
+        return 0
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            with contextlib.suppress(OSError):
+                total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+class MemoryPhase(msgspec.Struct, rename="camel"):
+    """Memory and disk usage during one execution phase."""
+    kind: str
+    """Category of the phase, as in `ProfileSpan.kind`."""
+    name: str
+    """Identifier of the phase within its kind."""
+    start_seconds: float
+    """Start of the phase, relative to the creation of the profile."""
+    elapsed_seconds: float
+    """Wall-clock duration of the phase."""
+    start_rss_bytes: Optional[int]
+    """Resident set size when the phase started."""
+    peak_rss_bytes: Optional[int]
+    """Highest sampled resident set size while the phase ran."""
+    peak_spill_bytes: Optional[int]
+    """Highest sampled size of the spill folder while the phase ran; None without a spill folder."""
+    peak_intermediate_bytes: int
+    """Highest sampled total size of the intermediate Parquet files of all `WriteFrame` sinks."""
+    failed: bool = False
+    """True if the phase raised an exception."""
+
+
+class MemoryReport(msgspec.Struct, rename="camel"):
+    """JSON document written by `MemoryProfile.write`."""
+    total_seconds: float
+    interval_seconds: float
+    peak_rss_bytes: Optional[int]
+    """Highest sampled resident set size of the whole run."""
+    max_rss_bytes: int
+    """
+    Highest resident set size of the process as reported by the OS, which
+    also catches spikes between samples. Includes the interpreter and
+    library startup.
+    """
+    peak_spill_bytes: Optional[int]
+    peak_intermediate_bytes: int
+    phases: List[MemoryPhase]
+
+
+class _ActivePhase:
+    def __init__(self, kind: str, name: str, started: float, rss: Optional[int]):
+        self.kind = kind
+        self.name = name
+        self.started = started
+        self.start_rss = rss
+        self.peak_rss = rss
+        self.peak_spill: Optional[int] = None
+        self.peak_intermediate = 0
+
+    def observe(self, rss: Optional[int], spill: Optional[int], intermediate: int) -> None:
+        self.peak_rss = _max(self.peak_rss, rss)
+        self.peak_spill = _max(self.peak_spill, spill)
+        self.peak_intermediate = max(self.peak_intermediate, intermediate)
+
+
+def _max(current: Optional[int], sample: Optional[int]) -> Optional[int]:
+    if sample is None:
+        return current
+    return sample if current is None else max(current, sample)
+
+
+class MemoryProfile(Tracer):
+    """
+    Tracer sampling the memory and disk usage of a workflow execution.
+
+    Every `interval_seconds`, and whenever a phase starts or ends, it
+    samples the resident set size of the process, the size of
+    `spill_folder` and the size of the `unsorted.parquet` and
+    `intermediate.parquet` work files of every `WriteFrame`, and records
+    the peaks per execution phase. Use it to size the memory and disk
+    requests of the environment the workflow runs in.
+
+    Call `close` when done to stop sampling, then `write` the report.
+    """
+
+    def __init__(self, spill_folder: Optional[Path] = None, interval_seconds: float = 0.1):
+        self._spill_folder = Path(spill_folder) if spill_folder is not None else None
+        self._interval = interval_seconds
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._frame_dirs: List[Path] = []
+        self._active: Dict[int, _ActivePhase] = {}
+        self._next_phase_id = 0
+        self._phases: List[MemoryPhase] = []
+        self._peak_rss: Optional[int] = None
+        self._peak_spill: Optional[int] = None
+        self._peak_intermediate = 0
+        self._stop_sampling: Optional[threading.Event] = None
+
+    @contextlib.contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        self._start_sampling()
+        rss = self.sample()
+        with self._lock:
+            phase_id = self._next_phase_id
+            self._next_phase_id += 1
+            self._active[phase_id] = _ActivePhase(kind, name, time.perf_counter(), rss)
+
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.sample()
+            finished = time.perf_counter()
+            with self._lock:
+                phase = self._active.pop(phase_id)
+                self._phases.append(MemoryPhase(
+                    kind=kind,
+                    name=name,
+                    start_seconds=phase.started - self._origin,
+                    elapsed_seconds=finished - phase.started,
+                    start_rss_bytes=phase.start_rss,
+                    peak_rss_bytes=phase.peak_rss,
+                    peak_spill_bytes=phase.peak_spill,
+                    peak_intermediate_bytes=phase.peak_intermediate,
+                    failed=failed,
+                ))
+
+    def sink_added(self, label: str, output_paths: List[str]) -> None:
+        if label.startswith("write_frame:"):
+            with self._lock:
+                self._frame_dirs.extend(Path(path) for path in output_paths)
+
+    def sample(self) -> Optional[int]:
+        """Takes one sample, attributing it to all running phases. Returns the RSS."""
+        rss = current_rss()
+        spill = _tree_size(self._spill_folder) if self._spill_folder is not None else None
+        with self._lock:
+            frame_dirs = list(self._frame_dirs)
+        intermediate = sum(
+            _tree_size(frame_dir / work_file)
+            for frame_dir in frame_dirs
+            for work_file in (UNSORTED_PARQUET, INTERMEDIATE_PARQUET)
+        )
+        with self._lock:
+            self._peak_rss = _max(self._peak_rss, rss)
+            self._peak_spill = _max(self._peak_spill, spill)
+            self._peak_intermediate = max(self._peak_intermediate, intermediate)
+            for phase in self._active.values():
+                phase.observe(rss, spill, intermediate)
+        return rss
+
+    def report(self) -> MemoryReport:
+        with self._lock:
+            return MemoryReport(
+                total_seconds=time.perf_counter() - self._origin,
+                interval_seconds=self._interval,
+                peak_rss_bytes=self._peak_rss,
+                max_rss_bytes=max_rss(),
+                peak_spill_bytes=self._peak_spill,
+                peak_intermediate_bytes=self._peak_intermediate,
+                phases=list(self._phases),
+            )
+
+    def write(self, path: Path) -> None:
+        """Writes the report collected so far to `path` as JSON."""
+        encoded = msgspec.json.encode(self.report())
+        Path(path).write_bytes(msgspec.json.format(encoded))
+
+    def close(self) -> None:
+        """Stops sampling."""
+        with self._lock:
+            stop, self._stop_sampling = self._stop_sampling, None
+        if stop is not None:
+            stop.set()
+
+    def _start_sampling(self) -> None:
+        with self._lock:
+            if self._stop_sampling is not None:
+                return
+            stop = self._stop_sampling = threading.Event()
+        threading.Thread(target=self._sample_until, args=(stop,), name="ptabler-memory", daemon=True).start()
+
+    def _sample_until(self, stop: threading.Event) -> None:
+        while not stop.wait(self._interval):
+            self.sample()
@@ -0,0 +1,74 @@
+import contextlib
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+import msgspec
+
+from ptabler.steps import Tracer
+
+
+class ProfileSpan(msgspec.Struct, rename="camel"):
+    """A single timed execution phase."""
+    kind: str
+    """Category of the phase: "step", "collect", "task", "duckdb_sort", "convert", ..."""
+    name: str
+    """Identifier of the phase within its kind."""
+    start_seconds: float
+    """Start of the phase, relative to the creation of the profile."""
+    elapsed_seconds: float
+    """Wall-clock duration of the phase."""
+    failed: bool = False
+    """True if the phase raised an exception."""
+
+
+class ProfileReport(msgspec.Struct, rename="camel"):
+    """JSON document written by `ExecutionProfile.write`."""
+    total_seconds: float
+    spans: List[ProfileSpan]
+
+
+class ExecutionProfile(Tracer):
+    """
+    Tracer that records the wall-clock time of every execution phase.
+
+    Pass it to `PWorkflow.execute(tracer=...)` and call `write` afterwards
+    (also after a failure, so the phases that did complete are visible).
+    Spans are listed in the order they finished.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._spans: List[ProfileSpan] = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._spans.append(ProfileSpan(
+                    kind=kind,
+                    name=name,
+                    start_seconds=started - self._origin,
+                    elapsed_seconds=finished - started,
+                    failed=failed,
+                ))
+
+    def report(self) -> ProfileReport:
+        with self._lock:
+            return ProfileReport(
+                total_seconds=time.perf_counter() - self._origin,
+                spans=list(self._spans),
+            )
+
+    def write(self, path: Path) -> None:
+        """Writes the report collected so far to `path` as JSON."""
+        encoded = msgspec.json.encode(self.report())
+        Path(path).write_bytes(msgspec.json.format(encoded))
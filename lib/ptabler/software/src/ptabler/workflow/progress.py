@@ -0,0 +1,250 @@
+import contextlib
+import os
+import threading
+import time
+from typing import IO, Dict, Iterator, List, Literal, Optional
+
+import msgspec
+import polars as pl
+
+from ptabler.steps import Tracer
+from ptabler.steps.compressed import count_record_ends, is_compressed
+
+# Span kinds during which sink outputs grow and are polled
+_WRITING_KINDS = {"collect", "task", "duckdb_sort", "convert", "materialize"}
+
+
+class ProgressEvent(msgspec.Struct, rename="camel", omit_defaults=True):
+    """One line of the progress stream written by `ProgressReporter`."""
+    event: Literal["start", "end", "progress"]
+    """
+    "start" and "end" delimit an execution phase (see `Tracer.span`);
+    "progress" reports the output written so far by one sink.
+    """
+    kind: str
+    """Kind of the phase ("step", "collect", "duckdb_sort", ...), or "sink" for progress events."""
+    name: str
+    """Name of the phase, or the sink label for progress events."""
+    seconds: float
+    """Time of the event, relative to the creation of the reporter."""
+    elapsed_seconds: Optional[float] = None
+    """Duration of the phase, on "end" events."""
+    failed: bool = False
+    """True on "end" events of phases that raised an exception."""
+    bytes: Optional[int] = None
+    """Bytes written by the sink so far, including files of its chained tasks."""
+    bytes_per_second: Optional[float] = None
+    """Write throughput of the sink since its previous progress event; absent if the output shrank."""
+    rows: Optional[int] = None
+    """
+    Rows written by the sink so far. Known while writing for uncompressed CSV
+    and NDJSON outputs, and once the file is complete for Parquet outputs.
+    """
+
+
+class _SinkOutput:
+    """Polling state of one sink."""
+
+    def __init__(self, label: str, paths: List[str]):
+        self.label = label
+        self.paths = paths
+        tag = label.split(":", 1)[0]
+        self.line_counted = tag in ("write_csv", "write_ndjson") and len(paths) == 1
+        self.header_lines = 1 if tag == "write_csv" else 0
+        # CSV fields are quoted with '"' and may contain newlines
+        self.quote = b'"' if tag == "write_csv" else None
+        self.parquet = tag == "write_parquet" and len(paths) == 1
+        self.bytes = 0
+        self.lines = 0
+        self.line_offsets: Dict[str, int] = {}
+        # Whether the unread rest of each file starts inside a quoted field
+        self.quoted: Dict[str, bool] = {}
+        self.rows: Optional[int] = None
+        self.reported_at: Optional[float] = None
+
+    def output_bytes(self) -> int:
+        total = 0
+        for path in self.paths:
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    for name in files:
+                        with contextlib.suppress(OSError):
+                            total += os.path.getsize(os.path.join(root, name))
+            else:
+                with contextlib.suppress(OSError):
+                    total += os.path.getsize(path)
+        return total
+
+    def count_new_lines(self) -> None:
+        """
+        Counts the records appended to the output, a file or a directory of
+        shards or partitions, since the previous call; newlines in quoted
+        CSV fields are not counted. Compressed outputs are not counted.
+        """
+        try:
+            for file in _output_files(self.paths[0]):
+                offset = self.line_offsets.get(file, 0)
+                if offset == 0:
+                    compressed = is_compressed(file)
+                    if compressed is None:
+                        continue
+                    if compressed:
+                        self.line_counted = False
+                        self.rows = None
+                        return
+                quoted = self.quoted.get(file, False)
+                with open(file, "rb") as f:
+                    f.seek(offset)
+                    while chunk := f.read(1 << 20):
+                        lines, quoted = count_record_ends(chunk, self.quote, quoted)
+                        self.lines += lines
+                        offset += len(chunk)
+                self.line_offsets[file] = offset
+                self.quoted[file] = quoted
+        except OSError:
+            return
+        self.rows = max(0, self.lines - self.header_lines * len(self.line_offsets))
+
+    def count_parquet_rows(self) -> None:
+        """Reads the row count from the footers, if the files are complete."""
+        try:
+            files = _output_files(self.paths[0])
+            self.rows = pl.scan_parquet(files).select(pl.len()).collect().item() if files else None
+        except (pl.exceptions.PolarsError, OSError):
+            pass
+
+
+def _output_files(path: str) -> List[str]:
+    """Returns `path`, or the files in the directory `path` and its subdirectories."""
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(os.path.join(root, name) for root, _, files in os.walk(path) for name in files)
+
+
+class ProgressReporter(Tracer):
+    """
+    Tracer writing machine-readable progress events as NDJSON.
+
+    Every execution phase produces a "start" and an "end" event, including
+    the DuckDB sort and PFrame conversion of every `WriteFrame`. While sinks
+    are written, the reporter polls their output files every
+    `interval_seconds` and emits a "progress" event for each sink whose
+    output grew, with the bytes written, the throughput and, where it can be
+    told from the output, the number of rows. Polars does not report
+    progress from inside the streaming engine, so the outputs are the only
+    source of this information.
+
+    Call `close` when done to stop polling.
+    """
+
+    def __init__(self, output: IO[str], interval_seconds: float = 1.0):
+        self._output = output
+        self._interval = interval_seconds
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._sinks: Dict[str, _SinkOutput] = {}
+        self._writing_phases = 0
+        self._stop_polling: Optional[threading.Event] = None
+
+    @contextlib.contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        self._emit(ProgressEvent(event="start", kind=kind, name=name, seconds=started - self._origin))
+        if kind in _WRITING_KINDS:
+            self._writing_phase_started()
+
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            if kind in _WRITING_KINDS:
+                self._writing_phase_finished(final=kind == "collect")
+            finished = time.perf_counter()
+            self._emit(ProgressEvent(
+                event="end",
+                kind=kind,
+                name=name,
+                seconds=finished - self._origin,
+                elapsed_seconds=finished - started,
+                failed=failed,
+            ))
+
+    def sink_added(self, label: str, output_paths: List[str]) -> None:
+        with self._lock:
+            self._sinks[label] = _SinkOutput(label, output_paths)
+
+    def poll(self, final: bool = False) -> None:
+        """
+        Emits a progress event for every sink whose output changed since the
+        previous poll. With `final`, also reads the row counts of complete
+        Parquet outputs.
+        """
+        with self._poll_lock:
+            with self._lock:
+                sinks = list(self._sinks.values())
+            for sink in sinks:
+                self._poll_sink(sink, final)
+
+    def _poll_sink(self, sink: _SinkOutput, final: bool) -> None:
+        now = time.perf_counter()
+        size = sink.output_bytes()
+        rows_before = sink.rows
+        if sink.line_counted and size != sink.bytes:
+            sink.count_new_lines()
+        if final and sink.parquet and sink.rows is None:
+            sink.count_parquet_rows()
+        if size == sink.bytes and sink.rows == rows_before:
+            return
+
+        since = sink.reported_at if sink.reported_at is not None else self._origin
+        # Outputs shrink when chained tasks remove intermediate files
+        throughput = (size - sink.bytes) / (now - since) if now > since and size >= sink.bytes else None
+        sink.bytes = size
+        sink.reported_at = now
+        self._emit(ProgressEvent(
+            event="progress",
+            kind="sink",
+            name=sink.label,
+            seconds=now - self._origin,
+            bytes=size,
+            bytes_per_second=throughput,
+            rows=sink.rows,
+        ))
+
+    def close(self) -> None:
+        """Stops polling."""
+        with self._lock:
+            stop, self._stop_polling = self._stop_polling, None
+            self._writing_phases = 0
+        if stop is not None:
+            stop.set()
+
+    def _writing_phase_started(self) -> None:
+        with self._lock:
+            self._writing_phases += 1
+            if self._stop_polling is not None:
+                return
+            stop = self._stop_polling = threading.Event()
+        threading.Thread(target=self._poll_until, args=(stop,), name="ptabler-progress", daemon=True).start()
+
+    def _writing_phase_finished(self, final: bool) -> None:
+        with self._lock:
+            self._writing_phases -= 1
+            stop = None
+            if self._writing_phases <= 0:
+                stop, self._stop_polling = self._stop_polling, None
+        if stop is not None:
+            stop.set()
+        self.poll(final=final)
+
+    def _poll_until(self, stop: threading.Event) -> None:
+        while not stop.wait(self._interval):
+            self.poll()
+
+    def _emit(self, event: ProgressEvent) -> None:
+        line = msgspec.json.encode(event).decode()
+        with self._lock:
+            self._output.write(line + "\n")
+            self._output.flush()
@@ -0,0 +1,62 @@
+"""Process-wide engine settings derived from `GlobalSettings`."""
+import os
+import re
+
+import polars as pl
+
+from ptabler.steps import GlobalSettings
+
+_BYTE_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]i?b?|b)?\s*$", re.IGNORECASE)
+_BYTE_UNITS = {
+    "b": 1,
+    "k": 1000, "kb": 1000, "ki": 1024, "kib": 1024,
+    "m": 1000**2, "mb": 1000**2, "mi": 1024**2, "mib": 1024**2,
+    "g": 1000**3, "gb": 1000**3, "gi": 1024**3, "gib": 1024**3,
+    "t": 1000**4, "tb": 1000**4, "ti": 1024**4, "tib": 1024**4,
+}
+
+# Bounds and assumptions for the streaming morsel size derived from a memory
+# limit. Polars' own default is 100 000 rows per morsel.
+_MAX_MORSEL_ROWS = 100_000
+_MIN_MORSEL_ROWS = 1_000
+_ASSUMED_ROW_BYTES = 1024
+_MORSELS_IN_FLIGHT_PER_THREAD = 4
+
+
+def parse_byte_size(text: str) -> int:
+    """
+    Parses a byte size such as "512MiB", "4GB" or "1073741824" into bytes.
+    Decimal (KB, MB, ...) and binary (KiB, MiB, ...) units are accepted.
+    """
+    match = _BYTE_SIZE.match(text)
+    if match is None:
+        raise ValueError(f"Invalid byte size '{text}', expected a number with an optional unit such as MB or GiB.")
+    number, unit = match.groups()
+    size = int(float(number) * _BYTE_UNITS[(unit or "b").lower()])
+    if size <= 0:
+        raise ValueError(f"Byte size must be positive, got '{text}'.")
+    return size
+
+
+def streaming_morsel_rows(memory_limit: int, threads: int) -> int:
+    """
+    Number of rows per streaming engine morsel keeping all morsels in flight
+    within `memory_limit`, assuming rows of about 1 KiB.
+    """
+    rows = memory_limit // (max(1, threads) * _MORSELS_IN_FLIGHT_PER_THREAD * _ASSUMED_ROW_BYTES)
+    return max(_MIN_MORSEL_ROWS, min(_MAX_MORSEL_ROWS, rows))
+
+
+def configure_streaming_engine(settings: GlobalSettings) -> None:
+    """
+    Shrinks the Polars streaming engine morsel size to fit `settings.memory_limit`.
+
+    Polars reads the morsel size once per process, on the first streaming
+    query, so this must be called before any workflow is executed. An
+    explicitly set POLARS_IDEAL_MORSEL_SIZE environment variable is kept.
+    """
+    if settings.memory_limit is None or "POLARS_IDEAL_MORSEL_SIZE" in os.environ:
+        return
+    os.environ["POLARS_IDEAL_MORSEL_SIZE"] = str(
+        streaming_morsel_rows(settings.memory_limit, settings.threads or pl.thread_pool_size())
+    )
@@ -0,0 +1,140 @@
+"""Long-lived worker mode: execute many workflows in one warm process.
+
+Requests and replies are newline-delimited JSON objects. Each request
+carries a workflow and the directories to run it in:
+
+    {"id": "job-1", "workflow": {"workflow": [...]}, "rootDir": "/work/1",
+     "frameDir": "/work/1/frames", "spillDir": "/work/1/spill"}
+
+and produces exactly one reply, in request order:
+
+    {"id": "job-1", "status": "ok", "elapsedSeconds": 0.012}
+    {"id": "job-2", "status": "error", "error": "...", "elapsedSeconds": 0.003}
+
+Settings not carried by the request (parallelism, caching, ...) are taken
+from the defaults the server was started with.
+"""
+import contextlib
+import dataclasses
+import os
+import socketserver
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import IO, Literal, Optional
+
+import msgspec
+
+from ptabler.steps import GlobalSettings
+
+from .workflow import PWorkflow
+
+
+class ServeRequest(msgspec.Struct, rename="camel"):
+    workflow: PWorkflow
+    root_dir: str
+    id: Optional[str] = None
+    frame_dir: Optional[str] = None
+    spill_dir: Optional[str] = None
+
+
+class ServeReply(msgspec.Struct, rename="camel", omit_defaults=True):
+    status: Literal["ok", "error"]
+    id: Optional[str] = None
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+
+_request_decoder = msgspec.json.Decoder(ServeRequest)
+_reply_encoder = msgspec.json.Encoder()
+
+
+def handle_request(line: bytes, defaults: GlobalSettings) -> ServeReply:
+    """Decodes and executes one request. Never raises: failures are reported in the reply."""
+    started = time.perf_counter()
+    try:
+        request = _request_decoder.decode(line)
+    except (msgspec.DecodeError, msgspec.ValidationError) as e:
+        return ServeReply(status="error", error=f"Invalid request: {e}")
+
+    try:
+        root_directory = Path(request.root_dir).resolve()
+        if not root_directory.is_dir():
+            raise ValueError(f"Root directory not found at {root_directory}")
+        settings = dataclasses.replace(
+            defaults,
+            root_folder=root_directory,
+            frame_folder=Path(request.frame_dir).resolve() if request.frame_dir is not None else None,
+            spill_folder=Path(request.spill_dir).resolve() if request.spill_dir is not None else None,
+        )
+        request.workflow.execute(global_settings=settings)
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except BaseException as e:
+        # Also pyo3's PanicException (e.g. a panic inside Polars), which is
+        # not an Exception; one bad workflow must not stop the worker
+        traceback.print_exc(file=sys.stderr)
+        return ServeReply(
+            status="error",
+            id=request.id,
+            error=str(e),
+            elapsed_seconds=time.perf_counter() - started,
+        )
+
+    return ServeReply(status="ok", id=request.id, elapsed_seconds=time.perf_counter() - started)
+
+
+def serve_stream(requests: IO[bytes], replies: IO[bytes], defaults: GlobalSettings) -> None:
+    """Handles requests read line by line from `requests` until end of input."""
+    for line in requests:
+        if not line.strip():
+            continue
+        reply = handle_request(line, defaults)
+        replies.write(_reply_encoder.encode(reply) + b"\n")
+        replies.flush()
+
+
+def preload_extensions() -> None:
+    """
+    Imports the extensions steps and expressions otherwise load on first use
+    (see `HashExpression`, `WriteFrame`), so no request pays for them.
+    """
+    import duckdb  # noqa: F401
+    import polars_ds  # noqa: F401
+    import polars_hash  # noqa: F401
+
+
+def serve_stdio(defaults: GlobalSettings) -> None:
+    """
+    Serves requests from stdin, writing replies to stdout. Anything else
+    printed while executing workflows (e.g. PFrame logs) goes to stderr so
+    the reply stream stays parseable.
+    """
+    preload_extensions()
+    replies = sys.stdout.buffer
+    with contextlib.redirect_stdout(sys.stderr):
+        serve_stream(sys.stdin.buffer, replies, defaults)
+
+
+def serve_unix_socket(socket_path: Path, defaults: GlobalSettings) -> None:
+    """
+    Serves requests on a Unix domain socket until interrupted. Each
+    connection is a request stream as in `serve_stream`; connections are
+    handled one at a time, as every workflow already uses all the threads
+    it is allowed to.
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            serve_stream(self.rfile, self.wfile, defaults)
+
+    preload_extensions()
+    if socket_path.exists():
+        os.remove(socket_path)
+    with contextlib.redirect_stdout(sys.stderr):
+        with socketserver.UnixStreamServer(str(socket_path), Handler) as server:
+            try:
+                server.serve_forever()
+            finally:
+                if socket_path.exists():
+                    os.remove(socket_path)
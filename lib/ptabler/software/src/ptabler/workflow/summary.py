@@ -0,0 +1,213 @@
+import contextlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import msgspec
+import polars as pl
+
+from ptabler.steps import Tracer
+from ptabler.steps.compressed import count_records, is_compressed
+from ptabler.steps.write_frame import DataInfo
+
+
+class PartitionSummary(msgspec.Struct, rename="camel"):
+    """One partition of a written PFrame."""
+    parts: int
+    """Number of `.datainfo` parts (one per column) referring to the partition."""
+    rows: Optional[int]
+    """Rows in the partition, from the part statistics."""
+
+
+class FrameSummary(msgspec.Struct, rename="camel"):
+    """Layout of a written PFrame, read from its `.datainfo` files."""
+    partition_key_length: int
+    columns: int
+    partitions: Dict[str, PartitionSummary]
+    """Partitions by partition key, as in the `.datainfo` files (e.g. "[0]")."""
+
+
+class SinkSummary(msgspec.Struct, rename="camel", omit_defaults=True):
+    """Outputs of one sink."""
+    label: str
+    """Label of the sink, e.g. "write_csv:out/result.csv"."""
+    type: str
+    """Type of the step that added the sink, e.g. "write_csv"."""
+    paths: List[str]
+    """Files or directories written."""
+    bytes: int
+    """Total size of the outputs."""
+    elapsed_seconds: float
+    """
+    Time from the start of sink collection until the outputs were complete,
+    including chained tasks such as the sort and conversion of a `WriteFrame`.
+    Sinks collected together share their collection time. Zero for reused
+    outputs.
+    """
+    rows: Optional[int] = None
+    """Rows written, if they were counted or can be told from the outputs."""
+    reused: bool = False
+    """
+    True if the outputs already existed and the sink was not executed:
+    restored from the result cache, or left complete by an interrupted run.
+    """
+    frame: Optional[FrameSummary] = None
+    """Layout of the written PFrame, for `WriteFrame` sinks."""
+
+
+class SummaryReport(msgspec.Struct, rename="camel"):
+    """JSON document written by `ExecutionSummary.write`."""
+    total_seconds: float
+    sinks: List[SinkSummary]
+
+
+def frame_summary(frame_dir: Path) -> FrameSummary:
+    """Summarizes the partitions of a PFrame from its `.datainfo` files."""
+    partition_key_length = 0
+    columns = 0
+    partitions: Dict[str, PartitionSummary] = {}
+    for datainfo_path in sorted(frame_dir.glob("*.datainfo")):
+        datainfo = msgspec.json.decode(datainfo_path.read_bytes(), type=DataInfo)
+        partition_key_length = datainfo.partition_key_length
+        columns += 1
+        for key, part in datainfo.parts.items():
+            rows = part.stats.number_of_rows if part.stats is not None else None
+            partition = partitions.setdefault(key, PartitionSummary(parts=0, rows=rows))
+            partition.parts += 1
+            if rows is not None and (partition.rows is None or rows > partition.rows):
+                partition.rows = rows
+    return FrameSummary(partition_key_length=partition_key_length, columns=columns, partitions=partitions)
+
+
+def _output_bytes(path: str) -> int:
+    if not os.path.isdir(path):
+        with contextlib.suppress(OSError):
+            return os.path.getsize(path)
+        return 0
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            with contextlib.suppress(OSError):
+                total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def _output_rows(sink_type: str, path: str) -> Optional[int]:
+    """
+    Counts the rows of a complete output file, or of the shards or partitions
+    in an output directory, for sinks whose rows were not counted during the
+    run; Parquet files only need their footer read.
+    """
+    if os.path.isdir(path):
+        files = [_output_rows(sink_type, str(file)) for file in sorted(Path(path).rglob("*")) if file.is_file()]
+        return None if not files or None in files else sum(files)
+    try:
+        if sink_type in ("write_csv", "write_ndjson") and is_compressed(path):
+            # Compressed outputs are counted as a stream rather than decompressed in memory
+            if sink_type == "write_csv":
+                return max(0, count_records(path, quote=b'"') - 1)
+            return count_records(path)
+        if sink_type == "write_parquet":
+            lf = pl.scan_parquet(path)
+        elif sink_type == "write_csv":
+            lf = pl.scan_csv(path, infer_schema=False)
+        elif sink_type == "write_ndjson":
+            lf = pl.scan_ndjson(path, infer_schema_length=1)
+        else:
+            return None
+        return lf.select(pl.len()).collect().item()
+    except (pl.exceptions.PolarsError, OSError):
+        return None
+
+
+class _Sink:
+    def __init__(self, label: str, paths: List[str], reused: bool = False):
+        self.label = label
+        self.paths = paths
+        self.reused = reused
+        self.rows: Optional[int] = None
+        self.completed_at: Optional[float] = None
+
+
+class ExecutionSummary(Tracer):
+    """
+    Tracer collecting the outputs of every sink of a run: bytes written,
+    rows and the time until the outputs were complete, plus the partition
+    layout of written PFrames.
+
+    Call `write` after a successful run. Rows of file outputs are counted
+    in the same collection as the sinks (see `Tracer.wants_sink_rows`),
+    rows of PFrames come from their `.datainfo` files. Outputs restored
+    from the result cache or kept from an interrupted run are reported as
+    reused; their rows are read from the Parquet footers or, for CSV and
+    NDJSON, counted by reading the files.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._collection_started: Optional[float] = None
+        self._lock = threading.Lock()
+        self._sinks: Dict[str, _Sink] = {}
+
+    @contextlib.contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        if kind == "collect":
+            with self._lock:
+                if self._collection_started is None:
+                    self._collection_started = time.perf_counter()
+        yield
+
+    def sink_added(self, label: str, output_paths: List[str]) -> None:
+        with self._lock:
+            self._sinks[label] = _Sink(label, output_paths)
+
+    def sink_completed(self, label: str) -> None:
+        with self._lock:
+            if label in self._sinks:
+                self._sinks[label].completed_at = time.perf_counter()
+
+    def sink_reused(self, label: str, output_paths: List[str]) -> None:
+        with self._lock:
+            self._sinks[label] = _Sink(label, output_paths, reused=True)
+
+    def wants_sink_rows(self) -> bool:
+        return True
+
+    def sink_rows(self, label: str, rows: int) -> None:
+        with self._lock:
+            if label in self._sinks:
+                self._sinks[label].rows = rows
+
+    def report(self) -> SummaryReport:
+        """Summarizes the sinks completed so far, reading the metadata of their outputs."""
+        with self._lock:
+            started = self._collection_started if self._collection_started is not None else self._origin
+            completed = [sink for sink in self._sinks.values() if sink.reused or sink.completed_at is not None]
+        summaries = []
+        for sink in completed:
+            sink_type = sink.label.split(":", 1)[0]
+            summary = SinkSummary(
+                label=sink.label,
+                type=sink_type,
+                paths=sink.paths,
+                bytes=sum(_output_bytes(path) for path in sink.paths),
+                elapsed_seconds=0.0 if sink.reused else sink.completed_at - started,
+                rows=sink.rows,
+                reused=sink.reused,
+            )
+            if sink_type == "write_frame" and len(sink.paths) == 1:
+                summary.frame = frame_summary(Path(sink.paths[0]))
+                partition_rows = [p.rows for p in summary.frame.partitions.values()]
+                if None not in partition_rows:
+                    summary.rows = sum(partition_rows)
+            elif summary.rows is None and len(sink.paths) == 1:
+                summary.rows = _output_rows(sink_type, sink.paths[0])
+            summaries.append(summary)
+        return SummaryReport(total_seconds=time.perf_counter() - self._origin, sinks=summaries)
+
+    def write(self, path: Path) -> None:
+        """Writes the summary to `path` as JSON."""
+        encoded = msgspec.json.encode(self.report())
+        Path(path).write_bytes(msgspec.json.format(encoded))
@@ -1,10 +1,18 @@
+import contextlib
+import dataclasses
 import msgspec
 import polars as pl
 import shutil
+import sys
 from pathlib import Path
-from typing import List, overload, Literal, Union
+from typing import Dict, Iterator, List, Sequence, Tuple, overload, Literal, Union
 
-from ptabler.steps import AnyPStep, GlobalSettings, TableSpace, StepContext
+from ptabler.steps import AnyPStep, ChainedTask, GlobalSettings, TableSpace, StepContext, Tracer
+
+from .cache import ResultCache, remove_outputs
+from .execution import run_sinks_and_tasks
+from .explain import SinkExplanation, explain_sink
+from .graph import live_steps, required_steps
 
 
 class PWorkflow(msgspec.Struct):
@@ -20,7 +28,12 @@ class PWorkflow(msgspec.Struct):
     workflow: List[AnyPStep]
 
     @overload
-    def execute(self, global_settings: GlobalSettings, initial_table_space: TableSpace | None = None) -> None:
+    def execute(
+        self,
+        global_settings: GlobalSettings,
+        initial_table_space: TableSpace | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
         ...
 
     @overload
@@ -29,6 +42,7 @@ class PWorkflow(msgspec.Struct):
         global_settings: GlobalSettings,
         lazy: Literal[True],
         initial_table_space: TableSpace | None = None,
+        tracer: Tracer | None = None,
     ) -> StepContext:
         ...
 
@@ -37,6 +51,7 @@ class PWorkflow(msgspec.Struct):
         global_settings: GlobalSettings,
         lazy: bool = False,
         initial_table_space: TableSpace | None = None,
+        tracer: Tracer | None = None,
     ) -> Union[None, StepContext]:
         """
         Executes all steps in the workflow sequentially.
@@ -45,17 +60,36 @@ class PWorkflow(msgspec.Struct):
         names to Polars LazyFrames) and an empty list to collect LazyFrames
         corresponding to sink operations (e.g., writing to files).
 
-        It then iterates through each step defined in `self.workflow`:
+        Unless `lazy` is True, steps whose results never reach a sink
+        (write steps, `WriteFrame`) are skipped first. This avoids eager work
+        such as opening PFrame sources for unused tables. If
+        `global_settings.cache_folder` is set, sinks whose outputs are found in
+        the result cache are restored from it and skipped as well, and the
+        outputs of the executed sinks are stored in the cache afterwards.
+        With `global_settings.resume`, `WriteFrame` steps continuing an
+        interrupted run from their intermediate files need no input tables,
+        so the steps feeding only them are skipped too.
+
+        It then iterates through each remaining step in `self.workflow`:
         1. Creates a StepContext for the current step with the current
            `table_space` and `global_settings`.
         2. Calls the `execute` method of the current step, passing the ctx.
         3. The step's `execute` method modifies the ctx directly.
         4. Sink LazyFrames are accumulated from the ctx.
+        5. The schemas of the tables and sinks the step produced are resolved,
+           so plan errors (e.g. a missing column) are raised with the step
+           that caused them.
+
+        Setup tasks (e.g. creating `WriteFrame` directories) run once all
+        steps are planned and validated, in both modes.
 
         If `lazy` is False (default), after all steps are processed,
         `polars.collect_all()` is called on the accumulated sink LazyFrames
         to execute these I/O-bound operations. The `streaming=True` option
         is used for potentially better performance and lower memory usage.
+        Chained tasks are then run, up to `global_settings.max_parallel_tasks`
+        of them at once. With `global_settings.pipeline_sinks` each chained
+        task starts as soon as the sink it depends on has completed.
 
         If `lazy` is True, this method returns the `StepContext` containing
         the final table space, sink operations, and chained tasks without 
@@ -72,6 +106,9 @@ class PWorkflow(msgspec.Struct):
             initial_table_space: An optional `TableSpace` to initialize the
                                  workflow's table space. If None, an empty
                                  tablespace is created. Defaults to None.
+            tracer: An optional `Tracer` notified about every step, the sink
+                    collection and every chained task (e.g. an
+                    `ExecutionProfile`). Defaults to a no-op tracer.
 
         Returns:
             If `lazy` is True, returns the `StepContext` containing the final
@@ -79,44 +116,303 @@ class PWorkflow(msgspec.Struct):
             If `lazy` is False, executes sink operations and chained tasks,
             then returns `None`.
         """
-        spill_dir_created = False
-        spill_path = None
-        
-        if global_settings.spill_folder is not None:
-            spill_path = Path(global_settings.spill_folder)
-            if not spill_path.exists():
-                spill_path.mkdir(parents=True, exist_ok=True)
-                spill_dir_created = True
-        
-        try:
+        tracer = tracer if tracer is not None else Tracer()
+
+        with _spill_folder(global_settings):
+            ctx, cache_keys = self._plan(global_settings, tracer, lazy, initial_table_space)
+            # A lazy caller gets the context and runs its cleanup tasks itself
+            with _cleanup([ctx], tracer, on_success=not lazy):
+                _run_setup_tasks(ctx, tracer)
+                if lazy:
+                    return ctx
+
+                sink_labels = ctx.sink_labels()
+                row_counts = ctx.sink_row_counts()
+                _, sink_frames, chained_tasks = ctx.into_parts()
+                run_sinks_and_tasks(sink_frames, sink_labels, chained_tasks, global_settings, tracer, row_counts)
+                self._store_in_cache(cache_keys, global_settings, tracer)
+                return None
+
+    def _plan(
+        self,
+        global_settings: GlobalSettings,
+        tracer: Tracer,
+        lazy: bool = False,
+        initial_table_space: TableSpace | None = None,
+        label_prefix: str = "",
+    ) -> Tuple[StepContext, Dict[int, str]]:
+        """
+        Selects the steps to execute, restoring cached sinks, and executes
+        them in a new `StepContext`. Setup tasks are not run yet.
+
+        Returns the context and the result cache keys of the sinks to store
+        after execution (see `_store_in_cache`).
+        """
+        ctx = StepContext(
+            settings=global_settings,
+            initial_table_space=initial_table_space,
+            tracer=tracer,
+        )
+
+        cache_keys: Dict[int, str] = {}
+        if lazy:
+            # The caller inspects the table space, so every table must be built.
+            step_indices = range(len(self.workflow))
+        elif global_settings.cache_folder is not None:
+            cache = ResultCache(global_settings.cache_folder, global_settings.cache_fingerprint)
+            pending_sinks, cache_keys = _restore_cached_sinks(
+                self.workflow, cache, global_settings, tracer, label_prefix
+            )
+            step_indices = _steps_for_sinks(self.workflow, pending_sinks, global_settings)
+            _add_output_removal(ctx, self.workflow, pending_sinks, global_settings, label_prefix)
+        else:
+            sinks = [index for index, step in enumerate(self.workflow) if step.is_sink()]
+            step_indices = _steps_for_sinks(self.workflow, sinks, global_settings)
+
+        with _cleanup([ctx], tracer, on_success=False):
+            for index in step_indices:
+                step_obj = self.workflow[index]
+                label = label_prefix + _step_label(index, step_obj)
+                with tracer.span("step", label):
+                    _execute_step(ctx, label, step_obj)
+
+        return ctx, cache_keys
+
+    def _store_in_cache(
+        self,
+        cache_keys: Dict[int, str],
+        global_settings: GlobalSettings,
+        tracer: Tracer,
+        label_prefix: str = "",
+    ) -> None:
+        """Stores the outputs of the executed cacheable sinks in the result cache."""
+        if not cache_keys:
+            return
+        cache = ResultCache(global_settings.cache_folder, global_settings.cache_fingerprint)
+        for index, key in cache_keys.items():
+            step_obj = self.workflow[index]
+            with tracer.span("cache_store", label_prefix + _step_label(index, step_obj)):
+                try:
+                    cache.store(key, step_obj.output_paths(global_settings))
+                except OSError as e:
+                    # The outputs are complete; a full or read-only cache must not fail the run
+                    print(f"Warning: failed to store outputs in result cache: {e}", file=sys.stderr)
+
+    def explain(
+        self,
+        global_settings: GlobalSettings,
+        initial_table_space: TableSpace | None = None,
+    ) -> List[SinkExplanation]:
+        """
+        Plans the workflow without executing it and explains how the
+        streaming engine would run every sink.
+
+        Steps are executed in dry-run mode (see `StepContext.dry_run`): no
+        directories are created, nothing is materialized and no chained
+        tasks run; only cleanup tasks do. Dead steps are skipped as in `execute`.
+
+        Returns:
+            One `SinkExplanation` per sink, in the order the sinks were added.
+        """
+        with _spill_folder(global_settings):
             ctx = StepContext(
                 settings=global_settings,
-                initial_table_space=initial_table_space
+                initial_table_space=initial_table_space,
+                dry_run=True,
             )
+            with _cleanup([ctx], Tracer()):
+                for index in live_steps(self.workflow):
+                    _execute_step(ctx, _step_label(index, self.workflow[index]), self.workflow[index])
 
-            for step_obj in self.workflow:
-                step_obj.execute(ctx)
+                sink_labels = ctx.sink_labels()
+                _, sink_frames, _ = ctx.into_parts()
+                return [explain_sink(label, lf) for label, lf in zip(sink_labels, sink_frames)]
 
-            if lazy:
-                return ctx
-            else:
-                _, sink_frames, chained_tasks = ctx.into_parts()
-                
-                if sink_frames:
-                    # Execute all collected sink operations (e.g., write_csv).
-                    # The results of these operations (if any, usually None for writes)
-                    # are ignored here. The primary purpose is to trigger the computation
-                    # and I/O.
-                    # `comm_subplan_elim=True` (default) is generally good for performance.
-                    _ = pl.collect_all(sink_frames, engine="streaming")
-                    # Future consideration: Add logging for workflow completion or errors.
-                
-                # Execute all chained tasks in the order they were added
-                for task in chained_tasks:
-                    task()
-                
-                return None
-        
-        finally:
-            if spill_dir_created and spill_path is not None and spill_path.exists():
-                shutil.rmtree(spill_path, ignore_errors=True)
+
+def execute_workflows(
+    workflows: Sequence[PWorkflow],
+    global_settings: GlobalSettings,
+    tracer: Tracer | None = None,
+) -> None:
+    """
+    Executes several independent workflows with one `pl.collect_all()` call.
+
+    Every workflow is planned in its own `StepContext`, as by
+    `PWorkflow.execute`, so table names never clash between workflows. All
+    workflows are planned and validated before any setup task or sink runs.
+    Their sinks are then collected together: subplans the workflows have in
+    common, such as scans of the same input file, are executed once. Chained
+    tasks run as configured in `global_settings`, as for a single workflow.
+
+    Step labels in traces and errors are prefixed with the position of the
+    workflow, e.g. "1:#0 read_csv".
+    """
+    tracer = tracer if tracer is not None else Tracer()
+
+    with _spill_folder(global_settings):
+        planned = []
+        contexts: List[StepContext] = []
+        with _cleanup(contexts, tracer):
+            for number, workflow in enumerate(workflows):
+                ctx, cache_keys = workflow._plan(global_settings, tracer, label_prefix=f"{number}:")
+                planned.append((workflow, ctx, cache_keys))
+                contexts.append(ctx)
+            for _, ctx, _ in planned:
+                _run_setup_tasks(ctx, tracer)
+
+            sink_frames: List[pl.LazyFrame] = []
+            sink_labels: List[str] = []
+            row_counts: Dict[int, pl.LazyFrame] = {}
+            chained_tasks: List[ChainedTask] = []
+            for _, ctx, _ in planned:
+                # Chained tasks refer to sinks by their index within their own context
+                offset = len(sink_frames)
+                sink_labels.extend(ctx.sink_labels())
+                row_counts.update((index + offset, lf) for index, lf in ctx.sink_row_counts().items())
+                _, frames, tasks = ctx.into_parts()
+                sink_frames.extend(frames)
+                chained_tasks.extend(
+                    dataclasses.replace(task, sink=task.sink + offset) if task.sink is not None else task
+                    for task in tasks
+                )
+
+            run_sinks_and_tasks(sink_frames, sink_labels, chained_tasks, global_settings, tracer, row_counts)
+            for number, (workflow, _, cache_keys) in enumerate(planned):
+                workflow._store_in_cache(cache_keys, global_settings, tracer, label_prefix=f"{number}:")
+
+
+@contextlib.contextmanager
+def _spill_folder(global_settings: GlobalSettings) -> Iterator[None]:
+    """Creates the spill folder if it does not exist, and removes it afterwards if it was created."""
+    spill_dir_created = False
+    spill_path = None
+
+    if global_settings.spill_folder is not None:
+        spill_path = Path(global_settings.spill_folder)
+        if not spill_path.exists():
+            spill_path.mkdir(parents=True, exist_ok=True)
+            spill_dir_created = True
+
+    try:
+        yield
+    finally:
+        if spill_dir_created and spill_path is not None and spill_path.exists():
+            shutil.rmtree(spill_path, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def _cleanup(contexts: List[StepContext], tracer: Tracer, on_success: bool = True) -> Iterator[None]:
+    """
+    Runs the cleanup tasks of `contexts` (see `StepContext.add_cleanup_task`)
+    when the block fails, and when it succeeds if `on_success` is True.
+    """
+    succeeded = False
+    try:
+        yield
+        succeeded = True
+    finally:
+        if on_success or not succeeded:
+            for ctx in contexts:
+                for task in ctx.cleanup_tasks():
+                    with tracer.span("cleanup", task.label):
+                        task()
+
+
+def _run_setup_tasks(ctx: StepContext, tracer: Tracer) -> None:
+    for task in ctx.setup_tasks():
+        with tracer.span("setup", task.label):
+            task()
+
+
+def _step_label(index: int, step: AnyPStep) -> str:
+    """Identifies a step by its position in the workflow and its type tag."""
+    return f"#{index} {type(step).__struct_config__.tag}"
+
+
+def _execute_step(ctx: StepContext, label: str, step: AnyPStep) -> None:
+    """
+    Executes a step and resolves the schemas of the tables and sinks it
+    produced. Plan errors such as missing columns or type mismatches are
+    raised here, with the step that caused them, before any sink or setup
+    task runs. The Polars exception type is kept.
+    """
+    sinks_before = len(ctx.sink_frames())
+    step.execute(ctx)
+
+    new_sinks = list(zip(ctx.sink_labels()[sinks_before:], ctx.sink_frames()[sinks_before:]))
+    produced = [(f"table '{name}'", ctx.get_table(name)) for name in step.table_outputs()]
+    produced += [(f"sink '{label}'", lf) for label, lf in new_sinks]
+    for what, lf in produced:
+        try:
+            lf.collect_schema()
+        except pl.exceptions.PolarsError as e:
+            raise type(e)(f"Step {label} produced an invalid {what}: {e}") from e
+
+    for label, _ in new_sinks:
+        ctx.tracer.sink_added(label, step.output_paths(ctx.settings))
+
+
+def _restore_cached_sinks(
+    steps: Sequence[AnyPStep],
+    cache: ResultCache,
+    settings: GlobalSettings,
+    tracer: Tracer,
+    label_prefix: str = "",
+) -> Tuple[List[int], Dict[int, str]]:
+    """
+    Restores the outputs of live sinks found in the result cache.
+
+    Returns the indices of the sinks still to be executed, and the cache
+    keys of the cacheable ones among them.
+    """
+    pending_sinks: List[int] = []
+    cache_keys: Dict[int, str] = {}
+    for index in live_steps(steps):
+        step = steps[index]
+        if not step.is_sink():
+            continue
+        key = cache.key(steps, index, settings)
+        if key is not None:
+            with tracer.span("cache_lookup", label_prefix + _step_label(index, step)):
+                restored = cache.restore(key, step.output_paths(settings))
+            if restored:
+                tracer.sink_reused(step.sink_label(), step.output_paths(settings))
+                continue
+            cache_keys[index] = key
+        pending_sinks.append(index)
+    return pending_sinks, cache_keys
+
+
+def _add_output_removal(
+    ctx: StepContext,
+    steps: Sequence[AnyPStep],
+    sinks: List[int],
+    settings: GlobalSettings,
+    label_prefix: str = "",
+) -> None:
+    """
+    Adds setup tasks removing the earlier outputs of the sinks to execute,
+    which a previous run may have restored as hardlinks into the result cache
+    (see `remove_outputs`). Sinks resuming from their earlier outputs (see
+    `PStep.needs_table_inputs`) keep them.
+    """
+    for index in sinks:
+        step = steps[index]
+        if not step.needs_table_inputs(settings):
+            continue
+        paths = step.output_paths(settings)
+        ctx.add_setup_task(
+            lambda paths=paths: remove_outputs(paths),
+            label=f"{label_prefix}{_step_label(index, step)}:remove_outputs",
+        )
+
+
+def _steps_for_sinks(steps: Sequence[AnyPStep], sinks: List[int], settings: GlobalSettings) -> List[int]:
+    """
+    Returns the indices of the steps needed to execute `sinks`, in execution
+    order. Sinks that can run without their input tables (see
+    `PStep.needs_table_inputs`) do not keep the steps producing them alive.
+    """
+    independent = {index for index in sinks if not steps[index].needs_table_inputs(settings)}
+    required = required_steps(steps, [index for index in sinks if index not in independent])
+    return sorted(set(required) | independent)
@@ -1,29 +1,65 @@
 from .aggregation_test import AggregationTests
 from .basic_test import BasicTests
+from .benchmark_test import BenchmarkTests
+from .cache_test import CacheTests
 from .concatenate_test import ConcatenateTests
+from .execution_test import ExecutionTests
+from .explain_test import ExplainTests
 from .expression_test import ExpressionTests
+from .filter_test import FilterInSetFileTests
+from .graph_test import GraphTests
 from .join_test import JoinTests
+from .materialize_test import MaterializeTests
+from .memory_test import MemoryProfileTests
 from .ndjson_test import NdjsonTests
 from .parquet_test import ParquetTests
+from .profile_test import ProfileTests
+from .progress_test import ProgressTests
 from .write_frame_test import (
     StructuralSanityTests,
     WriteFrameHappyPathTest,
     WriteFrameInputValidationTests,
 )
 from .read_frame_test import ReadFrameTests
+from .read_files_test import ReadFilesTests
+from .resources_test import ResourcesTests
+from .resume_test import ResumeTests
+from .serve_test import ServeTests
 from .sort_test import SortTests
+from .startup_test import StartupTests
+from .summary_test import SummaryTests
+from .validation_test import ValidationTests
+from .write_files_test import WriteFilesTests
 
 __all__ = [
     "AggregationTests",
     "BasicTests",
+    "BenchmarkTests",
+    "CacheTests",
     "ConcatenateTests",
+    "ExecutionTests",
+    "ExplainTests",
     "ExpressionTests",
+    "FilterInSetFileTests",
+    "GraphTests",
     "JoinTests",
+    "MaterializeTests",
+    "MemoryProfileTests",
     "NdjsonTests",
     "ParquetTests",
+    "ProfileTests",
+    "ProgressTests",
     "StructuralSanityTests",
     "WriteFrameHappyPathTest",
     "WriteFrameInputValidationTests",
     "ReadFrameTests",
+    "ReadFilesTests",
+    "ResourcesTests",
+    "ResumeTests",
+    "ServeTests",
     "SortTests",
+    "StartupTests",
+    "SummaryTests",
+    "ValidationTests",
+    "WriteFilesTests",
 ]
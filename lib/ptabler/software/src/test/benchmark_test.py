@@ -0,0 +1,40 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmark import CASES, compare_reports, run_case, write_inputs
+from benchmark.runner import new_report, read_report, write_report
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_cases_run_on_generated_inputs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_dir = Path(tmp) / "inputs"
+            write_inputs(input_dir, 500)
+            inputs = sorted(path.name for path in input_dir.iterdir())
+
+            results = []
+            for case in CASES:
+                with self.subTest(case=case.name):
+                    result = run_case(case, input_dir, 500)
+                    self.assertEqual(len(result.seconds), 1)
+                    self.assertIn("collect", result.phase_seconds)
+                    results.append(result)
+            # Outputs are removed after every run
+            self.assertEqual(sorted(path.name for path in input_dir.iterdir() if path.name != "outputs"), inputs)
+
+            report_path = Path(tmp) / "results.json"
+            write_report(new_report(results), report_path)
+            report = read_report(report_path)
+            self.assertEqual([r.name for r in report.results], [case.name for case in CASES])
+
+            lines, regressions = compare_reports(report, report, threshold=1.2)
+            self.assertEqual(len(lines), len(CASES) + 1)
+            self.assertEqual(regressions, [])
+            report.results[0].min_seconds *= 2
+            _, regressions = compare_reports(read_report(report_path), report, threshold=1.2)
+            self.assertEqual(regressions, [f"{CASES[0].name}@500"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import dataclasses
+import os
+import shutil
+import tempfile
+import hashlib
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from ptabler.steps import GlobalSettings, ReadCsv, WriteCsv
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping, WriteFrame
+from ptabler.workflow import ExecutionProfile, PWorkflow
+
+
+class CacheTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.settings = GlobalSettings(root_folder=self.root, cache_folder=self.root / "cache")
+        pl.DataFrame({"id": [2, 1], "value": [20.0, 10.0]}).write_csv(self.root / "input.csv")
+        self.workflow = PWorkflow(workflow=[
+            ReadCsv(file="input.csv", name="input"),
+            WriteCsv(table="input", file="output.csv"),
+            WriteFrame(
+                input_table="input",
+                frame_name="frame",
+                axes=[AxisMapping(column="id", type="Long")],
+                columns=[ColumnMapping(column="value", type="Double")],
+            ),
+        ])
+
+    def tearDown(self):
+        for root, dirs, files in os.walk(self.root):
+            for name in files:
+                os.chmod(os.path.join(root, name), 0o644)
+        shutil.rmtree(self.root)
+
+    def run_workflow(self, settings: GlobalSettings) -> list[str]:
+        profile = ExecutionProfile()
+        self.workflow.execute(global_settings=settings, tracer=profile)
+        return [s.name for s in profile.report().spans if s.kind == "step"]
+
+    def remove_outputs(self):
+        os.remove(self.root / "output.csv")
+        shutil.rmtree(self.root / "frame")
+
+    def test_second_run_restores_outputs(self):
+        self.assertEqual(self.run_workflow(self.settings), ["#0 read_csv", "#1 write_csv", "#2 write_frame"])
+        expected_csv = pl.read_csv(self.root / "output.csv")
+        expected_frame = pl.read_parquet(self.root / "frame" / "partition_0.parquet")
+        self.remove_outputs()
+
+        self.assertEqual(self.run_workflow(self.settings), [])
+        assert_frame_equal(pl.read_csv(self.root / "output.csv"), expected_csv)
+        assert_frame_equal(pl.read_parquet(self.root / "frame" / "partition_0.parquet"), expected_frame)
+        self.assertTrue((self.root / "frame" / "value.datainfo").exists())
+
+    def test_changed_input_misses(self):
+        self.run_workflow(self.settings)
+        self.remove_outputs()
+        pl.DataFrame({"id": [3], "value": [30.0]}).write_csv(self.root / "input.csv")
+
+        self.assertEqual(len(self.run_workflow(self.settings)), 3)
+        self.assertEqual(pl.read_csv(self.root / "output.csv")["id"].to_list(), [3])
+
+    def test_digest_fingerprint_hits_after_touch(self):
+        settings = dataclasses.replace(self.settings, cache_fingerprint="digest")
+        self.run_workflow(settings)
+        self.remove_outputs()
+        os.utime(self.root / "input.csv", ns=(0, 0))
+
+        self.assertEqual(self.run_workflow(settings), [])
+
+    def test_digest_fingerprint_reads_each_input_once(self):
+        settings = dataclasses.replace(self.settings, cache_fingerprint="digest")
+        with mock.patch("hashlib.file_digest", wraps=hashlib.file_digest) as file_digest:
+            self.run_workflow(settings)
+        self.assertEqual(file_digest.call_count, 1)
+
+    def test_hit_over_existing_directory_outputs(self):
+        self.workflow.workflow.append(WriteCsv(table="input", file="shards", max_rows_per_file=1))
+        self.run_workflow(self.settings)
+
+        self.assertEqual(self.run_workflow(self.settings), [])
+        self.assertEqual(len(list((self.root / "shards").iterdir())), 2)
+        self.assertTrue((self.root / "frame" / "value.datainfo").exists())
+
+    def test_miss_after_hit_keeps_cache_entry(self):
+        self.run_workflow(self.settings)
+        self.run_workflow(self.settings)
+        expected = (self.root / "output.csv").read_bytes()
+        pl.DataFrame({"id": [3], "value": [30.0]}).write_csv(self.root / "input.csv")
+
+        self.assertEqual(len(self.run_workflow(self.settings)), 3)
+        self.assertEqual(pl.read_csv(self.root / "output.csv")["id"].to_list(), [3])
+        cached = [path.read_bytes() for path in (self.root / "cache").glob("*/0") if path.is_file()]
+        self.assertIn(expected, cached)
+
+    def test_initial_table_space_is_not_cached(self):
+        workflow = PWorkflow(workflow=[WriteCsv(table="external", file="external.csv")])
+        for _ in range(2):
+            workflow.execute(
+                global_settings=self.settings,
+                initial_table_space={"external": pl.LazyFrame({"a": [1]})},
+            )
+        self.assertFalse((self.root / "cache").exists() and any((self.root / "cache").iterdir()))
+
+
+if __name__ == '__main__':
+    unittest.main()
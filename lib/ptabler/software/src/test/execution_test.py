@@ -0,0 +1,175 @@
+import os
+import shutil
+import threading
+import time
+import unittest
+from unittest import mock
+
+import polars as pl
+
+from ptabler.steps import ChainedTask, GlobalSettings, ReadCsv, Tracer, WriteCsv
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping, WriteFrame
+from ptabler.workflow import ExecutionProfile, PWorkflow, execute_workflows
+from ptabler.workflow.execution import _run_chained_tasks, run_sinks_and_tasks
+
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+test_data_root_dir = os.path.join(
+    os.path.dirname(os.path.dirname(current_script_dir)),
+    "test_data",
+)
+global_settings = GlobalSettings(root_folder=test_data_root_dir, max_parallel_tasks=4)
+
+
+class ExecutionTests(unittest.TestCase):
+
+    def test_parallel_write_frames(self):
+        frame_names = [f"parallel_frame_{i}" for i in range(3)]
+        frame_dirs = [os.path.join(test_data_root_dir, name) for name in frame_names]
+        ptw = PWorkflow(workflow=[
+            WriteFrame(
+                input_table="input",
+                frame_name=name,
+                axes=[AxisMapping(column="id", type="Long")],
+                columns=[ColumnMapping(column="value", type="Double")],
+            )
+            for name in frame_names
+        ])
+        lf = pl.LazyFrame({"id": [3, 1, 2], "value": [30.0, 10.0, 20.0]})
+
+        try:
+            ptw.execute(global_settings=global_settings, initial_table_space={"input": lf})
+            for frame_dir in frame_dirs:
+                df = pl.read_parquet(os.path.join(frame_dir, "partition_0.parquet"))
+                self.assertEqual(df["id"].to_list(), [1, 2, 3])
+        finally:
+            for frame_dir in frame_dirs:
+                if os.path.exists(frame_dir):
+                    shutil.rmtree(frame_dir)
+
+    def test_pipelined_sinks(self):
+        frame_dir = os.path.join(test_data_root_dir, "pipelined_frame")
+        csv_file = os.path.join(test_data_root_dir, "outputs", "pipelined.csv")
+        ptw = PWorkflow(workflow=[
+            WriteFrame(
+                input_table="input",
+                frame_name="pipelined_frame",
+                axes=[AxisMapping(column="id", type="Long")],
+                columns=[ColumnMapping(column="value", type="Double")],
+            ),
+            WriteCsv(table="input", file="outputs/pipelined.csv"),
+        ])
+        lf = pl.LazyFrame({"id": [3, 1, 2], "value": [30.0, 10.0, 20.0]})
+        settings = GlobalSettings(root_folder=test_data_root_dir, pipeline_sinks=True)
+
+        try:
+            ptw.execute(global_settings=settings, initial_table_space={"input": lf})
+            df = pl.read_parquet(os.path.join(frame_dir, "partition_0.parquet"))
+            self.assertEqual(df["id"].to_list(), [1, 2, 3])
+            self.assertEqual(pl.read_csv(csv_file).height, 3)
+        finally:
+            if os.path.exists(frame_dir):
+                shutil.rmtree(frame_dir)
+            if os.path.exists(csv_file):
+                os.remove(csv_file)
+
+    def test_pipelined_sink_failure_skips_its_task(self):
+        frame_dir = os.path.join(test_data_root_dir, "pipelined_failed_frame")
+        ptw = PWorkflow(workflow=[
+            WriteFrame(
+                input_table="input",
+                frame_name="pipelined_failed_frame",
+                axes=[AxisMapping(column="missing", type="Long")],
+                columns=[ColumnMapping(column="value", type="Double")],
+            ),
+        ])
+        lf = pl.LazyFrame({"id": [1], "value": [1.0]})
+        settings = GlobalSettings(root_folder=test_data_root_dir, pipeline_sinks=True)
+
+        try:
+            with self.assertRaises(pl.exceptions.ColumnNotFoundError):
+                ptw.execute(global_settings=settings, initial_table_space={"input": lf})
+            self.assertFalse(os.path.exists(os.path.join(frame_dir, "value.datainfo")))
+        finally:
+            if os.path.exists(frame_dir):
+                shutil.rmtree(frame_dir)
+
+    def test_pipelined_collects_are_bounded(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def collect(indices, *args):
+            with lock:
+                running.append(indices)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(indices)
+
+        sink_frames = [pl.LazyFrame() for _ in range(4)]
+        tasks = [ChainedTask(label=f"t{i}", run=lambda: None, sink=i) for i in range(4)]
+        settings = GlobalSettings(root_folder=test_data_root_dir, pipeline_sinks=True, max_parallel_tasks=2)
+        with mock.patch("ptabler.workflow.execution._collect", side_effect=collect) as collect_mock:
+            run_sinks_and_tasks(sink_frames, [f"s{i}" for i in range(4)], tasks, settings, Tracer())
+        self.assertEqual(collect_mock.call_count, 4)
+        self.assertEqual(max(peak), 2)
+
+    def test_multiple_workflows(self):
+        frame_dir = os.path.join(test_data_root_dir, "multiple_workflows_frame")
+        csv_files = [os.path.join(test_data_root_dir, "outputs", f"multiple_workflows_{i}.csv") for i in range(2)]
+        workflows = [
+            PWorkflow(workflow=[
+                ReadCsv(file="test_data_1.tsv", name="input", delimiter="\t"),
+                WriteCsv(table="input", file="outputs/multiple_workflows_0.csv"),
+            ]),
+            PWorkflow(workflow=[
+                ReadCsv(file="test_data_1.tsv", name="input", delimiter="\t"),
+                WriteCsv(table="input", file="outputs/multiple_workflows_1.csv"),
+                WriteFrame(
+                    input_table="input",
+                    frame_name="multiple_workflows_frame",
+                    axes=[AxisMapping(column="id", type="Long")],
+                    columns=[ColumnMapping(column="value1", type="Double")],
+                ),
+            ]),
+        ]
+        profile = ExecutionProfile()
+
+        for pipeline_sinks in (False, True):
+            settings = GlobalSettings(root_folder=test_data_root_dir, pipeline_sinks=pipeline_sinks)
+            try:
+                execute_workflows(workflows, global_settings=settings, tracer=profile)
+                expected = pl.read_csv(os.path.join(test_data_root_dir, "test_data_1.tsv"), separator="\t")
+                for csv_file in csv_files:
+                    self.assertEqual(pl.read_csv(csv_file).height, expected.height)
+                df = pl.read_parquet(os.path.join(frame_dir, "partition_0.parquet"))
+                self.assertEqual(df["id"].to_list(), sorted(expected["id"].to_list()))
+            finally:
+                if os.path.exists(frame_dir):
+                    shutil.rmtree(frame_dir)
+                for csv_file in csv_files:
+                    if os.path.exists(csv_file):
+                        os.remove(csv_file)
+
+        spans = [(s.kind, s.name) for s in profile.report().spans]
+        self.assertIn(("step", "0:#0 read_csv"), spans)
+        self.assertIn(("step", "1:#2 write_frame"), spans)
+        self.assertIn(("collect", "3 sinks"), spans)
+
+    def test_tasks_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=10)
+        tasks = [ChainedTask(label=f"t{i}", run=barrier.wait) for i in range(3)]
+        _run_chained_tasks(tasks, 3, Tracer())
+
+    def test_task_failure_is_raised(self):
+        def fail():
+            raise RuntimeError("task failed")
+
+        tasks = [ChainedTask(label="ok", run=lambda: None), ChainedTask(label="fail", run=fail)]
+        for max_parallel in (1, 2):
+            with self.assertRaises(RuntimeError):
+                _run_chained_tasks(tasks, max_parallel, Tracer())
+
+
+if __name__ == '__main__':
+    unittest.main()
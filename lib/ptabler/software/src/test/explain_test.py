@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import polars as pl
+
+from ptabler.expression import AliasExpression, ColumnReferenceExpression, RankExpression
+from ptabler.steps import GlobalSettings, Materialize, PStep, StepContext, WithColumns, WriteCsv
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping, WriteFrame
+from ptabler.workflow import PWorkflow
+
+
+class _TaskStep(PStep, tag="test_task"):
+    """Sink chaining a task and adding a cleanup task, recording which of them ran."""
+    table: str
+    events: list = []
+
+    def is_sink(self) -> bool:
+        return True
+
+    def execute(self, ctx: StepContext) -> None:
+        ctx.add_sink(ctx.get_table(self.table).sink_csv("never-written.csv", lazy=True), label="test_task")
+        ctx.chain_task(lambda: self.events.append("chained"))
+        ctx.add_cleanup_task(lambda: self.events.append("cleanup"))
+
+
+class ExplainTests(unittest.TestCase):
+    def test_explain_flags_fallbacks_without_side_effects(self):
+        with tempfile.TemporaryDirectory() as root:
+            settings = GlobalSettings(root_folder=Path(root))
+            workflow = PWorkflow(workflow=[
+                Materialize(table="input"),
+                WithColumns(
+                    input_table="input",
+                    output_table="ranked",
+                    columns=[AliasExpression(
+                        name="rank",
+                        value=RankExpression(
+                            order_by=[ColumnReferenceExpression(name="value")],
+                            partition_by=[ColumnReferenceExpression(name="group")],
+                        ),
+                    )],
+                ),
+                WriteCsv(table="ranked", file="ranked.csv"),
+                WriteFrame(
+                    input_table="input",
+                    frame_name="frame",
+                    axes=[AxisMapping(column="id", type="Long")],
+                    columns=[ColumnMapping(column="value", type="Double")],
+                ),
+            ])
+            lf = pl.LazyFrame({"id": [1, 2], "group": ["a", "a"], "value": [1.0, 2.0]})
+
+            explanations = workflow.explain(global_settings=settings, initial_table_space={"input": lf})
+
+            self.assertEqual([e.sink for e in explanations], ["write_csv:ranked.csv", "write_frame:frame"])
+            self.assertIn("SINK", explanations[0].plan)
+            self.assertTrue(any("rank" in node for node in explanations[0].fallbacks))
+            self.assertEqual(explanations[1].fallbacks, [])
+            self.assertIn("In-memory engine fallbacks", explanations[0].format())
+            self.assertEqual(os.listdir(root), [])
+
+    def test_explain_runs_cleanup_but_not_chained_tasks(self):
+        step = _TaskStep(table="input")
+        PWorkflow(workflow=[step]).explain(
+            global_settings=GlobalSettings(root_folder=Path(".")),
+            initial_table_space={"input": pl.LazyFrame({"id": [1]})},
+        )
+        self.assertEqual(step.events, ["cleanup"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -430,6 +430,12 @@ class ExpressionTests(unittest.TestCase):
                         hash_type='wyhash', encoding='base64_alphanumeric_upper',
                         value=ColumnReferenceExpression(name="text"), bits=40)
                 ),
+                AliasExpression(
+                    name="xxh3_hex_32b",  # xxh3 produces 64 bits
+                    value=HashExpression(
+                        hash_type='xxh3', encoding='hex',
+                        value=ColumnReferenceExpression(name="text"), bits=32)
+                ),
                 AliasExpression(
                     # bits > 256, should use full hash (256 bits for sha256)
                     name="sha256_hex_bits_gt_max",
@@ -473,6 +479,7 @@ class ExpressionTests(unittest.TestCase):
             "sha256_b64_alnum_full": 42,
             "wyhash_hex_20b": math.ceil(20 / 4),
             "wyhash_b64_alnum_upper_40b": math.ceil(40 / 5.15),
+            "xxh3_hex_32b": math.ceil(32 / 4),
             # bits=300 capped to 256 for sha256
             "sha256_hex_bits_gt_max": math.ceil(256 / 4),
         }
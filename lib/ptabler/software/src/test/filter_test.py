@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from ptabler.expression import ColumnReferenceExpression
+from ptabler.steps import FilterInSetFile, GlobalSettings
+from ptabler.workflow import PWorkflow
+
+
+class FilterInSetFileTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.settings = GlobalSettings(root_folder=self.root)
+        self.table = pl.LazyFrame({
+            "id": [5, 1, None, 3, 2],
+            "clonotype": ["e", "a,1", None, "c", "b"],
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def filter(self, **kwargs) -> pl.DataFrame:
+        ptw = PWorkflow(workflow=[FilterInSetFile(input_table="input", output_table="filtered", **kwargs)])
+        ctx = ptw.execute(global_settings=self.settings, lazy=True, initial_table_space={"input": self.table})
+        return ctx.get_table("filtered").collect()
+
+    def test_text_set_keeps_matching_rows_in_order(self):
+        (self.root / "set.txt").write_text('c\n"x"\na,1\ne\n')
+        result = self.filter(value=ColumnReferenceExpression(name="clonotype"), file="set.txt")
+        assert_frame_equal(result, pl.DataFrame({"id": [5, 1, 3], "clonotype": ["e", "a,1", "c"]}))
+
+    def test_csv_set_is_cast_to_value_type(self):
+        (self.root / "set.csv").write_text("name,id\nx,1\ny,2\nz,2\n")
+        result = self.filter(value=ColumnReferenceExpression(name="id"), file="set.csv", format="csv", column="id")
+        assert_frame_equal(result, pl.DataFrame({"id": [1, 2], "clonotype": ["a,1", "b"]}))
+
+    def test_negated_parquet_set_drops_nulls(self):
+        pl.DataFrame({"id": [3, None]}).write_parquet(self.root / "set.parquet")
+        result = self.filter(
+            value=ColumnReferenceExpression(name="id"), file="set.parquet", format="parquet", column="id", negate=True
+        )
+        assert_frame_equal(result, pl.DataFrame({"id": [5, 1, 2], "clonotype": ["e", "a,1", "b"]}))
+
+    def test_column_is_required_for_tabular_sets(self):
+        with self.assertRaisesRegex(ValueError, "'column' is required"):
+            self.filter(value=ColumnReferenceExpression(name="id"), file="set.csv", format="csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
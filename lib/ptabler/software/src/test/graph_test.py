@@ -0,0 +1,48 @@
+import unittest
+
+from ptabler.expression import ColumnReferenceExpression, ConstantValueExpression, GtExpression
+from ptabler.steps import AddColumns, Filter, Join, ReadCsv, WriteCsv
+from ptabler.workflow.graph import live_steps, required_steps
+
+
+class GraphTests(unittest.TestCase):
+
+    def test_unused_tables_are_dead(self):
+        steps = [
+            ReadCsv(file="a.csv", name="a"),
+            ReadCsv(file="b.csv", name="b"),
+            Filter(
+                input_table="b",
+                output_table="b_filtered",
+                condition=GtExpression(
+                    lhs=ColumnReferenceExpression(name="x"),
+                    rhs=ConstantValueExpression(value=1),
+                ),
+            ),
+            WriteCsv(table="a", file="a_out.csv"),
+        ]
+        self.assertEqual(live_steps(steps), [0, 3])
+
+    def test_join_and_in_place_steps_keep_inputs_alive(self):
+        steps = [
+            ReadCsv(file="a.csv", name="a"),
+            ReadCsv(file="b.csv", name="b"),
+            AddColumns(table="b", columns=[ColumnReferenceExpression(name="x")]),
+            Join(left_table="a", right_table="b", output_table="ab", how="cross"),
+            WriteCsv(table="ab", file="ab.csv"),
+        ]
+        self.assertEqual(live_steps(steps), [0, 1, 2, 3, 4])
+
+    def test_redefined_table_drops_earlier_definition(self):
+        steps = [
+            ReadCsv(file="a.csv", name="t"),
+            ReadCsv(file="b.csv", name="t"),
+            WriteCsv(table="t", file="t.csv"),
+            WriteCsv(table="t", file="t2.csv"),
+        ]
+        self.assertEqual(live_steps(steps), [1, 2, 3])
+        self.assertEqual(required_steps(steps, [2]), [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from ptabler.workflow import PWorkflow
+from ptabler.steps import GlobalSettings, Materialize, TableSpace, WriteCsv
+
+
+class MaterializeTests(unittest.TestCase):
+    def test_materialize_replaces_table_with_ipc_scan(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            global_settings = GlobalSettings(root_folder=Path("."), spill_folder=Path(spill_dir))
+            calls = []
+
+            def count_calls(s: pl.Series) -> pl.Series:
+                calls.append(len(s))
+                return s * 2
+
+            initial_table_space: TableSpace = {
+                "data": pl.LazyFrame({"id": [1, 2, 3]}).with_columns(
+                    pl.col("id").map_batches(count_calls, return_dtype=pl.Int64).alias("doubled")
+                )
+            }
+            workflow = PWorkflow(workflow=[Materialize(table="data")])
+
+            ctx = workflow.execute(
+                global_settings=global_settings,
+                lazy=True,
+                initial_table_space=initial_table_space,
+            )
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(len(os.listdir(spill_dir)), 1)
+
+            expected = pl.DataFrame({"id": [1, 2, 3], "doubled": [2, 4, 6]})
+            lf = ctx.get_table("data")
+            assert_frame_equal(lf.collect(), expected)
+            assert_frame_equal(lf.filter(pl.col("id") > 1).collect(), expected.slice(1))
+            self.assertEqual(len(calls), 1)
+
+            for task in ctx.cleanup_tasks():
+                task()
+            self.assertEqual(os.listdir(spill_dir), [])
+
+    def test_spill_file_is_removed_when_a_sink_fails(self):
+        with tempfile.TemporaryDirectory() as root:
+            spill_dir = Path(root) / "spill"
+            spill_dir.mkdir()
+            (Path(root) / "blocked.csv").mkdir()
+            workflow = PWorkflow(workflow=[Materialize(table="data"), WriteCsv(table="data", file="blocked.csv")])
+            with self.assertRaises(IsADirectoryError):
+                workflow.execute(
+                    global_settings=GlobalSettings(root_folder=Path(root), spill_folder=spill_dir),
+                    initial_table_space={"data": pl.LazyFrame({"id": [1, 2, 3]})},
+                )
+            self.assertEqual(os.listdir(spill_dir), [])
+
+    def test_table_name_with_path_separators(self):
+        with tempfile.TemporaryDirectory() as root:
+            workflow = PWorkflow(workflow=[
+                Materialize(table="data/raw"),
+                WriteCsv(table="data/raw", file="out.csv"),
+            ])
+            workflow.execute(
+                global_settings=GlobalSettings(root_folder=Path(root)),
+                initial_table_space={"data/raw": pl.LazyFrame({"id": [1, 2, 3]})},
+            )
+            assert_frame_equal(pl.read_csv(Path(root) / "out.csv"), pl.DataFrame({"id": [1, 2, 3]}))
+
+
+if __name__ == '__main__':
+    unittest.main()
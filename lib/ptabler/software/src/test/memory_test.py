@@ -0,0 +1,68 @@
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import msgspec
+import polars as pl
+
+from ptabler.steps import GlobalSettings, ReadCsv
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping, WriteFrame
+from ptabler.workflow import MemoryProfile, MemoryReport, PWorkflow
+from ptabler.workflow.memory import current_rss, max_rss
+
+
+class MemoryProfileTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        pl.DataFrame({"id": range(1000), "value": [1.5] * 1000}).write_csv(self.root / "input.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_records_peaks_per_phase(self):
+        ptw = PWorkflow(workflow=[
+            ReadCsv(file="input.csv", name="input"),
+            WriteFrame(
+                input_table="input",
+                frame_name="frame",
+                axes=[AxisMapping(column="id", type="Long")],
+                columns=[ColumnMapping(column="value", type="Double")],
+            ),
+        ])
+        spill_folder = self.root / "spill"
+        settings = GlobalSettings(root_folder=self.root, spill_folder=spill_folder)
+        memory = MemoryProfile(spill_folder, interval_seconds=0.01)
+        try:
+            ptw.execute(global_settings=settings, tracer=memory)
+        finally:
+            memory.close()
+        report_file = self.root / "memory.json"
+        memory.write(report_file)
+        report = msgspec.json.decode(report_file.read_bytes(), type=MemoryReport)
+
+        phases = {(p.kind, p.name): p for p in report.phases}
+        self.assertIn(("collect", "1 sinks"), phases)
+        # The sorted file is complete when the sort ends, next to the unsorted one
+        self.assertGreater(phases[("duckdb_sort", "frame")].peak_intermediate_bytes, 0)
+        self.assertEqual(phases[("step", "#0 read_csv")].peak_intermediate_bytes, 0)
+        self.assertEqual(report.peak_intermediate_bytes, max(p.peak_intermediate_bytes for p in report.phases))
+        self.assertEqual(report.peak_spill_bytes, 0)
+        self.assertGreater(report.max_rss_bytes, 0)
+        if sys.platform.startswith("linux"):
+            self.assertGreater(report.peak_rss_bytes, 0)
+            for phase in report.phases:
+                self.assertGreaterEqual(phase.peak_rss_bytes, phase.start_rss_bytes)
+
+    def test_rss(self):
+        self.assertGreater(max_rss(), 0)
+        rss = current_rss()
+        if sys.platform.startswith("linux"):
+            self.assertIsNotNone(rss)
+            # The peak is updated lazily by the kernel and may briefly lag behind
+            self.assertGreater(rss, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import shutil
+import unittest
+
+import msgspec.json
+import polars as pl
+
+from ptabler.steps import GlobalSettings, ReadCsv, WriteCsv
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping, WriteFrame
+from ptabler.workflow import ExecutionProfile, PWorkflow, ProfileReport
+
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+test_data_root_dir = os.path.join(
+    os.path.dirname(os.path.dirname(current_script_dir)),
+    "test_data",
+)
+global_settings = GlobalSettings(root_folder=test_data_root_dir)
+
+
+class ProfileTests(unittest.TestCase):
+
+    def test_profile_records_steps_collect_and_tasks(self):
+        output_file = os.path.join(test_data_root_dir, "outputs", "profile_test.csv")
+        frame_dir = os.path.join(test_data_root_dir, "profile_test_frame")
+        report_file = os.path.join(test_data_root_dir, "outputs", "profile_test.json")
+        ptw = PWorkflow(workflow=[
+            ReadCsv(file="test_data_1.tsv", name="input", delimiter="\t"),
+            WriteCsv(table="input", file="outputs/profile_test.csv"),
+            WriteFrame(
+                input_table="input",
+                frame_name="profile_test_frame",
+                axes=[AxisMapping(column="id", type="Long")],
+                columns=[ColumnMapping(column="value1", type="Double")],
+            ),
+        ])
+        profile = ExecutionProfile()
+
+        try:
+            ptw.execute(global_settings=global_settings, tracer=profile)
+            profile.write(report_file)
+
+            with open(report_file, "rb") as f:
+                report = msgspec.json.decode(f.read(), type=ProfileReport)
+            spans = [(s.kind, s.name) for s in report.spans]
+            self.assertEqual(
+                spans,
+                [
+                    ("step", "#0 read_csv"),
+                    ("step", "#1 write_csv"),
+                    ("step", "#2 write_frame"),
+                    ("setup", "write_frame:profile_test_frame:mkdir"),
+                    ("collect", "2 sinks"),
+                    ("duckdb_sort", "profile_test_frame"),
+                    ("convert", "profile_test_frame"),
+                    ("task", "write_frame:profile_test_frame"),
+                ],
+            )
+            self.assertFalse(any(s.failed for s in report.spans))
+            self.assertGreaterEqual(report.total_seconds, report.spans[-1].elapsed_seconds)
+        finally:
+            for path in (output_file, report_file):
+                if os.path.exists(path):
+                    os.remove(path)
+            if os.path.exists(frame_dir):
+                shutil.rmtree(frame_dir)
+
+    def test_profile_marks_failed_span(self):
+        ptw = PWorkflow(workflow=[
+            WriteCsv(table="missing", file="outputs/never_written.csv"),
+        ])
+        profile = ExecutionProfile()
+
+        with self.assertRaises(ValueError):
+            ptw.execute(
+                global_settings=global_settings,
+                initial_table_space={"input": pl.LazyFrame({"a": [1]})},
+                tracer=profile,
+            )
+        report = profile.report()
+        self.assertEqual(len(report.spans), 1)
+        self.assertTrue(report.spans[0].failed)
+
+
+if __name__ == '__main__':
+    unittest.main()
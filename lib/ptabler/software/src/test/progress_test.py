@@ -0,0 +1,73 @@
+import io
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import msgspec
+import polars as pl
+
+from ptabler.steps import GlobalSettings, MultiTracer, ReadCsv, WriteCsv, WriteParquet
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping, WriteFrame
+from ptabler.workflow import ExecutionProfile, ProgressEvent, ProgressReporter, PWorkflow
+from ptabler.workflow.progress import _SinkOutput
+
+
+class ProgressTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        pl.DataFrame({
+            "id": range(1000),
+            "value": [1.5] * 1000,
+            "text": ["multi\nline" if i % 10 == 0 else "plain" for i in range(1000)],
+        }).write_csv(self.root / "input.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_reports_phases_and_sink_progress(self):
+        ptw = PWorkflow(workflow=[
+            ReadCsv(file="input.csv", name="input"),
+            WriteCsv(table="input", file="output.csv"),
+            WriteParquet(table="input", file="output.parquet"),
+            WriteFrame(
+                input_table="input",
+                frame_name="frame",
+                axes=[AxisMapping(column="id", type="Long")],
+                columns=[ColumnMapping(column="value", type="Double")],
+            ),
+        ])
+        output = io.StringIO()
+        progress = ProgressReporter(output, interval_seconds=0.01)
+        profile = ExecutionProfile()
+        try:
+            ptw.execute(global_settings=GlobalSettings(root_folder=self.root), tracer=MultiTracer(progress, profile))
+        finally:
+            progress.close()
+
+        events = [msgspec.json.decode(line, type=ProgressEvent) for line in output.getvalue().splitlines()]
+        phases = [(e.event, e.kind, e.name) for e in events if e.event != "progress"]
+        for phase in [("start", "collect", "3 sinks"), ("end", "duckdb_sort", "frame"), ("end", "convert", "frame")]:
+            self.assertIn(phase, phases)
+        self.assertEqual(len(phases), 2 * len(profile.report().spans))
+
+        last_progress = {e.name: e for e in events if e.event == "progress"}
+        self.assertEqual(last_progress["write_csv:output.csv"].rows, 1000)
+        self.assertEqual(last_progress["write_csv:output.csv"].bytes, (self.root / "output.csv").stat().st_size)
+        self.assertEqual(last_progress["write_parquet:output.parquet"].rows, 1000)
+        self.assertGreater(last_progress["write_frame:frame"].bytes, 0)
+
+    def test_quoted_newlines_are_not_rows(self):
+        path = self.root / "growing.csv"
+        sink = _SinkOutput("write_csv:growing.csv", [str(path)])
+        path.write_bytes(b'id,text\n1,"multi\n')
+        sink.count_new_lines()
+        self.assertEqual(sink.rows, 0)
+        with open(path, "ab") as f:
+            f.write(b'line"\n2,plain\n')
+        sink.count_new_lines()
+        self.assertEqual(sink.rows, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
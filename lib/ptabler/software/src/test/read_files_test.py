@@ -0,0 +1,158 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import polars as pl
+import pyarrow as pa
+from polars.testing import assert_frame_equal
+
+from ptabler.steps import ColumnSchema, GlobalSettings, ReadCsv, ReadNdjson, ReadParquet
+from ptabler.steps.compressed import scan_blocks
+from ptabler.workflow import PWorkflow
+
+
+class ReadFilesTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.settings = GlobalSettings(root_folder=self.root)
+        for year in (2021, 2022):
+            for source in ("a", "b"):
+                directory = self.root / "data" / f"year={year}" / f"source={source}"
+                directory.mkdir(parents=True)
+                df = pl.DataFrame({"id": [year * 10 + (source == "b")], "value": [1.5]})
+                df.write_csv(directory / "part.csv")
+                df.write_ndjson(directory / "part.ndjson")
+                df.write_parquet(directory / "part.parquet")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def read(self, step, settings: GlobalSettings | None = None) -> pl.DataFrame:
+        ctx = PWorkflow(workflow=[step]).execute(global_settings=settings or self.settings, lazy=True)
+        return ctx.get_table(step.name).collect().sort("id")
+
+    def test_glob(self):
+        for step in (
+            ReadCsv(file="data/**/*.csv", name="t"),
+            ReadNdjson(file="data/**/*.ndjson", name="t"),
+            ReadParquet(file="data/**/*.parquet", name="t"),
+        ):
+            with self.subTest(step=type(step).__name__):
+                self.assertEqual(self.read(step)["id"].to_list(), [20210, 20211, 20220, 20221])
+
+    def test_list_of_files(self):
+        step = ReadCsv(file=["data/year=2021/source=b/part.csv", "data/year=2022/source=a/part.csv"], name="t")
+        self.assertEqual(self.read(step)["id"].to_list(), [20211, 20220])
+        self.assertEqual(
+            step.input_paths(self.settings),
+            [str(self.root / "data/year=2021/source=b/part.csv"), str(self.root / "data/year=2022/source=a/part.csv")],
+        )
+
+    def test_glob_input_paths_are_expanded(self):
+        step = ReadParquet(file="data/*/source=a/*.parquet", name="t")
+        self.assertEqual(
+            step.input_paths(self.settings),
+            [str(self.root / f"data/year={year}/source=a/part.parquet") for year in (2021, 2022)],
+        )
+
+    def test_hive_partitioning(self):
+        expected = pl.DataFrame({
+            "id": [20210, 20211, 20220, 20221],
+            "value": [1.5] * 4,
+            "year": [2021, 2021, 2022, 2022],
+            "source": ["a", "b", "a", "b"],
+        }, schema_overrides={"year": pl.Int32})
+        schema = [ColumnSchema(column="year", type="Int")]
+        for step in (
+            ReadCsv(file="data/**/*.csv", name="t", hive_partitioning=True, schema=schema),
+            ReadNdjson(file="data/**/*.ndjson", name="t", hive_partitioning=True, schema=schema),
+            ReadParquet(file="data/**/*.parquet", name="t", hive_partitioning=True, schema=schema),
+        ):
+            with self.subTest(step=type(step).__name__):
+                assert_frame_equal(self.read(step), expected)
+
+    def test_hive_partitioning_ignores_directories_above_the_dataset(self):
+        root = self.root / "x=1"
+        shutil.copytree(self.root / "data", root / "data")
+        settings = GlobalSettings(root_folder=root)
+        for step in (
+            ReadCsv(file="data/**/*.csv", name="t", hive_partitioning=True),
+            ReadCsv(file="data/year=*/source=a/part.csv", name="t", hive_partitioning=True),
+            ReadCsv(file=["data/year=2021/source=b/part.csv", "data/year=2022/source=a/part.csv"], name="t", hive_partitioning=True),
+            ReadNdjson(file="data/**/*.ndjson", name="t", hive_partitioning=True),
+            ReadParquet(file="data/**/*.parquet", name="t", hive_partitioning=True),
+        ):
+            with self.subTest(file=step.file, step=type(step).__name__):
+                self.assertEqual(self.read(step, settings).columns, ["id", "value", "year", "source"])
+
+    def test_hive_columns_of_text_files_default_to_strings(self):
+        df = self.read(ReadCsv(file="data/**/*.csv", name="t", hive_partitioning=True))
+        self.assertEqual(df.schema["year"], pl.String)
+        self.assertEqual(df["year"].to_list(), ["2021", "2021", "2022", "2022"])
+
+
+    def test_columns(self):
+        for step in (
+            ReadCsv(file="data/**/*.csv", name="t", columns=["id"]),
+            ReadNdjson(file="data/**/*.ndjson", name="t", columns=["id"]),
+            ReadParquet(file="data/**/*.parquet", name="t", columns=["id", "year"], hive_partitioning=True),
+        ):
+            with self.subTest(step=type(step).__name__):
+                df = self.read(step)
+                self.assertEqual(df.columns, step.columns)
+                self.assertEqual(df["id"].to_list(), [20210, 20211, 20220, 20221])
+
+    def test_columns_are_pushed_into_the_scan(self):
+        step = ReadCsv(file="data/year=2021/source=a/part.csv", name="t", columns=["value"])
+        ctx = PWorkflow(workflow=[step]).execute(global_settings=self.settings, lazy=True)
+        self.assertIn("PROJECT 1/2 COLUMNS", ctx.get_table("t").explain())
+
+    def compress(self, path: Path, compression: str, suffix: str) -> None:
+        with pa.output_stream(str(path) + suffix, compression=compression) as f:
+            f.write(path.read_bytes())
+
+    def test_compressed_text_files(self):
+        for path in self.root.glob("data/**/part.*"):
+            self.compress(path, "gzip", ".gz")
+            self.compress(path, "zstd", ".zst")
+        for step in (
+            ReadCsv(file="data/**/*.csv.gz", name="t"),
+            ReadCsv(file="data/**/*.csv.zst", name="t", schema=[ColumnSchema(column="value", type="String")]),
+            ReadNdjson(file="data/**/*.ndjson.gz", name="t"),
+            ReadNdjson(file="data/**/*.ndjson.zst", name="t", hive_partitioning=True),
+            ReadCsv(file="data/**/*.csv.gz", name="t", columns=["value", "id"]),
+        ):
+            with self.subTest(file=step.file):
+                df = self.read(step)
+                self.assertEqual(df["id"].to_list(), [20210, 20211, 20220, 20221])
+                self.assertEqual(df["value"].to_list(), ["1.5"] * 4 if step.schema else [1.5] * 4)
+                if step.hive_partitioning:
+                    self.assertEqual(df["source"].to_list(), ["a", "b", "a", "b"])
+
+    def test_compressed_tsv_with_n_rows(self):
+        path = self.root / "table.tsv"
+        pl.DataFrame({"id": range(10), "name": [f"n{i}" for i in range(10)]}).write_csv(path, separator="\t")
+        self.compress(path, "gzip", ".gz")
+        df = self.read(ReadCsv(file="table.tsv.gz", name="t", delimiter="\t", n_rows=4, columns=["name", "id"]))
+        self.assertEqual(df.columns, ["name", "id"])
+        self.assertEqual(df["name"].to_list(), ["n0", "n1", "n2", "n3"])
+
+    def test_blocks_split_at_records(self):
+        path = self.root / "quoted.csv"
+        expected = pl.DataFrame({"id": range(50), "text": ['a "quoted"\nline' if i % 3 else "b" for i in range(50)]})
+        expected.write_csv(path)
+        self.compress(path, "zstd", ".zst")
+
+        def parse(block, first, schema, columns):
+            if schema is None:
+                return pl.read_csv(block)
+            return pl.read_csv(block, has_header=first, schema=schema)
+
+        lf = scan_blocks([str(path) + ".zst"], parse, quote=b'"', block_size=16)
+        assert_frame_equal(lf.collect(), expected)
+        assert_frame_equal(lf.filter(pl.col("id") >= 45).select("text").collect(), expected.tail(5).select("text"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 from pathlib import Path
 from msgspec.json import encode
+import dataclasses
 import unittest
 import os
 import shutil
@@ -58,7 +59,8 @@ class ReadFrameTests(unittest.TestCase):
         df: pl.DataFrame, 
         axes: list[AxisSpec], 
         columns: list[PColumnSpec],
-        partition_key_length: int = 0
+        partition_key_length: int = 0,
+        settings: GlobalSettings = global_settings,
     ) -> None:
         """
         Helper function to write a test PFrame.
@@ -68,6 +70,7 @@ class ReadFrameTests(unittest.TestCase):
             axes: List of axis specifications
             columns: List of column specifications
             partition_key_length: Number of axes to use for partitioning (default: 0)
+            settings: Settings to execute the write with
         """
         write_step = WriteFrame(
             input_table="input_data",
@@ -84,7 +87,7 @@ class ReadFrameTests(unittest.TestCase):
         
         initial_table_space: TableSpace = {"input_data": df.lazy()}
         write_workflow.execute(
-            global_settings=global_settings,
+            global_settings=settings,
             initial_table_space=initial_table_space
         )
         
@@ -95,6 +98,15 @@ class ReadFrameTests(unittest.TestCase):
                 f.write(spec_json)
 
     def test_frame_roundtrip(self):
+        self.check_frame_roundtrip(global_settings)
+
+    def test_frame_roundtrip_under_memory_limit(self):
+        self.check_frame_roundtrip(dataclasses.replace(global_settings, memory_limit=64 * 1024 * 1024))
+
+    def test_frame_roundtrip_single_threaded(self):
+        self.check_frame_roundtrip(dataclasses.replace(global_settings, threads=1))
+
+    def check_frame_roundtrip(self, settings: GlobalSettings):
         original_df = pl.DataFrame({
             "id": [1, 2, 3, 4, 5],
             "category": ["A", "B", None, "C", "B"],
@@ -113,7 +125,7 @@ class ReadFrameTests(unittest.TestCase):
         columns = [
             PColumnSpec(name="value", value_type=ColumnType.Double, axes_spec=axes)
         ]
-        self.write_frame(original_df, axes, columns)
+        self.write_frame(original_df, axes, columns, settings=settings)
         
         read_step = ReadFrame(
             name="written_data",
@@ -129,7 +141,7 @@ class ReadFrameTests(unittest.TestCase):
         )
         read_workflow = PWorkflow(workflow=[read_step])
         
-        read_ctx = read_workflow.execute(global_settings=global_settings, lazy=True)
+        read_ctx = read_workflow.execute(global_settings=settings, lazy=True)
         final_lf = read_ctx.get_table("written_data")
         
         actual_df = final_lf.select([
@@ -137,8 +149,7 @@ class ReadFrameTests(unittest.TestCase):
             *[pl.col(column.name) for column in columns]
         ]).collect()
         
-        _, _, chained_tasks = read_ctx.into_parts()
-        for task in chained_tasks:
+        for task in read_ctx.cleanup_tasks():
             task()
         
         all_column_refs = [axis.name for axis in axes] + [column.name for column in columns]
@@ -156,7 +167,7 @@ class ReadFrameTests(unittest.TestCase):
         workflow = PWorkflow(workflow=[read_step])
 
         with self.assertRaises(ValueError) as cm:
-            workflow.execute(global_settings=global_settings)
+            workflow.execute(global_settings=global_settings, lazy=True)
         self.assertIn("is not an existing directory", str(cm.exception))
 
     def test_not_defined_frame_folder_error(self):
@@ -172,9 +183,23 @@ class ReadFrameTests(unittest.TestCase):
                 root_folder=Path(test_data_root_dir),
                 frame_folder=None,
                 spill_folder=None,
-            ))
+            ), lazy=True)
         self.assertIn("Frame folder is not set", str(cm.exception))
 
+    def test_unused_read_frame_is_skipped(self):
+        read_step = ReadFrame(
+            name="test",
+            request=PTableDefV2(query=SpecQueryColumn(column="value")),
+            translation={}
+        )
+        workflow = PWorkflow(workflow=[read_step])
+
+        workflow.execute(global_settings=GlobalSettings(
+            root_folder=Path(test_data_root_dir),
+            frame_folder=None,
+            spill_folder=None,
+        ))
+
     def test_xsv_export_workflow(self):
         original_df = pl.DataFrame({
             "clonotypeKey": ["clono1", "clono1", "clono2", "clono2", "clono3", "clono1"],
@@ -268,8 +293,7 @@ class ReadFrameTests(unittest.TestCase):
             result_lf = ctx.get_table("anonymous_4")
             result_df = result_lf.collect()
             
-            _, _, chained_tasks = ctx.into_parts()
-            for task in chained_tasks:
+            for task in ctx.cleanup_tasks():
                 task()
             
             return result_df
@@ -418,8 +442,7 @@ class ReadFrameTests(unittest.TestCase):
             result_lf = ctx.get_table("anonymous_4")
             result_df = result_lf.collect()
             
-            _, _, chained_tasks = ctx.into_parts()
-            for task in chained_tasks:
+            for task in ctx.cleanup_tasks():
                 task()
             
             assert_frame_equal(
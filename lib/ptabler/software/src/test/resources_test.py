@@ -0,0 +1,40 @@
+import os
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ptabler.steps import GlobalSettings
+from ptabler.workflow.resources import configure_streaming_engine, parse_byte_size, streaming_morsel_rows
+
+
+class ResourcesTests(unittest.TestCase):
+    def test_parse_byte_size(self):
+        self.assertEqual(parse_byte_size("1073741824"), 1024**3)
+        self.assertEqual(parse_byte_size("4GB"), 4 * 1000**3)
+        self.assertEqual(parse_byte_size("512MiB"), 512 * 1024**2)
+        self.assertEqual(parse_byte_size("1.5 g"), 1_500_000_000)
+        for invalid in ["", "GB", "4XB", "-1GB", "0"]:
+            with self.subTest(invalid=invalid), self.assertRaises(ValueError):
+                parse_byte_size(invalid)
+
+    def test_streaming_morsel_rows_is_bounded(self):
+        self.assertEqual(streaming_morsel_rows(1024**4, 8), 100_000)
+        self.assertEqual(streaming_morsel_rows(1024**2, 8), 1_000)
+        self.assertEqual(streaming_morsel_rows(1024**3, 16), 16_384)
+
+    def test_configure_streaming_engine(self):
+        settings = GlobalSettings(root_folder=Path("."), memory_limit=1024**3)
+        with mock.patch.dict(os.environ, clear=True):
+            configure_streaming_engine(GlobalSettings(root_folder=Path(".")))
+            self.assertNotIn("POLARS_IDEAL_MORSEL_SIZE", os.environ)
+
+            configure_streaming_engine(settings)
+            self.assertIn("POLARS_IDEAL_MORSEL_SIZE", os.environ)
+
+        with mock.patch.dict(os.environ, {"POLARS_IDEAL_MORSEL_SIZE": "42"}):
+            configure_streaming_engine(settings)
+            self.assertEqual(os.environ["POLARS_IDEAL_MORSEL_SIZE"], "42")
+
+
+if __name__ == "__main__":
+    unittest.main()
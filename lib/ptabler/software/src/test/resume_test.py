@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from ptabler.steps import GlobalSettings, ReadCsv
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping, WriteFrame
+from ptabler.workflow import ExecutionProfile, PWorkflow
+
+
+class ResumeTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.settings = GlobalSettings(root_folder=self.root, resume=True)
+        pl.DataFrame({"id": [3, 1, 2], "value": [30.0, 10.0, 20.0]}).write_csv(self.root / "input.csv")
+        self.step = WriteFrame(
+            input_table="input",
+            frame_name="frame",
+            axes=[AxisMapping(column="id", type="Long")],
+            columns=[ColumnMapping(column="value", type="Double")],
+        )
+        self.workflow = PWorkflow(workflow=[ReadCsv(file="input.csv", name="input"), self.step])
+        self.frame_dir = self.root / "frame"
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def run_workflow(self, settings: GlobalSettings) -> list[tuple[str, str]]:
+        profile = ExecutionProfile()
+        self.workflow.execute(global_settings=settings, tracer=profile)
+        return [(s.kind, s.name) for s in profile.report().spans]
+
+    def assert_frame_complete(self):
+        self.assertEqual(self.step.resume_stage(str(self.frame_dir)), "converted")
+        assert_frame_equal(
+            pl.read_parquet(self.frame_dir / "partition_0.parquet").select("id", "value"),
+            pl.DataFrame({"id": [1, 2, 3], "value": [10.0, 20.0, 30.0]}),
+        )
+
+    def test_complete_frame_is_kept(self):
+        self.run_workflow(GlobalSettings(root_folder=self.root))
+        os.remove(self.root / "input.csv")
+
+        spans = self.run_workflow(self.settings)
+
+        self.assertEqual([kind for kind, _ in spans], ["step"])
+        self.assert_frame_complete()
+
+    def test_failed_sort_resumes_from_unsorted_parquet(self):
+        with mock.patch.object(WriteFrame, "_sort", side_effect=OSError("no space left on device")):
+            with self.assertRaises(OSError):
+                self.run_workflow(self.settings)
+        self.assertEqual(self.step.resume_stage(str(self.frame_dir)), "written")
+        os.remove(self.root / "input.csv")
+
+        spans = self.run_workflow(self.settings)
+
+        self.assertIn(("duckdb_sort", "frame"), spans)
+        self.assertNotIn("collect", [kind for kind, _ in spans])
+        self.assert_frame_complete()
+
+    def test_failed_convert_resumes_from_intermediate_parquet(self):
+        with mock.patch("ptabler.steps.write_frame.convert", side_effect=RuntimeError("convert failed")):
+            with self.assertRaises(RuntimeError):
+                self.run_workflow(self.settings)
+        self.assertEqual(self.step.resume_stage(str(self.frame_dir)), "sorted")
+
+        spans = self.run_workflow(self.settings)
+
+        self.assertIn(("convert", "frame"), spans)
+        self.assertNotIn(("duckdb_sort", "frame"), spans)
+        self.assert_frame_complete()
+
+    def test_failure_without_resume_removes_work_files(self):
+        for target, error in (("_sort", OSError), ("_convert", RuntimeError)):
+            with self.subTest(failing=target):
+                shutil.rmtree(self.frame_dir, ignore_errors=True)
+                with mock.patch.object(WriteFrame, target, side_effect=error("failed")):
+                    with self.assertRaises(error):
+                        self.run_workflow(GlobalSettings(root_folder=self.root))
+                self.assertEqual(list(self.frame_dir.iterdir()), [])
+
+    def test_unusable_partial_frame_is_rewritten(self):
+        self.frame_dir.mkdir()
+        (self.frame_dir / "unsorted.parquet").write_bytes(b"PAR1 truncated")
+
+        with self.assertRaises(FileExistsError):
+            self.run_workflow(GlobalSettings(root_folder=self.root))
+
+        self.run_workflow(self.settings)
+        self.assert_frame_complete()
+
+
+if __name__ == "__main__":
+    unittest.main()
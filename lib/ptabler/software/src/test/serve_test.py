@@ -0,0 +1,118 @@
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import msgspec
+import polars as pl
+
+from ptabler.steps import GlobalSettings
+from ptabler.workflow import PWorkflow
+from ptabler.workflow.serve import ServeReply, serve_stream
+
+
+MAIN_SCRIPT = Path(__file__).resolve().parent.parent / "main.py"
+
+
+class _Panic(BaseException):
+    """Stands in for pyo3's PanicException, which does not derive from Exception."""
+
+
+class ServeTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.defaults = GlobalSettings(root_folder=self.root)
+        pl.DataFrame({"id": [1, 2], "value": [10.0, 20.0]}).write_csv(self.root / "input.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def request(self, request_id: str, output_file: str, root_dir: Path | None = None) -> bytes:
+        return msgspec.json.encode({
+            "id": request_id,
+            "rootDir": str(root_dir or self.root),
+            "workflow": {"workflow": [
+                {"type": "read_csv", "file": "input.csv", "name": "input"},
+                {"type": "write_csv", "table": "input", "file": output_file},
+            ]},
+        })
+
+    def serve(self, *lines: bytes) -> list[ServeReply]:
+        replies = io.BytesIO()
+        serve_stream(io.BytesIO(b"\n".join(lines) + b"\n"), replies, self.defaults)
+        return [msgspec.json.decode(line, type=ServeReply) for line in replies.getvalue().splitlines()]
+
+    def test_executes_requests_in_order(self):
+        replies = self.serve(self.request("a", "a.csv"), b"", self.request("b", "b.csv"))
+
+        self.assertEqual([(r.id, r.status) for r in replies], [("a", "ok"), ("b", "ok")])
+        self.assertEqual(pl.read_csv(self.root / "a.csv").height, 2)
+        self.assertEqual(pl.read_csv(self.root / "b.csv").height, 2)
+
+    def test_failures_do_not_stop_the_server(self):
+        replies = self.serve(
+            b"not json",
+            self.request("missing_root", "x.csv", root_dir=self.root / "missing"),
+            self.request("ok", "ok.csv"),
+        )
+
+        self.assertEqual([r.status for r in replies], ["error", "error", "ok"])
+        self.assertIsNone(replies[0].id)
+        self.assertIn("Invalid request", replies[0].error)
+        self.assertEqual(replies[1].id, "missing_root")
+        self.assertIn("Root directory not found", replies[1].error)
+        self.assertTrue((self.root / "ok.csv").exists())
+
+    def test_panics_do_not_stop_the_server(self):
+        execute = PWorkflow.execute
+
+        def panic_once(workflow, **kwargs):
+            if not (self.root / "panicked").exists():
+                (self.root / "panicked").touch()
+                raise _Panic("called `Option::unwrap()` on a `None` value")
+            return execute(workflow, **kwargs)
+
+        with mock.patch.object(PWorkflow, "execute", panic_once):
+            replies = self.serve(self.request("panic", "x.csv"), self.request("ok", "ok.csv"))
+
+        self.assertEqual([(r.id, r.status) for r in replies], [("panic", "error"), ("ok", "ok")])
+        self.assertIn("unwrap", replies[0].error)
+        self.assertTrue((self.root / "ok.csv").exists())
+
+    def test_failed_request_disposes_frame_cache(self):
+        (self.root / "blocked.csv").mkdir()
+        cache = mock.Mock()
+        request = msgspec.json.encode({
+            "id": "read_frame",
+            "rootDir": str(self.root),
+            "frameDir": str(self.root),
+            "workflow": {"workflow": [
+                {"type": "read_frame", "name": "frame", "request": {"query": {"type": "column", "column": "value"}},
+                 "translation": {}},
+                {"type": "write_csv", "table": "frame", "file": "blocked.csv"},
+            ]},
+        })
+
+        with mock.patch("polars_pf.pframe_source", return_value=(pl.LazyFrame({"value": [1.0]}), cache)):
+            replies = self.serve(request)
+
+        self.assertEqual([r.status for r in replies], ["error"])
+        cache.dispose.assert_called_once_with()
+
+    def test_per_run_options_are_rejected(self):
+        result = subprocess.run(
+            [sys.executable, str(MAIN_SCRIPT), "--serve", "--summary", str(self.root / "summary.json")],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("--summary cannot be used with --serve", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
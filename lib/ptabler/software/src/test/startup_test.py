@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+# Extensions that slow down interpreter startup and are only imported by the
+# expressions and steps that need them.
+LAZY_EXTENSIONS = ["duckdb", "polars_ds", "polars_hash"]
+
+_SCRIPT = """
+import json, sys
+from ptabler.steps import GlobalSettings
+from ptabler.workflow import PWorkflow
+import msgspec
+workflow = msgspec.json.decode(sys.argv[2], type=PWorkflow)
+workflow.execute(global_settings=GlobalSettings(root_folder=sys.argv[1]))
+print(json.dumps({
+    "loaded": sorted(name for name in %r if name in sys.modules),
+}))
+""" % (LAZY_EXTENSIONS,)
+
+
+def run_in_fresh_interpreter(root: str, workflow: list) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT, root, json.dumps({"workflow": workflow})],
+        cwd=SRC_DIR,
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class StartupTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        Path(self.root.name, "input.csv").write_text("id,name\n1,a\n2,b\n")
+
+    def tearDown(self):
+        self.root.cleanup()
+
+    def test_plain_csv_workflow_does_not_load_extensions(self):
+        report = run_in_fresh_interpreter(self.root.name, [
+            {"type": "read_csv", "file": "input.csv", "name": "input"},
+            {"type": "filter", "inputTable": "input", "outputTable": "filtered",
+             "condition": {"type": "gt", "lhs": {"type": "col", "name": "id"}, "rhs": {"type": "const", "value": 1}}},
+            {"type": "write_csv", "table": "filtered", "file": "output.csv"},
+        ])
+        self.assertEqual(report["loaded"], [])
+
+    def test_extensions_are_loaded_on_first_use(self):
+        report = run_in_fresh_interpreter(self.root.name, [
+            {"type": "read_csv", "file": "input.csv", "name": "input"},
+            {"type": "add_columns", "table": "input", "columns": [
+                {"type": "alias", "name": "hash", "value": {"type": "hash", "hashType": "sha256", "encoding": "hex",
+                                                            "value": {"type": "col", "name": "name"}}},
+            ]},
+            {"type": "write_csv", "table": "input", "file": "output.csv"},
+        ])
+        self.assertEqual(report["loaded"], ["polars_hash"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import dataclasses
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import msgspec
+import polars as pl
+
+from ptabler.steps import GlobalSettings, ReadCsv, WriteCsv, WriteNdjson, WriteParquet
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping, WriteFrame
+from ptabler.workflow import ExecutionSummary, PWorkflow, SummaryReport
+
+
+class SummaryTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        pl.DataFrame({
+            "id": range(100),
+            "key": [i % 3 for i in range(100)],
+            "value": [1.5] * 100,
+            "text": ["multi\nline" if i == 7 else "plain" for i in range(100)],
+        }).write_csv(self.root / "input.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_summarizes_every_sink(self):
+        ptw = PWorkflow(workflow=[
+            ReadCsv(file="input.csv", name="input"),
+            WriteCsv(table="input", file="output.csv"),
+            WriteNdjson(table="input", file="output.ndjson"),
+            WriteParquet(table="input", file="output.parquet"),
+            WriteFrame(
+                input_table="input",
+                frame_name="frame",
+                axes=[AxisMapping(column="key", type="Long"), AxisMapping(column="id", type="Long")],
+                columns=[ColumnMapping(column="value", type="Double"), ColumnMapping(column="text", type="String")],
+                partition_key_length=1,
+            ),
+        ])
+        settings = GlobalSettings(root_folder=self.root)
+
+        for pipeline_sinks in (False, True):
+            with self.subTest(pipeline_sinks=pipeline_sinks):
+                shutil.rmtree(self.root / "frame", ignore_errors=True)
+                summary = ExecutionSummary()
+                ptw.execute(global_settings=dataclasses.replace(settings, pipeline_sinks=pipeline_sinks), tracer=summary)
+                summary.write(self.root / "summary.json")
+                report = msgspec.json.decode((self.root / "summary.json").read_bytes(), type=SummaryReport)
+
+                self.assertEqual(
+                    [sink.type for sink in report.sinks],
+                    ["write_csv", "write_ndjson", "write_parquet", "write_frame"],
+                )
+                for sink in report.sinks:
+                    self.assertEqual(sink.rows, 100, sink.label)
+                    self.assertEqual(sink.bytes, sum(
+                        f.stat().st_size for path in map(Path, sink.paths)
+                        for f in ([path] if path.is_file() else path.iterdir())
+                    ))
+                    self.assertGreaterEqual(sink.elapsed_seconds, 0)
+
+                frame_sink = report.sinks[-1]
+                self.assertEqual(frame_sink.frame.partition_key_length, 1)
+                self.assertEqual(frame_sink.frame.columns, 2)
+                self.assertEqual(
+                    {key: (p.parts, p.rows) for key, p in frame_sink.frame.partitions.items()},
+                    {"[0]": (2, 34), "[1]": (2, 33), "[2]": (2, 33)},
+                )
+                # The frame is complete only after its sort and conversion
+                self.assertGreaterEqual(frame_sink.elapsed_seconds, report.sinks[0].elapsed_seconds)
+
+    def test_failed_sinks_are_not_summarized(self):
+        (self.root / "blocked.parquet").mkdir()
+        ptw = PWorkflow(workflow=[
+            ReadCsv(file="input.csv", name="input"),
+            WriteCsv(table="input", file="output.csv"),
+            WriteParquet(table="input", file="blocked.parquet"),
+        ])
+        summary = ExecutionSummary()
+        with self.assertRaises(Exception):
+            ptw.execute(global_settings=GlobalSettings(root_folder=self.root), tracer=summary)
+        self.assertEqual(summary.report().sinks, [])
+
+    def test_rows_are_counted_during_the_run(self):
+        summary = ExecutionSummary()
+        PWorkflow(workflow=[
+            ReadCsv(file="input.csv", name="input"),
+            WriteCsv(table="input", file="output.csv.gz"),
+        ]).execute(global_settings=GlobalSettings(root_folder=self.root), tracer=summary)
+        (self.root / "output.csv.gz").write_bytes(b"")
+        self.assertEqual([sink.rows for sink in summary.report().sinks], [100])
+
+    def test_reused_outputs_are_summarized(self):
+        frame = WriteFrame(
+            input_table="input",
+            frame_name="frame",
+            axes=[AxisMapping(column="id", type="Long")],
+            columns=[ColumnMapping(column="value", type="Double")],
+        )
+        for settings, steps in (
+            (GlobalSettings(root_folder=self.root, cache_folder=self.root / "cache"),
+             [WriteCsv(table="input", file="output.csv.zst"), WriteParquet(table="input", file="output.parquet")]),
+            (GlobalSettings(root_folder=self.root, resume=True), [frame]),
+        ):
+            ptw = PWorkflow(workflow=[ReadCsv(file="input.csv", name="input"), *steps])
+            with self.subTest(steps=[step.sink_label() for step in steps]):
+                ptw.execute(global_settings=settings)
+                summary = ExecutionSummary()
+                ptw.execute(global_settings=settings, tracer=summary)
+
+                sinks = summary.report().sinks
+                self.assertEqual([sink.label for sink in sinks], [step.sink_label() for step in steps])
+                for sink in sinks:
+                    self.assertTrue(sink.reused)
+                    self.assertEqual(sink.rows, 100)
+                    self.assertGreater(sink.bytes, 0)
+                    self.assertEqual(sink.paths, [str(self.root / sink.label.split(":", 1)[1])])
+
+if __name__ == '__main__':
+    unittest.main()
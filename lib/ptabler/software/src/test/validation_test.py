@@ -0,0 +1,69 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import polars as pl
+
+from ptabler.steps import Concatenate, GlobalSettings, WriteCsv
+from ptabler.steps.join import Join
+from ptabler.steps.write_frame import AxisMapping, ColumnMapping, WriteFrame
+from ptabler.workflow import PWorkflow
+
+
+class ValidationTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.settings = GlobalSettings(root_folder=self.root)
+        self.tables = {
+            "left": pl.LazyFrame({"id": [1, 2], "value": [1.0, 2.0]}),
+            "right": pl.LazyFrame({"key": [1, 2], "label": ["a", "b"]}),
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_invalid_join_fails_before_any_output(self):
+        ptw = PWorkflow(workflow=[
+            WriteFrame(
+                input_table="left",
+                frame_name="frame",
+                axes=[AxisMapping(column="id", type="Long")],
+                columns=[ColumnMapping(column="value", type="Double")],
+            ),
+            Join(left_table="left", right_table="right", output_table="joined",
+                 how="inner", left_on=["id"], right_on=["id"]),
+            WriteCsv(table="joined", file="joined.csv"),
+        ])
+
+        with self.assertRaisesRegex(pl.exceptions.ColumnNotFoundError, "Step #1 join produced an invalid table 'joined'"):
+            ptw.execute(global_settings=self.settings, initial_table_space=self.tables)
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_invalid_sink_reports_its_step(self):
+        ptw = PWorkflow(workflow=[
+            Concatenate(input_tables=["left", "right"], output_table="all", columns=["id"]),
+            WriteCsv(table="all", file="all.csv"),
+        ])
+
+        with self.assertRaisesRegex(pl.exceptions.ColumnNotFoundError, "Step #0 concatenate"):
+            ptw.execute(global_settings=self.settings, initial_table_space=self.tables)
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_invalid_write_frame_creates_no_directory(self):
+        ptw = PWorkflow(workflow=[
+            WriteFrame(
+                input_table="left",
+                frame_name="frame",
+                axes=[AxisMapping(column="missing", type="Long")],
+                columns=[ColumnMapping(column="value", type="Double")],
+            ),
+        ])
+
+        with self.assertRaisesRegex(pl.exceptions.ColumnNotFoundError, "sink 'write_frame:frame'"):
+            ptw.execute(global_settings=self.settings, initial_table_space=self.tables)
+        self.assertFalse((self.root / "frame").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import concurrent.futures
+import io
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import msgspec
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from polars.testing import assert_frame_equal
+
+from ptabler.steps import (
+    ColumnSchema,
+    GlobalSettings,
+    ReadCsv,
+    ReadNdjson,
+    ReadParquet,
+    SortingColumn,
+    WriteCsv,
+    WriteNdjson,
+    WriteParquet,
+)
+from ptabler.workflow import ExecutionSummary, ProgressEvent, ProgressReporter, PWorkflow
+
+
+class WriteFilesTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.settings = GlobalSettings(root_folder=self.root)
+        self.input = pl.DataFrame({
+            "id": range(1000),
+            "text": ["multi\nline" if i % 10 == 0 else "plain" for i in range(1000)],
+        })
+        self.input.write_csv(self.root / "input.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, step, tracer=None) -> None:
+        PWorkflow(workflow=[ReadCsv(file="input.csv", name="input"), step]).execute(
+            global_settings=self.settings, tracer=tracer,
+        )
+
+    def decompress(self, path: Path, compression: str) -> bytes:
+        return pa.input_stream(str(path), compression=compression).read()
+
+    def test_compression(self):
+        for step, compression, read in (
+            (WriteCsv(table="input", file="out.csv.gz"), "gzip", pl.read_csv),
+            (WriteCsv(table="input", file="out.tsv", delimiter="\t", compression="zstd", compression_level=19), "zstd",
+             lambda data: pl.read_csv(data, separator="\t")),
+            (WriteNdjson(table="input", file="out.ndjson.zst"), "zstd", pl.read_ndjson),
+        ):
+            with self.subTest(file=step.file):
+                self.write(step)
+                assert_frame_equal(read(self.decompress(self.root / step.file, compression)), self.input)
+
+    def test_shards_by_rows(self):
+        self.write(WriteCsv(table="input", file="shards", max_rows_per_file=300, compression="gzip"))
+        shards = sorted(path.name for path in (self.root / "shards").iterdir())
+        self.assertEqual(shards, [f"part-0000{n}.csv.gz" for n in range(4)])
+        heights = [pl.read_csv(self.decompress(self.root / "shards" / name, "gzip")).height for name in shards]
+        self.assertEqual(heights, [300, 300, 300, 100])
+
+        ctx = PWorkflow(workflow=[ReadCsv(file="shards/*.csv.gz", name="t")]).execute(
+            global_settings=self.settings, lazy=True,
+        )
+        assert_frame_equal(ctx.get_table("t").collect(), self.input)
+
+    def test_shards_by_bytes(self):
+        self.write(WriteNdjson(table="input", file="shards", max_bytes_per_file=4096))
+        shards = sorted((self.root / "shards").iterdir())
+        self.assertGreater(len(shards), 1)
+        for shard in shards:
+            self.assertLessEqual(shard.stat().st_size, 4096)
+            self.assertTrue(shard.read_bytes().endswith(b"}\n"))
+
+        ctx = PWorkflow(workflow=[ReadNdjson(file="shards/*.ndjson", name="t")]).execute(
+            global_settings=self.settings, lazy=True,
+        )
+        assert_frame_equal(ctx.get_table("t").collect(), self.input)
+
+    def test_rewrite_removes_old_shards(self):
+        self.write(WriteNdjson(table="input", file="shards", max_rows_per_file=100))
+        self.write(WriteNdjson(table="input", file="shards", max_rows_per_file=500))
+        self.assertEqual(len(list((self.root / "shards").iterdir())), 2)
+
+    def test_summary_and_progress_of_compressed_shards(self):
+        output = io.StringIO()
+        progress = ProgressReporter(output, interval_seconds=0.01)
+        summary = ExecutionSummary()
+        try:
+            self.write(WriteCsv(table="input", file="shards", max_rows_per_file=400, compression="zstd"), progress)
+        finally:
+            progress.close()
+        PWorkflow(workflow=[ReadCsv(file="input.csv", name="input"), WriteCsv(table="input", file="plain", max_rows_per_file=400)]).execute(
+            global_settings=self.settings, tracer=summary,
+        )
+        self.write(WriteCsv(table="input", file="shards", max_rows_per_file=400, compression="zstd"), summary)
+
+        events = [msgspec.json.decode(line, type=ProgressEvent) for line in output.getvalue().splitlines()]
+        sink_events = [event for event in events if event.event == "progress"]
+        self.assertTrue(sink_events)
+        self.assertIsNone(sink_events[-1].rows)
+        self.assertEqual([sink.rows for sink in summary.report().sinks], [1000, 1000])
+
+    def test_parquet_tuning(self):
+        self.write(WriteParquet(
+            table="input",
+            file="out.parquet",
+            compression="gzip",
+            compression_level=9,
+            row_group_size=256,
+            statistics="full",
+            sorted_by=[SortingColumn(column="id")],
+        ))
+        metadata = pq.ParquetFile(self.root / "out.parquet").metadata
+        self.assertEqual([metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)], [256, 256, 256, 232])
+        column = metadata.row_group(1).column(0)
+        self.assertEqual(column.compression, "GZIP")
+        self.assertEqual((column.statistics.min, column.statistics.max), (256, 511))
+        self.assertEqual(metadata.metadata[b"sorting_columns"], b'[{"column":"id"}]')
+        assert_frame_equal(pl.read_parquet(self.root / "out.parquet"), self.input)
+
+    def test_parquet_without_statistics(self):
+        self.write(WriteParquet(table="input", file="out.parquet", compression="uncompressed", statistics=False))
+        column = pq.ParquetFile(self.root / "out.parquet").metadata.row_group(0).column(0)
+        self.assertEqual(column.compression, "UNCOMPRESSED")
+        self.assertFalse(column.is_stats_set)
+
+    def test_partition_by(self):
+        self.input = self.input.with_columns(group=(pl.col("id") % 3).cast(pl.Int32))
+        self.input.write_csv(self.root / "input.csv")
+        summary = ExecutionSummary()
+        self.write(WriteParquet(table="input", file="by_group", partition_by=["group"]), summary)
+        self.write(WriteCsv(table="input", file="by_group_csv", partition_by=["group"], compression="zstd"), summary)
+
+        self.assertEqual(
+            sorted(str(path.relative_to(self.root)) for path in self.root.glob("by_group*/*/*")),
+            [f"by_group/group={n}/0.parquet" for n in range(3)] + [f"by_group_csv/group={n}/0.csv.zst" for n in range(3)],
+        )
+        self.assertEqual(pl.read_parquet(self.root / "by_group/group=1/0.parquet").columns, ["id", "text"])
+        self.assertEqual([sink.rows for sink in summary.report().sinks], [1000, 1000])
+
+        for step in (
+            ReadParquet(file="by_group/**/*.parquet", name="t", hive_partitioning=True,
+                        schema=[ColumnSchema(column="group", type="Int")]),
+            ReadCsv(file="by_group_csv/**/*.csv.zst", name="t", hive_partitioning=True,
+                    schema=[ColumnSchema(column="group", type="Int")]),
+        ):
+            with self.subTest(step=type(step).__name__):
+                ctx = PWorkflow(workflow=[step]).execute(global_settings=self.settings, lazy=True)
+                assert_frame_equal(ctx.get_table("t").collect().sort("id"), self.input)
+
+    def test_partitions_share_one_compression_pool(self):
+        executor = concurrent.futures.ThreadPoolExecutor
+        with mock.patch("concurrent.futures.ThreadPoolExecutor", side_effect=executor) as pools:
+            self.write(WriteCsv(table="input", file="by_text", partition_by=["text"], compression="gzip"))
+        self.assertEqual(pools.call_count, 1)
+        self.assertEqual(len(list((self.root / "by_text").glob("*/0.csv.gz"))), 2)
+
+    def test_partition_by_replaces_earlier_dataset(self):
+        self.write(WriteNdjson(table="input", file="by_text", partition_by=["id"]))
+        self.write(WriteNdjson(table="input", file="by_text", partition_by=["text"], max_rows_per_file=500))
+        self.assertEqual(
+            sorted(str(path.relative_to(self.root / "by_text")) for path in (self.root / "by_text").rglob("*.ndjson")),
+            ["text=multi%0Aline/part-00000.ndjson", "text=plain/part-00000.ndjson", "text=plain/part-00001.ndjson"],
+        )
+        ctx = PWorkflow(workflow=[ReadNdjson(file="by_text/**/*.ndjson", name="t", hive_partitioning=True)]).execute(
+            global_settings=self.settings, lazy=True,
+        )
+        assert_frame_equal(ctx.get_table("t").collect().sort("id"), self.input)
+
+    def test_partition_by_empty_table_replaces_earlier_dataset(self):
+        self.write(WriteCsv(table="input", file="by_id", partition_by=["id"]))
+        PWorkflow(workflow=[WriteCsv(table="input", file="by_id", partition_by=["id"])]).execute(
+            global_settings=self.settings, initial_table_space={"input": self.input.clear().lazy()},
+        )
+        self.assertEqual(list((self.root / "by_id").iterdir()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()